@@ -0,0 +1,134 @@
+"""Admin audit log: an append-only JSON Lines file with size-based rotation.
+
+Every /admin change writes one line:
+
+    {"admin_id": "979346606233104415", "action": "group_set_popularity",
+     "target": "TWICE", "before": 400, "after": 500, "timestamp": "2026-10-19T..."}
+
+The log used to be a list inside data.json, trimmed to 500 entries, and every
+admin action rewrote the whole state file just to append to it. Now an entry
+is a single line appended to its own file, and data.json never sees it.
+
+When the file would grow past max_bytes it is rotated the usual way
+(audit.jsonl -> audit.jsonl.1 -> ... -> audit.jsonl.<backups>, oldest
+dropped), so the history on disk is bounded too. The newest entries are also
+kept in a deque for the admin view, which pages newest-first and only goes to
+disk for pages older than that.
+"""
+
+import json
+import os
+from collections import deque
+
+DEFAULT_MAX_BYTES = 1_000_000
+DEFAULT_BACKUPS = 5
+RECENT_KEPT = 500
+
+
+class AuditLog:
+    def __init__(self, path: str, max_bytes: int = DEFAULT_MAX_BYTES,
+                 backups: int = DEFAULT_BACKUPS, recent: int = RECENT_KEPT):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.recent = deque(maxlen=recent)
+        self._file = None
+
+    # --- Writing ------------------------------------------------------------
+
+    def _open(self):
+        if self._file is None:
+            self._file = open(self.path, "a", encoding="utf-8", buffering=1)
+        return self._file
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def reopen(self, path: str):
+        """Switch to another file (replay and benchmarks use a scratch one)."""
+        self.close()
+        self.path = path
+        self.recent.clear()
+        self.load_recent()
+
+    def _rotate(self):
+        self.close()
+        for index in range(self.backups - 1, 0, -1):
+            older = f"{self.path}.{index}"
+            if os.path.exists(older):
+                os.replace(older, f"{self.path}.{index + 1}")
+        if self.backups:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+
+    def append(self, entry: dict):
+        line = json.dumps(entry, ensure_ascii=False, default=str, separators=(",", ":")) + "\n"
+        try:
+            if os.path.exists(self.path) and os.path.getsize(self.path) + len(line.encode("utf-8")) > self.max_bytes:
+                self._rotate()
+            self._open().write(line)
+        except OSError as e:
+            # Keep the entry in memory at least; losing an audit line must not
+            # fail the admin command that caused it.
+            print(f"Audit log: could not write to {self.path}: {e}")
+        self.recent.append(entry)
+
+    # --- Reading ------------------------------------------------------------
+
+    def _files_newest_first(self):
+        yield self.path
+        for index in range(1, self.backups + 1):
+            yield f"{self.path}.{index}"
+
+    def _read_newest_first(self):
+        """Every entry on disk, newest first. Files are small, so each is read whole."""
+        for path in self._files_newest_first():
+            if not os.path.exists(path):
+                continue
+            with open(path, "r", encoding="utf-8") as f:
+                lines = f.readlines()
+            for line in reversed(lines):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # Torn line from a crash mid-write
+
+    def load_recent(self):
+        """Refill the in-memory buffer from disk (at startup)."""
+        self.recent.clear()
+        newest = []
+        for entry in self._read_newest_first():
+            newest.append(entry)
+            if len(newest) >= self.recent.maxlen:
+                break
+        self.recent.extend(reversed(newest))
+
+    def import_legacy(self, entries: list):
+        """Move the old in-data.json list into the file, once."""
+        if not entries or (os.path.exists(self.path) and os.path.getsize(self.path)):
+            return 0
+        for entry in entries:
+            self.append(entry)
+        return len(entries)
+
+    def page(self, number: int = 1, per_page: int = 10):
+        """(entries newest first, has_more) for 1-based page `number`."""
+        start = (max(1, number) - 1) * per_page
+        end = start + per_page
+        if end < len(self.recent):
+            newest_first = list(reversed(self.recent))
+            return newest_first[start:end], True
+
+        entries = []
+        for index, entry in enumerate(self._read_newest_first()):
+            if index >= end:
+                return entries, True
+            if index >= start:
+                entries.append(entry)
+        return entries, False
@@ -0,0 +1,331 @@
+"""Benchmark suite for the hot paths players wait on.
+
+    python bench.py                              # current + medium scales
+    python bench.py --scales current,medium,large --repeat 5
+    python bench.py --only charts,autocomplete --out results.json
+    python bench.py --save-baseline              # record bench_baseline.json
+    python bench.py --threshold 0.25             # compare against it (default)
+
+Covers:
+  - persistence    load_data / save_data at each dataset scale
+  - charts         _calculate_all_chart_ranks for every CHART_CONFIG platform,
+                   and one whole chart tick (albums and weekly songs, no save)
+  - autocomplete   every *_autocomplete handler over a few typical prefixes
+  - show_board     calculate_show_board for every SHOW_BOARDS show
+  - render         graphics.render_template for every LAYOUTS entry, plus
+                   create_spotify_profile and create_predict_scoreboard, each
+                   with an empty output cache; and one output cache hit.
+                   Square covers are first checked to fill square tiles
+                   without padding, and the run stops if they don't.
+
+Datasets come from scale_dataset.py (seeded, so every run sees the same data);
+"live" benchmarks a copy of the real data.json instead. Nothing touches the
+real data file.
+
+Results are JSON: one entry per benchmark with median and min milliseconds.
+When a baseline file exists each median is compared against it, and anything
+slower by more than --threshold is reported as a regression and makes the run
+exit non-zero, so it can gate a change.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import inspect
+import io
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+# Benchmarks time the renderers themselves; a warm on-disk render cache from
+# the bot would turn them into file reads.
+os.environ.pop("RENDER_CACHE_DIR", None)
+
+import graphics
+import replay
+import scale_dataset
+
+DEFAULT_SCALES = "current,medium"
+DEFAULT_BASELINE = "bench_baseline.json"
+SUITES = ("persistence", "charts", "autocomplete", "show_board", "render")
+AUTOCOMPLETE_PREFIXES = ("", "a", "ka", "the", "love")
+
+# Sample artwork shipped in the repo, used wherever a renderer wants image bytes.
+SAMPLE_ART = ("SourNPretty.jpg", "nubbyu.jpg", "NewOurs.webp")
+
+# Globals load_data() fills with .update(); cleared before each load.
+STATE_DICTS = ("group_popularity", "company_funds", "group_data", "company_data", "album_data",
+               "user_balances", "user_companies", "usage_limits",
+               "user_stream_counts", "weekly_streams", "preorder_data", "article_history",
+               "random_events_log")
+
+
+def _measure(fn, repeat, setup=None):
+    times = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        started = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - started)
+    return {
+        "median_ms": round(statistics.median(times) * 1000, 3),
+        "min_ms": round(min(times) * 1000, 3),
+        "runs": repeat,
+    }
+
+
+def _quiet(fn):
+    """The bot prints on every save; keep benchmark output readable."""
+    def wrapped():
+        with contextlib.redirect_stdout(io.StringIO()):
+            return fn()
+    return wrapped
+
+
+def _reset_state(game):
+    for name in STATE_DICTS:
+        getattr(game, name).clear()
+
+
+def _prepare_scale(game, scale, work_dir, data_path):
+    path = os.path.join(work_dir, f"{scale}.json")
+    if scale == "live":
+        shutil.copyfile(data_path, path)
+    else:
+        groups, albums, songs, users = scale_dataset.SCALES[scale]
+        state = scale_dataset.generate(groups, albums, songs, users, seed=0)
+        scale_dataset.write(state, path)
+    game.DATA_FILE = path
+    # The side stores live next to the real data file; point them here too.
+    game.admin_audit.reopen(os.path.join(work_dir, f"{scale}_admin_audit.jsonl"))
+    game.chart_log.reopen(os.path.join(work_dir, f"{scale}_chart_history.json"))
+    game.global_top_songs.reopen(os.path.join(work_dir, f"{scale}_global_chart.json"))
+    _reset_state(game)
+    _quiet(game.load_data)()
+    return path
+
+
+def _sample_art():
+    art = []
+    for filename in SAMPLE_ART:
+        path = os.path.join(graphics.ASSET_DIR, filename)
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                art.append(f.read())
+    return art
+
+
+# --- Suites ---------------------------------------------------------------
+
+def bench_persistence(game, scale, repeat):
+    yield f"persistence.load_data[{scale}]", _measure(
+        _quiet(game.load_data), repeat, setup=lambda: _reset_state(game))
+    yield f"persistence.save_data[{scale}]", _measure(_quiet(game.save_data), repeat)
+    yield f"persistence.file_bytes[{scale}]", {"bytes": os.path.getsize(game.DATA_FILE)}
+
+
+def bench_charts(game, scale, repeat):
+    for platform, settings in game.CHART_CONFIG.items():
+        yield f"charts.{platform}[{scale}]", _measure(
+            lambda: game._calculate_all_chart_ranks(platform, settings), repeat)
+
+    # chart_tick's two halves: the ranking runs in a thread, the snapshot and
+    # applying the result run on the event loop.
+    yield f"charts.tick_rank[{scale}]", _measure(
+        lambda: game._rank_chart_tick(*game._chart_tick_inputs()), repeat)
+    ranks = game._rank_chart_tick(*game._chart_tick_inputs())
+
+    def tick_loop():
+        game._chart_tick_inputs()
+        game._tick_album_charts(ranks)
+        game._tick_weekly_song_charts(ranks)
+    yield f"charts.tick_loop[{scale}]", _measure(tick_loop, repeat)
+
+
+def bench_autocomplete(game, scale, repeat):
+    owner = max(game.user_companies, key=lambda u: len(game.user_companies[u]), default="0")
+    some_group = next(iter(game.group_data), "")
+    interaction = replay.FakeInteraction(owner, None, {"group_name": some_group})
+    handlers = sorted(
+        (name, fn) for name, fn in vars(game).items()
+        if name.endswith("_autocomplete") and inspect.iscoroutinefunction(fn)
+    )
+    loop = asyncio.new_event_loop()
+    try:
+        for name, handler in handlers:
+            def run_prefixes(handler=handler):
+                for prefix in AUTOCOMPLETE_PREFIXES:
+                    loop.run_until_complete(handler(interaction, prefix))
+            yield f"autocomplete.{name[:-len('_autocomplete')]}[{scale}]", _measure(run_prefixes, repeat)
+    finally:
+        loop.close()
+
+
+def bench_show_board(game, scale, repeat):
+    by_streams = sorted(game.album_data, key=lambda a: game.album_data[a].get("streams", 0), reverse=True)
+    for show_key, show in game.SHOW_BOARDS.items():
+        nominees = by_streams[:show["panels"]]
+        yield f"show_board.{show_key}[{scale}]", _measure(
+            lambda: game.calculate_show_board(show_key, nominees), repeat)
+
+
+def _layout_panels(layout_name):
+    layout = graphics.LAYOUTS[layout_name]
+    count = layout.get("repeat", {}).get("count", 1)
+    texts = ["CHRYSALIS (English Ver + Sped up Ver.)", "NEWOURS (뉴아워즈)", "SOUR N PRETTY"]
+    panels = []
+    for index in range(count):
+        panel = {}
+        for slot in layout["slots"]:
+            if isinstance(slot, graphics.TextSlot):
+                panel[slot.name] = texts[index % len(texts)] if "name" in slot.name or "song" in slot.name \
+                    or "group" in slot.name else f"{(index + 1) * 1234:,}"
+        panels.append(panel)
+    return panels
+
+
+def check_square_fit():
+    """Square covers must fill the square tiles exactly: no padded edges.
+
+    Sizes where int() rounding used to come out one pixel short of the box.
+    """
+    from PIL import Image
+
+    padded = []
+    for side, box in ((86, 46), (344, 46), (577, 46), (281, 150), (562, 150), (1124, 150), (2248, 150)):
+        for mode in ("cover", "cover_top"):
+            tile = graphics._fit_image(Image.new("RGB", (side, side), "white"), box, box, mode, "RGB")
+            if tile.size != (box, box) or tile.getextrema()[0][0] < 255:
+                padded.append(f"{side}px -> {box}px ({mode})")
+    return padded
+
+
+def bench_render(game, repeat):
+    padded = check_square_fit()
+    if padded:
+        raise SystemExit(f"Square artwork comes out padded: {', '.join(padded)}")
+    art = _sample_art()
+    cold = graphics.OUTPUT_CACHE.clear  # Measure Pillow, not the output cache
+    for layout_name, layout in graphics.LAYOUTS.items():
+        panels = _layout_panels(layout_name)
+        images = {}
+        image_slots = [s for s in layout["slots"] if isinstance(s, graphics.ImageSlot)]
+        for panel_index in range(len(panels)):
+            for slot_index, slot in enumerate(image_slots):
+                if art:
+                    images[(panel_index, slot.name)] = art[(panel_index + slot_index) % len(art)]
+        render = lambda: graphics.render_template(layout_name, panels, images,
+                                                  {(0, "score_total"): graphics.WINNER_GOLD})
+        yield f"render.{layout_name}", _measure(render, repeat, setup=cold)
+    yield "render.output_cache_hit", _measure(render, repeat)
+
+    cover = art[0] if art else None
+    row_scores = {row: 1234 for row in graphics.MCOUNTDOWN_SCORE_ROWS}
+    left = {"group": "SOUR N PRETTY", "song": "CHRYSALIS", "scores": row_scores, "total": 8123}
+    right = {"group": "NEWOURS", "song": "뉴아워즈 (Sped up Ver.)", "scores": row_scores, "total": 7456}
+    yield "render.mcountdown_head_to_head", _measure(
+        lambda: graphics.render_mcountdown(left, right, cover, art[-1] if art else None), repeat,
+        setup=cold)
+
+    profile = {
+        "name": "SOUR N PRETTY", "korean": "사워앤프리티",
+        "description": "A **five-member** girl group. 다섯 멤버의 걸그룹, debuting with a bang.",
+        "monthly_listeners": 1_234_567, "header": art[-1] if art else None,
+        "tracks": [{"name": f"Track {i} (뉴 버전)", "plays": 1_000_000 // i, "cover": cover} for i in range(1, 11)],
+        "releases": [{"title": f"Release {i}", "subtitle": "Mini Album · Physical", "cover": cover}
+                     for i in range(1, 5)],
+    }
+    yield "render.spotify_profile", _measure(lambda: graphics.create_spotify_profile(profile), repeat, setup=cold)
+
+    scores = [{"group": f"GROUP {i}", "album": f"Album {i}", "total": 9000 - i * 500, "digital": 4000,
+               "physical": 1200, "sns": 800, "broadcast": 400} for i in range(10)]
+    yield "render.predict_scoreboard", _measure(lambda: graphics.create_predict_scoreboard(scores), repeat, setup=cold)
+
+
+# --- Baseline comparison ----------------------------------------------------
+
+def compare(results, baseline, threshold):
+    """Benchmarks whose median got slower than the baseline by > threshold."""
+    regressions = []
+    for name, result in results.items():
+        before = baseline.get(name, {}).get("median_ms")
+        after = result.get("median_ms")
+        if not before or after is None:
+            continue
+        change = (after - before) / before
+        if change > threshold:
+            regressions.append({"name": name, "baseline_ms": before, "median_ms": after,
+                                "change": round(change, 3)})
+    return regressions
+
+
+def run(scales, suites, repeat, data_path):
+    import main as game
+
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="mpop-bench-") as work_dir:
+        for scale in scales:
+            print(f"Preparing {scale} dataset...", file=sys.stderr)
+            _prepare_scale(game, scale, work_dir, data_path)
+            for suite in ("persistence", "charts", "autocomplete", "show_board"):
+                if suite in suites:
+                    for name, result in globals()[f"bench_{suite}"](game, scale, repeat):
+                        results[name] = result
+                        print(f"  {name}: {result}", file=sys.stderr)
+        if "render" in suites:
+            for name, result in bench_render(game, repeat):
+                results[name] = result
+                print(f"  {name}: {result}", file=sys.stderr)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark persistence, charts, autocomplete and rendering.")
+    parser.add_argument("--scales", default=DEFAULT_SCALES,
+                        help=f"comma-separated: {', '.join(scale_dataset.SCALES)}, live")
+    parser.add_argument("--only", default=",".join(SUITES), help="comma-separated suites to run")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--data", default="data.json", help="source for the 'live' scale (copied, never written)")
+    parser.add_argument("--out", help="write results JSON here (default: stdout)")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="store these results as the baseline")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown, 0.25 = 25%%")
+    options = parser.parse_args(argv)
+
+    scales = [s.strip() for s in options.scales.split(",") if s.strip()]
+    suites = {s.strip() for s in options.only.split(",") if s.strip()}
+    unknown = [s for s in scales if s != "live" and s not in scale_dataset.SCALES] + \
+              [s for s in suites if s not in SUITES]
+    if unknown:
+        parser.error(f"unknown scale or suite: {', '.join(unknown)}")
+
+    results = run(scales, suites, max(1, options.repeat), options.data)
+    report = {"results": results, "regressions": []}
+
+    if options.save_baseline:
+        with open(options.baseline, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        print(f"Baseline written to {options.baseline}", file=sys.stderr)
+    elif os.path.exists(options.baseline):
+        with open(options.baseline, "r", encoding="utf-8") as f:
+            report["regressions"] = compare(results, json.load(f), options.threshold)
+        for regression in report["regressions"]:
+            print(f"REGRESSION {regression['name']}: {regression['baseline_ms']}ms -> "
+                  f"{regression['median_ms']}ms ({regression['change']:+.0%})", file=sys.stderr)
+
+    output = json.dumps(report, indent=2, sort_keys=True)
+    if options.out:
+        with open(options.out, "w", encoding="utf-8") as f:
+            f.write(output)
+    else:
+        print(output)
+    return 1 if report["regressions"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
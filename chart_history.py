@@ -0,0 +1,191 @@
+"""Chart rank history: one compact time series per album (or song) per chart.
+
+Chart movement used to be worked out when somebody looked: /charts <group>
+and /weeklychart recomputed every rank, then moved rank into prev_rank and
+updated peak on the spot. Two views a minute apart showed "(=)" everywhere,
+a group nobody checked for a week jumped straight from NEW to its current
+spot, and the overall chart was recalculated for every view.
+
+Now main.py runs a chart tick once an hour (on the game clock's "hour"
+event). The tick computes every platform's ranks once, updates
+rank/prev_rank/peak in charts_info, and records the ranks here. The commands
+only read.
+
+Storage is deliberately small. Each series is an array('H') of ranks, one per
+tick, with 0 meaning "not charting"; a series starts the first time its entry
+charts and is dropped once it has held nothing but zeros for the whole
+retention window. Tick timestamps are stored once, not per series. The file
+(chart_history.json by default) is written at each tick, not on every
+save_data, and holds each series as base64 of its little-endian bytes:
+
+    {"retention": 336, "tick_count": 1204, "ticks": [epoch, ...],
+     "series": {"MelOn": {"<album>": [first_tick, "<base64>"]}, ...}}
+"""
+
+import base64
+import json
+import os
+import sys
+from array import array
+
+DEFAULT_RETENTION = 14 * 24  # Two weeks of hourly ticks
+
+# Song entries on the weekly charts are keyed "<album>\t<song>".
+SONG_KEY_SEP = "\t"
+
+
+def song_key(album_name: str, song_name: str) -> str:
+    return f"{album_name}{SONG_KEY_SEP}{song_name}"
+
+
+class _Series:
+    __slots__ = ("start", "ranks")
+
+    def __init__(self, start: int, ranks=None):
+        self.start = start  # Absolute tick number of ranks[0]
+        self.ranks = ranks if ranks is not None else array("H")
+
+
+class ChartHistory:
+    def __init__(self, path: str, retention: int = DEFAULT_RETENTION):
+        self.path = path
+        self.retention = max(1, retention)
+        self.tick_count = 0
+        self.ticks = array("L")  # Epoch seconds of the retained ticks
+        self.series = {}  # chart -> key -> _Series
+
+    @property
+    def last_stamp(self):
+        return self.ticks[-1] if self.ticks else None
+
+    def _first_retained(self) -> int:
+        return self.tick_count - len(self.ticks)
+
+    # --- Recording ----------------------------------------------------------
+
+    def record(self, stamp: int, ranks: dict):
+        """Append one tick. ranks: {chart: {key: rank or None}}.
+
+        Entries that already have a series but are missing from ranks (the
+        album was deleted, the group disbanded) get a 0 like any other
+        non-charting entry, so every series stays aligned with the ticks.
+        """
+        tick = self.tick_count
+        self.tick_count += 1
+        self.ticks.append(int(stamp))
+
+        for chart in set(self.series) | set(ranks):
+            chart_ranks = ranks.get(chart, {})
+            chart_series = self.series.setdefault(chart, {})
+            for key, series in chart_series.items():
+                series.ranks.append(chart_ranks.get(key) or 0)
+            for key, rank in chart_ranks.items():
+                if rank and key not in chart_series:
+                    chart_series[key] = _Series(tick, array("H", [rank]))
+
+        self._trim()
+
+    def _trim(self):
+        overflow = len(self.ticks) - self.retention
+        if overflow > 0:
+            del self.ticks[:overflow]
+        first = self._first_retained()
+        for chart in list(self.series):
+            chart_series = self.series[chart]
+            for key in list(chart_series):
+                series = chart_series[key]
+                drop = first - series.start
+                if drop > 0:
+                    del series.ranks[:drop]
+                    series.start = first
+                if not any(series.ranks):
+                    del chart_series[key]
+            if not chart_series:
+                del self.series[chart]
+
+    # --- Reading ------------------------------------------------------------
+
+    def history(self, chart: str, key: str):
+        """[(epoch_seconds, rank or None), ...] oldest first, for one entry."""
+        series = self.series.get(chart, {}).get(key)
+        if series is None:
+            return []
+        offset = series.start - self._first_retained()
+        return [
+            (self.ticks[offset + index], rank or None)
+            for index, rank in enumerate(series.ranks)
+        ]
+
+    def best(self, chart: str, key: str):
+        """Best (lowest) rank within the retention window, or None."""
+        series = self.series.get(chart, {}).get(key)
+        charted = [rank for rank in series.ranks if rank] if series else []
+        return min(charted) if charted else None
+
+    # --- Persistence --------------------------------------------------------
+
+    @staticmethod
+    def _encode(ranks: array) -> str:
+        if sys.byteorder != "little":
+            ranks = array("H", ranks)
+            ranks.byteswap()
+        return base64.b64encode(ranks.tobytes()).decode("ascii")
+
+    @staticmethod
+    def _decode(text: str) -> array:
+        ranks = array("H")
+        ranks.frombytes(base64.b64decode(text))
+        if sys.byteorder != "little":
+            ranks.byteswap()
+        return ranks
+
+    def to_json(self):
+        return {
+            "retention": self.retention,
+            "tick_count": self.tick_count,
+            "ticks": self.ticks.tolist(),
+            "series": {
+                chart: {key: [s.start, self._encode(s.ranks)] for key, s in chart_series.items()}
+                for chart, chart_series in self.series.items()
+            },
+        }
+
+    def save(self):
+        temp_file = self.path + ".tmp"
+        try:
+            with open(temp_file, "w", encoding="utf-8") as f:
+                json.dump(self.to_json(), f, ensure_ascii=False, separators=(",", ":"))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_file, self.path)
+        except OSError as e:
+            # The ranks themselves are in charts_info; losing one tick of
+            # history is not worth failing the tick over.
+            print(f"Chart history: could not write {self.path}: {e}")
+
+    def load(self):
+        self.tick_count = 0
+        self.ticks = array("L")
+        self.series = {}
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                saved = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"Chart history: could not read {self.path}, starting fresh: {e}")
+            return
+
+        self.tick_count = saved.get("tick_count", 0)
+        self.ticks = array("L", saved.get("ticks", []))
+        for chart, chart_series in saved.get("series", {}).items():
+            self.series[chart] = {
+                key: _Series(start, self._decode(encoded))
+                for key, (start, encoded) in chart_series.items()
+            }
+        self._trim()  # Applies a retention lowered since the last run
+
+    def reopen(self, path: str):
+        """Switch to another file (replay and benchmarks use a scratch one)."""
+        self.path = path
+        self.load()
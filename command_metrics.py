@@ -0,0 +1,219 @@
+"""Per-command latency and I/O instrumentation.
+
+Every slash command runs inside a CommandSample (main.py starts one in the
+command tree's dispatch). While it is running, the slow things a command can
+do report into it:
+
+    with command_metrics.track("render"):
+        buffer = await asyncio.to_thread(graphics.create_spotify_profile, profile)
+
+    command_metrics.record_save(seconds, bytes_written)   # from save_data()
+
+The active sample lives in a ContextVar, so it follows the command into
+asyncio.to_thread workers and into any tasks it awaits, and never leaks into
+another command running at the same time. Outside a command (scheduled tasks,
+the dashboard) tracking is a no-op.
+
+When the command finishes its sample is folded into a per-command summary:
+a latency histogram plus total time in save_data / rendering / outbound HTTP,
+saves and bytes written. `/admin perf slowest` shows the worst offenders and
+`/admin perf export` hands the whole thing over as JSON.
+
+Time in a category is summed, not deduplicated: three art downloads running
+side by side for 2s each count as 6s of HTTP inside a 2s command.
+"""
+
+import asyncio
+import contextvars
+import heapq
+import time
+from contextlib import contextmanager
+
+# Histogram bucket upper bounds, in milliseconds. Discord gives a command 3s to
+# respond, so the buckets are densest around there.
+BUCKETS_MS = (10, 25, 50, 100, 250, 500, 1000, 2000, 3000, 5000, 10000, 30000, float("inf"))
+
+CATEGORIES = ("save", "render", "http")
+
+# How many individual invocations to keep with their full breakdown.
+SLOWEST_KEPT = 20
+
+_current = contextvars.ContextVar("command_metrics_sample", default=None)
+
+
+class CommandSample:
+    """Timings for one command invocation, filled in while it runs."""
+
+    __slots__ = ("command", "user", "started_at", "started", "wall", "failed", "seconds", "saves", "bytes_written")
+
+    def __init__(self, command: str, user=None):
+        self.command = command
+        self.user = str(user) if user is not None else None
+        self.started_at = time.time()
+        self.started = time.perf_counter()
+        self.wall = 0.0
+        self.failed = False
+        self.seconds = dict.fromkeys(CATEGORIES, 0.0)
+        self.saves = 0
+        self.bytes_written = 0
+
+    def as_dict(self):
+        return {
+            "command": self.command,
+            "user": self.user,
+            "at": round(self.started_at, 3),
+            "wall_ms": round(self.wall * 1000, 1),
+            "failed": self.failed,
+            **{f"{name}_ms": round(value * 1000, 1) for name, value in self.seconds.items()},
+            "saves": self.saves,
+            "bytes_written": self.bytes_written,
+        }
+
+
+class CommandStats:
+    """Everything we know about one command across all its invocations."""
+
+    def __init__(self):
+        self.count = 0
+        self.failures = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * len(BUCKETS_MS)
+        self.seconds = dict.fromkeys(CATEGORIES, 0.0)
+        self.saves = 0
+        self.bytes_written = 0
+
+    def add(self, sample: CommandSample):
+        self.count += 1
+        self.failures += sample.failed
+        self.total += sample.wall
+        self.max = max(self.max, sample.wall)
+        wall_ms = sample.wall * 1000
+        for index, bound in enumerate(BUCKETS_MS):
+            if wall_ms <= bound:
+                self.buckets[index] += 1
+                break
+        for name, value in sample.seconds.items():
+            self.seconds[name] += value
+        self.saves += sample.saves
+        self.bytes_written += sample.bytes_written
+
+    def percentile_ms(self, pct):
+        """Upper bound of the bucket holding the pct-th invocation."""
+        if not self.count:
+            return 0.0
+        wanted = pct / 100 * self.count
+        seen = 0
+        for bound, hits in zip(BUCKETS_MS, self.buckets):
+            seen += hits
+            if seen >= wanted:
+                return bound if bound != float("inf") else round(self.max * 1000, 1)
+        return round(self.max * 1000, 1)
+
+    def as_dict(self):
+        return {
+            "count": self.count,
+            "failures": self.failures,
+            "mean_ms": round(self.total / self.count * 1000, 1) if self.count else 0.0,
+            "p50_ms": self.percentile_ms(50),
+            "p95_ms": self.percentile_ms(95),
+            "max_ms": round(self.max * 1000, 1),
+            **{f"{name}_ms_total": round(value * 1000, 1) for name, value in self.seconds.items()},
+            "saves": self.saves,
+            "bytes_written": self.bytes_written,
+            "histogram": {
+                ("inf" if bound == float("inf") else f"<={bound}ms"): hits
+                for bound, hits in zip(BUCKETS_MS, self.buckets)
+            },
+        }
+
+
+class CommandMetrics:
+    """Per-command summaries plus the slowest individual invocations."""
+
+    def __init__(self):
+        # asyncio.Task -> CommandSample for commands still running, so the loop
+        # lag monitor can say which command a blocked loop was busy with.
+        self.active = {}
+        self.reset()
+
+    def reset(self):
+        self.commands = {}
+        self.since = time.time()
+        self._slowest = []  # min-heap of (wall, sequence, sample dict)
+        self._sequence = 0
+
+    def start(self, command: str, user=None):
+        """Begin timing a command. Returns a token for finish()."""
+        sample = CommandSample(command, user)
+        try:
+            task = asyncio.current_task()
+        except RuntimeError:
+            task = None
+        if task is not None:
+            self.active[task] = sample
+        return sample, _current.set(sample), task
+
+    def finish(self, token, failed=False):
+        sample, context_token, task = token
+        _current.reset(context_token)
+        self.active.pop(task, None)
+        sample.wall = time.perf_counter() - sample.started
+        sample.failed = bool(failed)
+        self.commands.setdefault(sample.command, CommandStats()).add(sample)
+
+        self._sequence += 1
+        entry = (sample.wall, self._sequence, sample.as_dict())
+        if len(self._slowest) < SLOWEST_KEPT:
+            heapq.heappush(self._slowest, entry)
+        elif entry > self._slowest[0]:
+            heapq.heapreplace(self._slowest, entry)
+        return sample
+
+    def slowest_commands(self, limit=10, key="p95_ms"):
+        """[(command, summary)] ordered worst first."""
+        summaries = [(name, stats.as_dict()) for name, stats in self.commands.items()]
+        summaries.sort(key=lambda item: item[1][key], reverse=True)
+        return summaries[:limit]
+
+    def slowest_invocations(self, limit=SLOWEST_KEPT):
+        return [entry for _, _, entry in sorted(self._slowest, reverse=True)[:limit]]
+
+    def export(self):
+        return {
+            "since": round(self.since, 3),
+            "exported": round(time.time(), 3),
+            "buckets_ms": [("inf" if b == float("inf") else b) for b in BUCKETS_MS],
+            "commands": {name: stats.as_dict() for name, stats in sorted(self.commands.items())},
+            "slowest": self.slowest_invocations(),
+        }
+
+
+# The process-wide collector main.py reports into.
+metrics = CommandMetrics()
+
+
+def current_sample():
+    return _current.get()
+
+
+@contextmanager
+def track(category: str):
+    """Charge the time spent inside the block to the running command, if any."""
+    sample = _current.get()
+    if sample is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        sample.seconds[category] += time.perf_counter() - started
+
+
+def record_save(seconds: float, bytes_written: int):
+    sample = _current.get()
+    if sample is not None:
+        sample.seconds["save"] += seconds
+        sample.saves += 1
+        sample.bytes_written += bytes_written
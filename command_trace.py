@@ -0,0 +1,107 @@
+"""Command traces: record real slash-command traffic so it can be replayed.
+
+A trace is a JSON Lines file with one application command per line:
+
+    {"ts": 1760000000.123, "cmd": "streams", "user": "979346606233104415",
+     "args": {"album_name": "Feel My Wings"}}
+
+Recording is opt-in: set TRACE_FILE and main.py appends every slash command the
+bot receives, as it arrives. replay.py reads these files back to drive the same
+handlers offline, which is how we benchmark persistence and indexing changes
+against our real traffic mix instead of a made-up one.
+
+What is deliberately not recorded:
+  - Autocomplete requests and button/select presses. Only the command itself.
+  - Uploaded files. Attachment options are stored as null; the bytes are not
+    kept, and Discord's attachment ids mean nothing outside the live session.
+"""
+
+import json
+import os
+import time
+
+# Discord application command option types (see the API docs).
+SUBCOMMAND = 1
+SUBCOMMAND_GROUP = 2
+ATTACHMENT = 11
+
+
+def flatten_command_data(data: dict):
+    """Raw interaction data -> (qualified command name, {option: value}).
+
+    Subcommands and groups are folded into the name ("group sub"), so the
+    replay side can find the handler with a plain lookup.
+    """
+    path = [data.get("name", "")]
+    options = data.get("options") or []
+    while options and options[0].get("type") in (SUBCOMMAND, SUBCOMMAND_GROUP):
+        path.append(options[0]["name"])
+        options = options[0].get("options") or []
+
+    args = {}
+    for option in options:
+        value = option.get("value")
+        if option.get("type") == ATTACHMENT:
+            value = None
+        args[option["name"]] = value
+    return " ".join(path), args
+
+
+class TraceRecorder:
+    """Appends commands to a trace file, one compact JSON line each.
+
+    The file is line-buffered, so a crash loses at most the command in flight
+    and never leaves a half-written line behind a complete one.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.recorded = 0
+        self._file = open(path, "a", encoding="utf-8", buffering=1)
+
+    def record(self, command: str, user_id, args: dict, ts: float = None):
+        entry = {
+            "ts": round(ts if ts is not None else time.time(), 3),
+            "cmd": command,
+            "user": str(user_id),
+            "args": args,
+        }
+        try:
+            self._file.write(json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n")
+            self.recorded += 1
+        except (OSError, TypeError, ValueError) as e:
+            # Never let tracing break the command being traced.
+            print(f"Command trace: could not record /{command}: {e}")
+
+    def record_interaction(self, interaction):
+        command, args = flatten_command_data(interaction.data or {})
+        self.record(command, interaction.user.id, args)
+
+    def close(self):
+        self._file.close()
+
+
+def recorder_from_env():
+    """A recorder writing to TRACE_FILE, or None when tracing is off."""
+    path = os.getenv("TRACE_FILE")
+    if not path:
+        return None
+    print(f"Command trace: recording to {path}")
+    return TraceRecorder(path)
+
+
+def read_trace(path: str):
+    """Yield trace entries in file order. Blank or torn lines are skipped."""
+    with open(path, "r", encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                print(f"Command trace: skipping unreadable line {line_number} of {path}")
+                continue
+            if isinstance(entry, dict) and entry.get("cmd"):
+                entry.setdefault("args", {})
+                yield entry
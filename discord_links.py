@@ -0,0 +1,110 @@
+"""Fresh signed links for Discord attachments, refreshed in batches.
+
+Stored covers, banners and era images are Discord attachment links. Those
+are signed (?ex=...&is=...&hm=...) and stop working once `ex` has passed,
+so they have to be swapped for a freshly signed link before downloading.
+The old code asked Discord for one link per call, every time, even for links
+that were still good, and a /spotify render could make a dozen such calls.
+
+LinkRefresher instead:
+  - leaves links whose own signature is still valid alone,
+  - remembers refreshed links until their signature expires,
+  - sends everything else in one attachments/refresh-urls request (the
+    endpoint takes up to 50 URLs), and
+  - shares a refresh already in progress with anyone asking for the same
+    attachment.
+
+    links = LinkRefresher(post_batch)        # post_batch(cdn_urls) -> {cdn_url: fresh}
+    usable = await links.refresh(urls)       # {url: url to download}
+
+Anything that can't be refreshed comes back unchanged, as before.
+"""
+
+import asyncio
+import time
+from urllib.parse import parse_qs, urlsplit
+
+from image_cache import canonical_url, is_discord_url
+
+BATCH_LIMIT = 50  # refresh-urls accepts at most this many per request
+
+
+def signature_expiry(url: str):
+    """Epoch seconds the link's signature runs out at, or None if unsigned."""
+    values = parse_qs(urlsplit(url).query).get("ex")
+    if not values:
+        return None
+    try:
+        return int(values[0], 16)
+    except ValueError:
+        return None
+
+
+class LinkRefresher:
+    def __init__(self, post_batch, margin: float = 300, time_source=time.time):
+        """post_batch: async callable(list of CDN URLs) -> {CDN URL: refreshed URL}.
+
+        margin: seconds before expiry a link is treated as expired already,
+        so it can't run out between refreshing and downloading.
+        """
+        self.post_batch = post_batch
+        self.margin = margin
+        self.time_source = time_source
+        self._fresh = {}      # canonical URL -> (refreshed URL, expiry)
+        self._in_flight = {}  # canonical URL -> Future of the refreshed URL or None
+
+    def _usable(self, url, now):
+        expiry = signature_expiry(url)
+        return expiry is not None and expiry - self.margin > now
+
+    async def refresh(self, urls) -> dict:
+        """{url: link to download} for every url given."""
+        now = self.time_source()
+        results, waiting, wanted = {}, {}, []
+        for url in dict.fromkeys(u for u in urls if u):
+            if not is_discord_url(url) or self._usable(url, now):
+                results[url] = url
+                continue
+            key = canonical_url(url)
+            cached = self._fresh.get(key)
+            if cached and cached[1] - self.margin > now:
+                results[url] = cached[0]
+            elif key in self._in_flight:
+                waiting[url] = self._in_flight[key]
+            else:
+                future = asyncio.get_running_loop().create_future()
+                self._in_flight[key] = future
+                waiting[url] = future
+                wanted.append(key)
+
+        if wanted:
+            await self._post(wanted)
+        for url, future in waiting.items():
+            refreshed = await asyncio.shield(future)  # Others may share it
+            results[url] = refreshed or url
+        return results
+
+    async def _post(self, keys):
+        refreshed = {}
+        try:
+            for start in range(0, len(keys), BATCH_LIMIT):
+                refreshed.update(await self.post_batch(keys[start:start + BATCH_LIMIT]) or {})
+        except Exception as e:
+            print(f"Discord links: refresh failed: {e}")
+        finally:
+            # Even if cancelled: whoever shares these refreshes must not hang.
+            for key in keys:
+                link = refreshed.get(key)
+                if link:
+                    expiry = signature_expiry(link)
+                    if expiry is not None:
+                        self._fresh[key] = (link, expiry)
+                future = self._in_flight.pop(key, None)
+                if future is not None and not future.done():
+                    future.set_result(link)
+            self._forget_expired()
+
+    def _forget_expired(self):
+        now = self.time_source()
+        for key in [k for k, (_, expiry) in self._fresh.items() if expiry - self.margin <= now]:
+            del self._fresh[key]
@@ -0,0 +1,121 @@
+"""The game clock: cached day/week/month keys and rollover events.
+
+Game days run on Argentina time (UTC-3). Two things used to be done the slow
+or the sloppy way:
+
+  - get_today_str() and get_current_week_key() ran strftime/isocalendar on
+    every call, and they are called on every stream, sale and view written.
+    The clock computes the keys once and reuses them until the next hour
+    boundary (ARG_TZ is a whole-hour offset, so days, weeks and months always
+    change on one).
+  - The calendar jobs (weekly stream buckets, monthly tax, birthdays, pressure
+    decay) each woke up hourly and polled datetime.now(), some in naive local
+    time, some in Argentina time. Now they subscribe to the rollover they care
+    about and run right after it:
+
+        @clock.on("week")
+        async def open_weekly_buckets(keys): ...
+
+Events, fired in this order when a boundary passes:
+    "hour"   every hour            keys.hour is 0-23
+    "day"    at midnight           keys.day   "YYYY-MM-DD"
+    "week"   Monday midnight       keys.week  "YYYY-WW"
+    "month"  on the 1st            keys.month "YYYY-MM"
+
+Time comes from time_source (time.time by default), so replay.py can point the
+clock at its pinned command timestamps and stay deterministic.
+"""
+
+import asyncio
+import time
+import traceback
+from datetime import datetime
+
+EVENTS = ("hour", "day", "week", "month")
+_HOUR = 3600
+
+
+class ClockKeys:
+    __slots__ = ("hour", "day", "week", "month", "now")
+
+    def __init__(self, now: datetime):
+        self.now = now
+        self.hour = now.hour
+        self.day = now.strftime("%Y-%m-%d")
+        self.week = f"{now.year}-{now.isocalendar()[1]:02d}"
+        self.month = f"{now.year}-{now.month:02d}"
+
+
+class GameClock:
+    def __init__(self, tz, time_source=time.time):
+        self.tz = tz
+        self.time_source = time_source
+        self._keys = None
+        self._valid_from = 0.0
+        self._valid_until = 0.0
+        self._listeners = {event: [] for event in EVENTS}
+        self._task = None
+
+    # --- Cached keys --------------------------------------------------------
+
+    def keys(self) -> ClockKeys:
+        """Keys for the current hour, recomputed only when the hour changes."""
+        now = self.time_source()
+        if not (self._valid_from <= now < self._valid_until):
+            self._valid_from = now - now % _HOUR
+            self._valid_until = self._valid_from + _HOUR
+            self._keys = ClockKeys(datetime.fromtimestamp(now, self.tz))
+        return self._keys
+
+    def today(self) -> str:
+        return self.keys().day
+
+    def week_key(self) -> str:
+        return self.keys().week
+
+    def month_key(self) -> str:
+        return self.keys().month
+
+    # --- Rollover events ----------------------------------------------------
+
+    def on(self, event: str):
+        """Decorator: run an async callback(keys) whenever `event` rolls over."""
+        if event not in self._listeners:
+            raise ValueError(f"Unknown clock event {event!r}; use one of {', '.join(EVENTS)}")
+
+        def register(callback):
+            self._listeners[event].append(callback)
+            return callback
+        return register
+
+    async def fire(self, event: str, keys: ClockKeys):
+        for callback in self._listeners[event]:
+            try:
+                await callback(keys)
+            except Exception as e:
+                # One failing job must not stop the others, or the clock.
+                print(f"ERROR in clock {event} handler {callback.__name__}:")
+                traceback.print_exception(type(e), e, e.__traceback__)
+
+    async def _run(self):
+        last = self.keys()
+        while True:
+            now = self.time_source()
+            # Land just after the boundary so the new keys are unambiguous.
+            await asyncio.sleep(_HOUR - now % _HOUR + 0.5)
+            current = self.keys()
+            if current.hour == last.hour and current.day == last.day:
+                continue  # Woke early (clock adjusted); wait for the real boundary
+            await self.fire("hour", current)
+            if current.day != last.day:
+                await self.fire("day", current)
+            if current.week != last.week:
+                await self.fire("week", current)
+            if current.month != last.month:
+                await self.fire("month", current)
+            last = current
+
+    def start(self):
+        """Start firing events. Call from inside the running loop; idempotent."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run(), name="game-clock")
@@ -0,0 +1,120 @@
+"""Global Top Songs positions, computed once a day for every song.
+
+/globalchart used to roll new rank jitter for the song being viewed on every
+call, overwrite its rank and peak, and save data.json to keep them. Looking
+twice in a row moved the song around, and every view rewrote the state file.
+
+Now one pass per game day ranks every song in every market at once, and
+the command only reads the result. Positions live in their own small file
+(global_chart.json by default), written by the pass and never by a view:
+
+    {"day": "2026-10-19",
+     "songs": {"<album>\\t<song>": {"south_korea": [rank, peak, prev_rank, new_peak], ...}}}
+
+prev_rank is the rank from the previous pass; peak only ever improves.
+new_peak is true when this pass beat the peak from before it. A song that
+drops out of a market keeps its entry there with rank None, so its peak is
+still known if it charts again.
+"""
+
+import json
+import os
+
+# The rank in a market comes from how far past its threshold a song is;
+# smaller markets (lower weight) need more streams to chart.
+BASE_THRESHOLD = 500000
+LOWEST_RANK = 200
+
+
+def country_key(country: str) -> str:
+    return country.replace(" ", "_").lower()
+
+
+class GlobalChart:
+    def __init__(self, path: str, countries):
+        """countries: [(emoji, name, weight), ...] as in GLOBAL_CHART_COUNTRIES."""
+        self.path = path
+        self.markets = [
+            (country_key(name), int(BASE_THRESHOLD / weight)) for _, name, weight in countries
+        ]
+        self.min_streams = min(threshold for _, threshold in self.markets)
+        self.day = None
+        self.songs = {}  # song key -> {country key: [rank, peak, prev_rank, new_peak]}
+
+    def run(self, day: str, songs, rng):
+        """Rank every song for `day`. songs: iterable of (song key, total streams)."""
+        ranked = {}
+        for key, total_streams in songs:
+            previous = self.songs.get(key, {})
+            if total_streams < self.min_streams and not previous:
+                continue
+            positions = {}
+            for market, threshold in self.markets:
+                prev_rank, prev_peak = None, None
+                if market in previous:
+                    prev_rank, prev_peak = previous[market][0], previous[market][1]
+                if total_streams < threshold:
+                    if prev_peak:
+                        positions[market] = [None, prev_peak, prev_rank, False]
+                    continue
+                base_rank = max(1, int(LOWEST_RANK - (total_streams / threshold) * 50))
+                rank = max(1, min(LOWEST_RANK, base_rank + rng.randint(-5, 5)))
+                new_peak = bool(prev_peak) and rank < prev_peak
+                positions[market] = [rank, min(rank, prev_peak) if prev_peak else rank, prev_rank, new_peak]
+            if positions:
+                ranked[key] = positions
+        self.songs = ranked
+        self.day = day
+
+    def positions(self, key: str) -> dict:
+        """{country key: [rank, peak, prev_rank, new_peak]} from the last pass,
+        for the markets the song is charting in."""
+        return {market: entry for market, entry in self.songs.get(key, {}).items()
+                if entry[0] is not None}
+
+    def import_legacy(self, key: str, global_chart: dict):
+        """Take over a song's old per-song 'global_chart' entry from data.json.
+
+        Returns True if anything was taken over (and so needs saving)."""
+        if key in self.songs or not global_chart:
+            return False
+        self.songs[key] = {
+            market: [entry.get('rank'), entry.get('peak'), None, False]
+            for market, entry in global_chart.items()
+            if isinstance(entry, dict) and entry.get('rank')
+        }
+        return True
+
+    # --- Persistence --------------------------------------------------------
+
+    def save(self):
+        temp_file = self.path + ".tmp"
+        try:
+            with open(temp_file, "w", encoding="utf-8") as f:
+                json.dump({"day": self.day, "songs": self.songs}, f,
+                          ensure_ascii=False, separators=(",", ":"))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_file, self.path)
+        except OSError as e:
+            print(f"Global chart: could not write {self.path}: {e}")
+
+    def load(self):
+        self.day = None
+        self.songs = {}
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                saved = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            # Only costs a fresh pass and the peaks; not worth refusing to start.
+            print(f"Global chart: could not read {self.path}, starting fresh: {e}")
+            return
+        self.day = saved.get("day")
+        self.songs = saved.get("songs", {})
+
+    def reopen(self, path: str):
+        """Switch to another file (replay and benchmarks use a scratch one)."""
+        self.path = path
+        self.load()
@@ -17,10 +17,26 @@ A layout is a plain dict describing where things go on a template image:
 
 Coordinates are plain pixels. Use render_calibration() to draw every slot as a
 labelled box over the template so they can be checked and nudged by eye.
+
+Template PNGs are decoded once and kept in memory (see load_template); a
+template whose file changes on disk is picked up on the next render. Fonts
+come from get_font(), which the hand-drawn Spotify profile and prediction
+scoreboard use as well. Finished images are cached by content in OUTPUT_CACHE
+(see render_cache.py), shared with those two renderers too, and so are the
+resized artwork tiles (see fitted_image). Every graphic is encoded through
+encode_image() with a per-graphic profile from ENCODER_PROFILES.
 """
 
+import functools
+import hashlib
 import io
 import os
+import re
+import textwrap
+import threading
+from collections import OrderedDict
+
+import render_cache
 
 # Pillow is imported lazily so that a missing install degrades to a clear
 # message from the command rather than breaking the bot at startup.
@@ -42,6 +58,37 @@ FONT_CANDIDATES = [
     "/System/Library/Fonts/Supplemental/Arial Bold.ttf",
 ]
 
+# Every font any renderer uses, by family. Each list is tried in order.
+FONT_FAMILIES = {
+    "show": FONT_CANDIDATES,
+    "sans": [
+        "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+        "C:/Windows/Fonts/arial.ttf",
+    ],
+    "sans_bold": [
+        "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
+        "C:/Windows/Fonts/arialbd.ttf",
+    ],
+    # Hangul. One ships in the repo so it works on any host.
+    "cjk": [
+        os.path.join(ASSET_DIR, "assets", "fonts", "NanumGothic-Regular.ttf"),
+        "/usr/share/fonts/truetype/nanum/NanumGothic.ttf",
+        "/usr/share/fonts/opentype/noto/NotoSansCJK-Regular.ttc",
+        "/usr/share/fonts/truetype/noto/NotoSansCJK-Regular.ttc",
+        "C:/Windows/Fonts/malgun.ttf",
+    ],
+}
+
+# Distinct (font file, size) pairs kept loaded. Text fitting steps through
+# sizes 2px at a time, so this is a few dozen in practice.
+FONT_CACHE_SIZE = int(os.getenv("FONT_CACHE_SIZE", "128"))
+
+# Finished PNGs, keyed by everything that went into them (see render_cache.py).
+OUTPUT_CACHE = render_cache.RenderCache.from_env()
+
+# Decoded, resized artwork tiles, by pixel bytes held (see fitted_image).
+VARIANT_CACHE_BYTES = int(float(os.getenv("VARIANT_CACHE_MB", "64")) * 1024 * 1024)
+
 WHITE = (255, 255, 255)
 DARK = (26, 26, 26)
 
@@ -183,19 +230,132 @@ LAYOUTS = {
         "slots": MCOUNTDOWN_SLOTS,
     },
 }
+# A layout may name its ENCODER_PROFILES entry with "encoder"; the default
+# is "show_board".
 
 
-# --- Rendering ----------------------------------------------------------
+# --- Template cache -----------------------------------------------------
+#
+# Decoding a 1920x1080 template is most of a render's fixed cost, and every
+# show board used to do it. Each entry is keyed by layout name and remembers
+# the file's mtime and size, so replacing a PNG on disk takes effect without a
+# restart. Renders run in worker threads, hence the lock.
 
-def _load_font(size):
-    for path in FONT_CANDIDATES:
-        if os.path.exists(path):
+_templates = {}  # layout name -> (mtime_ns, file size, RGBA image)
+_templates_lock = threading.Lock()
+
+
+def load_template(layout_name, copy=True):
+    """The layout's template as an RGBA image, decoded at most once per file version.
+
+    Returns a copy by default, so callers may draw on it. copy=False hands out
+    the cached image itself and is only for callers that never modify it.
+    Raises FileNotFoundError if the file is missing and ValueError if its size
+    is not the layout's "size" (the slot coordinates would all be off).
+    """
+    if not PILLOW_AVAILABLE:
+        raise RuntimeError("Pillow is not installed. Run: pip install Pillow")
+
+    layout = LAYOUTS[layout_name]
+    template_path = os.path.join(ASSET_DIR, layout["file"])
+    try:
+        stat = os.stat(template_path)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Template image not found: {template_path}") from None
+
+    with _templates_lock:
+        cached = _templates.get(layout_name)
+        if cached is None or cached[:2] != (stat.st_mtime_ns, stat.st_size):
+            with Image.open(template_path) as source:
+                template = source.convert("RGBA")
+            expected = tuple(layout["size"])
+            if template.size != expected:
+                raise ValueError(
+                    f"Template {layout['file']} is {template.size[0]}x{template.size[1]}, "
+                    f"but the {layout_name} layout expects {expected[0]}x{expected[1]}"
+                )
+            cached = (stat.st_mtime_ns, stat.st_size, template)
+            _templates[layout_name] = cached
+
+    return cached[2].copy() if copy else cached[2]
+
+
+def warm_templates():
+    """Decode every LAYOUTS template ahead of the first render.
+
+    Problems are printed, not raised: a broken template should fail its own
+    command, not startup. Returns the names of the layouts that loaded.
+    """
+    loaded = []
+    for layout_name in LAYOUTS:
+        try:
+            load_template(layout_name, copy=False)
+            loaded.append(layout_name)
+        except (OSError, ValueError, RuntimeError) as e:
+            print(f"GRAPHICS: could not load the {layout_name} template: {e}")
+    return loaded
+
+
+def warm_worker():
+    """Startup for a render_pool worker process.
+
+    Decodes the templates and resolves every font family once, so the first
+    job a worker takes costs what every later one does. The bot's process
+    owns the output cache; a worker's copy would only hold duplicates.
+    """
+    OUTPUT_CACHE.enabled = False
+    warm_templates()
+    for family in FONT_FAMILIES:
+        _font_path(family)
+
+
+# --- Fonts --------------------------------------------------------------
+#
+# Each family is resolved to a file once, the first time it is asked for, and
+# loaded fonts are shared through an LRU keyed by (path, size), so neither the
+# candidate walk nor ImageFont.truetype runs again for a size already seen.
+
+_font_paths = {}  # family -> resolved path, or None if nothing on the list loads
+
+
+@functools.lru_cache(maxsize=FONT_CACHE_SIZE)
+def _truetype(path, size):
+    return ImageFont.truetype(path, size)
+
+
+def _font_path(family):
+    if family not in _font_paths:
+        resolved = None
+        for path in FONT_FAMILIES[family]:
+            if not os.path.exists(path):
+                continue
             try:
-                return ImageFont.truetype(path, size)
+                _truetype(path, 12)  # Unreadable files fall through to the next
             except OSError:
                 continue
-    return ImageFont.load_default()
+            resolved = path
+            break
+        _font_paths[family] = resolved
+    return _font_paths[family]
+
+
+def get_font(family, size, fallback=True):
+    """A FreeTypeFont for `family` (a FONT_FAMILIES key) at `size`.
+
+    When no file of the family loads, returns Pillow's built-in font, or None
+    with fallback=False so the caller can pick another family.
+    """
+    path = _font_path(family)
+    if path is None:
+        return ImageFont.load_default() if fallback else None
+    return _truetype(path, size)
+
+
+def _load_font(size):
+    return get_font("show", size)
+
 
+# --- Rendering ----------------------------------------------------------
 
 def _text_width(draw, text, font):
     return draw.textbbox((0, 0), text, font=font)[2]
@@ -236,49 +396,258 @@ def _layout_text(draw, text, slot):
     """Fit text into the slot: shrink, then wrap, then ellipsize.
 
     Long album names like 'CHRYSALIS (English Ver + Sped up Ver.)' would
-    otherwise run straight out of their panel.
+    otherwise run straight out of their panel. The same names land in the
+    same slots show after show, so the result is memoized (see _fit_text).
     """
-    size = slot.size
     if not slot.max_width:
-        return [text], _load_font(size)
-
-    while size >= slot.min_size:
-        font = _load_font(size)
-        if _text_width(draw, text, font) <= slot.max_width:
-            return [text], font
-        if slot.max_lines > 1:
-            wrapped = _wrap(draw, text, font, slot.max_width, slot.max_lines)
+        return [text], _load_font(slot.size)
+    lines, size = _fit_text(text, slot.size, slot.min_size, slot.max_width,
+                            slot.max_lines, _font_path("show"), draw.mode)
+    return list(lines), _load_font(size)
+
+
+# Measurements only depend on the draw's mode, not on what it draws on.
+_measure_draws = {}
+
+
+def _measure_draw(mode):
+    if mode not in _measure_draws:
+        _measure_draws[mode] = ImageDraw.Draw(Image.new(mode, (1, 1)))
+    return _measure_draws[mode]
+
+
+@functools.lru_cache(maxsize=int(os.getenv("TEXT_FIT_CACHE_SIZE", "2048")))
+def _fit_text(text, size, min_size, max_width, max_lines, font_path, mode):
+    """(lines, font size) for _layout_text. font_path is only part of the key.
+
+    Tries sizes size, size-2, ... down to min_size and takes the largest that
+    fits, as a plain 2px walk would, but bisects over those sizes instead of
+    trying each: anything that fits at one size also fits at a smaller one.
+    """
+    draw = _measure_draw(mode)
+
+    def fit(candidate):
+        font = _load_font(candidate)
+        if _text_width(draw, text, font) <= max_width:
+            return (text,)
+        if max_lines > 1:
+            wrapped = _wrap(draw, text, font, max_width, max_lines)
             if wrapped:
-                return wrapped, font
-        size -= 2
+                return tuple(wrapped)
+        return None
+
+    sizes = range(size, min_size - 1, -2)
+    low, high = 0, len(sizes)  # Find the first index that fits, if any
+    best = None
+    while low < high:
+        middle = (low + high) // 2
+        lines = fit(sizes[middle])
+        if lines:
+            best = (lines, sizes[middle])
+            high = middle
+        else:
+            low = middle + 1
+    if best:
+        return best
 
     # Still too big at the minimum size: wrap if allowed, otherwise cut it.
-    font = _load_font(slot.min_size)
-    if slot.max_lines > 1:
-        wrapped = _wrap(draw, text, font, slot.max_width, slot.max_lines)
+    font = _load_font(min_size)
+    if max_lines > 1:
+        wrapped = _wrap(draw, text, font, max_width, max_lines)
         if wrapped:
-            return wrapped, font
-    return [_ellipsize(draw, text, font, slot.max_width)], font
+            return tuple(wrapped), min_size
+    return (_ellipsize(draw, text, font, max_width),), min_size
+
 
+def _fit_scale(src_w, src_h, box_w, box_h, mode):
+    if mode in ("cover", "cover_top"):
+        return max(box_w / src_w, box_h / src_h)
+    return min(box_w / src_w, box_h / src_h)
 
-def _fit_image(img, box_w, box_h, mode="cover"):
-    """Resize preserving aspect ratio; 'cover' crops the overflow."""
-    img = img.convert("RGBA")
+
+def _fit_image(img, box_w, box_h, mode="cover", color_mode="RGBA"):
+    """Resize preserving aspect ratio; 'cover' crops the overflow.
+
+    'cover_top' crops like 'cover' but keeps the top edge (page headers).
+    """
+    img = img.convert(color_mode)
     src_w, src_h = img.size
     if src_w == 0 or src_h == 0:
         return img
 
-    scale = max(box_w / src_w, box_h / src_h) if mode == "cover" else min(box_w / src_w, box_h / src_h)
-    new_size = (max(1, int(src_w * scale)), max(1, int(src_h * scale)))
+    scale = _fit_scale(src_w, src_h, box_w, box_h, mode)
+    if mode in ("cover", "cover_top"):
+        # Never short of the box: int() of e.g. 344 * (46 / 344) can come out
+        # at 45, and the crop would pad a black row and column.
+        new_size = (max(box_w, round(src_w * scale)), max(box_h, round(src_h * scale)))
+    else:
+        new_size = (max(1, int(src_w * scale)), max(1, int(src_h * scale)))
     img = img.resize(new_size, Image.LANCZOS)
 
-    if mode == "cover":
+    if mode in ("cover", "cover_top"):
         left = (img.width - box_w) // 2
-        top = (img.height - box_h) // 2
+        top = (img.height - box_h) // 2 if mode == "cover" else 0
         img = img.crop((left, top, left + box_w, top + box_h))
     return img
 
 
+# --- Artwork variants ---------------------------------------------------
+#
+# The same few covers are fitted into the same few boxes over and over (46px
+# track thumbnails, 150px release tiles, the era boxes), and each time the
+# source was decoded at full size and LANCZOS-resized again. fitted_image
+# keeps the finished tiles in an LRU keyed by (content digest, box, fit,
+# colour mode). On a miss, JPEGs are decoded in draft mode: libjpeg scales by
+# 1/2, 1/4 or 1/8 while decoding, to the smallest size still at least as
+# big as the resize needs, which cuts most of the decode for big photos.
+
+_variants = OrderedDict()  # key -> Image, least recently used first
+_variants_bytes = 0
+_variants_lock = threading.Lock()
+
+
+def _decode_for(data, box_w, box_h, mode):
+    img = Image.open(io.BytesIO(data))
+    src_w, src_h = img.size
+    if img.format == "JPEG" and src_w and src_h:
+        scale = _fit_scale(src_w, src_h, box_w, box_h, mode)
+        if scale < 1:
+            img.draft("RGB", (max(1, int(src_w * scale) + 1), max(1, int(src_h * scale) + 1)))
+    return img
+
+
+def fitted_image(source, box_w, box_h, mode="cover", color_mode="RGBA"):
+    """`source` (raw bytes or a PIL image) fitted to box_w x box_h.
+
+    Tiles made from bytes are cached and shared: paste them, don't draw on
+    them. Raises whatever Pillow raises for bytes it can't decode.
+    """
+    if hasattr(source, "convert"):
+        return _fit_image(source, box_w, box_h, mode, color_mode)
+
+    global _variants_bytes
+    key = (hashlib.sha256(source).digest(), box_w, box_h, mode, color_mode)
+    with _variants_lock:
+        tile = _variants.get(key)
+        if tile is not None:
+            _variants.move_to_end(key)
+            return tile
+
+    tile = _fit_image(_decode_for(source, box_w, box_h, mode), box_w, box_h, mode, color_mode)
+    size = tile.width * tile.height * len(tile.getbands())
+    with _variants_lock:
+        if key not in _variants and size <= VARIANT_CACHE_BYTES:
+            _variants[key] = tile
+            _variants_bytes += size
+            while _variants_bytes > VARIANT_CACHE_BYTES:
+                _, evicted = _variants.popitem(last=False)
+                _variants_bytes -= evicted.width * evicted.height * len(evicted.getbands())
+    return tile
+
+
+# --- Output encoding ----------------------------------------------------
+#
+# Saving a 1920x1080 board as default PNG took ~870ms, most of a render, and
+# made a 2.2MB upload. Each kind of graphic now has a profile: a byte budget
+# and the encoders it accepts, listed fastest first. encode_image uses the
+# first one whose output fits the budget, or the smallest if none does.
+# Timings for one Music Core board on the dev box, for reference:
+#
+#     JPEG q92 4:4:4      ~15ms   ~0.6MB     WebP q90 method 2   ~140ms  ~0.3MB
+#     PNG level 1         ~290ms  ~2.6MB     palette PNG         ~110ms  ~0.3MB
+#     PNG default         ~870ms  ~2.2MB
+#
+# JPEG is skipped for images with real transparency. The profiles are part
+# of graphics.py, so changing one also changes the output cache keys.
+
+ENCODER_PROFILES = {
+    # Photos behind crisp text: 4:4:4 JPEG keeps the text edges clean. No
+    # lossless option leads because none fits the budget on any board (all
+    # three layouts, 1920x1080): PNG level 1 is 2.6-3.0MB in 240-330ms, and
+    # lossless WebP 1.7-1.9MB in 0.9-1.7s, so trying one first would only add
+    # its time to every render before falling through to JPEG (~20ms, 0.55-0.7MB).
+    "show_board": {
+        "budget": 1_500_000,
+        "encoders": [
+            ("jpeg", {"quality": 92, "subsampling": 0}),
+            ("webp", {"quality": 90, "method": 2}),
+            ("png_palette", {"colors": 256}),
+        ],
+    },
+    "spotify": {
+        "budget": 1_000_000,
+        "encoders": [
+            ("jpeg", {"quality": 90, "subsampling": 0}),
+            ("webp", {"quality": 88, "method": 2}),
+        ],
+    },
+    # Flat colours and small text: PNG is both small and exact here.
+    "predict": {
+        "budget": 300_000,
+        "encoders": [
+            ("png", {"compress_level": 1}),
+            ("png_palette", {"colors": 64}),
+            ("png", {"compress_level": 9}),
+        ],
+    },
+    # Coordinates are checked by eye against this one; keep it lossless.
+    "calibration": {
+        "budget": None,
+        "encoders": [("png", {"compress_level": 1})],
+    },
+}
+
+_FORMATS = {"jpeg": "JPEG", "webp": "WEBP", "png": "PNG", "png_palette": "PNG"}
+
+
+def _opaque(img):
+    return "A" not in img.getbands() or img.getchannel("A").getextrema()[0] == 255
+
+
+def _encode(img, encoder, options):
+    if encoder == "jpeg":
+        img = img.convert("RGB")
+    elif encoder == "png_palette":
+        img = img.quantize(options.pop("colors", 256), method=Image.Quantize.FASTOCTREE)
+    out = io.BytesIO()
+    img.save(out, format=_FORMATS[encoder], **options)
+    return out
+
+
+def encode_image(img, profile):
+    """Encode `img` with the named ENCODER_PROFILES entry. Returns a BytesIO."""
+    settings = ENCODER_PROFILES[profile]
+    budget = settings["budget"]
+    opaque = None
+    best = None
+    for encoder, options in settings["encoders"]:
+        if encoder == "jpeg":
+            if opaque is None:
+                opaque = _opaque(img)
+            if not opaque:
+                continue
+        out = _encode(img, encoder, dict(options))
+        if budget is None or out.tell() <= budget:
+            best = out
+            break
+        if best is None or out.tell() < best.tell():
+            best = out
+    if best is None:  # Only JPEG was allowed and the image has transparency
+        best = _encode(img, "png", {})
+    best.seek(0)
+    return best
+
+
+def image_extension(data):
+    """File extension for encoded image bytes or a BytesIO, from its magic."""
+    head = data.getvalue()[:12] if hasattr(data, "getvalue") else bytes(data[:12])
+    if head.startswith(b"\xff\xd8"):
+        return "jpg"
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "webp"
+    return "png"
+
+
 def _iter_slots(layout):
     """Yields (slot, panel_index, dx, dy) for every slot, expanding repeats."""
     repeat = layout.get("repeat")
@@ -294,6 +663,13 @@ def _iter_slots(layout):
 WINNER_GOLD = (255, 214, 0)
 
 
+def _template_version(layout_name, *args, **kwargs):
+    """Part of the output cache key: a replaced template file must not hit."""
+    stat = os.stat(os.path.join(ASSET_DIR, LAYOUTS[layout_name]["file"]))
+    return stat.st_mtime_ns, stat.st_size
+
+
+@OUTPUT_CACHE.memoize("template", salt=_template_version)
 def render_template(layout_name, panel_data, images=None, color_overrides=None):
     """Render a template.
 
@@ -302,17 +678,15 @@ def render_template(layout_name, panel_data, images=None, color_overrides=None):
     color_overrides: dict of (panel_index, slot_name) -> RGB tuple, used to
                      highlight the winner's total.
 
-    Returns a BytesIO holding a PNG, ready for discord.File.
+    Returns a BytesIO holding the encoded image (see encode_image), ready for
+    discord.File; image_extension() gives the file extension to use.
     """
     if not PILLOW_AVAILABLE:
         raise RuntimeError("Pillow is not installed. Run: pip install Pillow")
 
     layout = LAYOUTS[layout_name]
-    template_path = os.path.join(ASSET_DIR, layout["file"])
-    if not os.path.exists(template_path):
-        raise FileNotFoundError(f"Template image not found: {template_path}")
-
-    template = Image.open(template_path).convert("RGBA")
+    # Only composited onto the canvas below, never drawn on, so no copy.
+    template = load_template(layout_name, copy=False)
     images = images or {}
     color_overrides = color_overrides or {}
 
@@ -326,9 +700,8 @@ def render_template(layout_name, panel_data, images=None, color_overrides=None):
             if source is None:
                 continue
             try:
-                img = source if hasattr(source, "convert") else Image.open(io.BytesIO(source))
                 x, y, w, h = slot.box
-                target.paste(_fit_image(img, w, h, slot.fit), (x + dx, y + dy))
+                target.paste(fitted_image(source, w, h, slot.fit), (x + dx, y + dy))
             except Exception as e:
                 print(f"GRAPHICS: could not place {slot.name} on panel {panel}: {e}")
 
@@ -366,12 +739,10 @@ def render_template(layout_name, panel_data, images=None, color_overrides=None):
                 stroke_fill=slot.stroke_color,
             )
 
-    out = io.BytesIO()
-    base.save(out, format="PNG")
-    out.seek(0)
-    return out
+    return encode_image(base, layout.get("encoder", "show_board"))
 
 
+@OUTPUT_CACHE.memoize("mcountdown", salt=lambda *args, **kwargs: _template_version("mcountdown"))
 def render_mcountdown(left, right, left_art=None, right_art=None):
     """Render the M Countdown head-to-head board.
 
@@ -403,6 +774,237 @@ def render_mcountdown(left, right, left_art=None, right_art=None):
     return render_template("mcountdown", [panel], images)
 
 
+# --- Hand-drawn graphics ------------------------------------------------
+#
+# Not template based: the /predict scoreboard and the /spotify profile are
+# drawn from scratch, so they adapt to any number of rows. They live here
+# rather than in main.py so render_pool workers can import them without
+# loading the bot.
+
+@OUTPUT_CACHE.memoize("predict")
+def create_predict_scoreboard(albums_scores: list[dict], show_name: str = "Music Bank") -> io.BytesIO:
+    """Creates a K-pop award show style scoreboard image using Pillow."""
+    
+    bg_color = (25, 16, 35)
+    header_color = (142, 77, 187)
+    row_color_1 = (46, 31, 60)
+    row_color_2 = (35, 22, 48)
+    text_color = (245, 241, 250)
+    gold_color = (255, 215, 0)
+    pink_accent = (255, 105, 180)
+    
+    width = 900
+    header_height = 60
+    row_height = 45
+    num_rows = min(len(albums_scores), 10)
+    footer_height = 40
+    height = header_height + (row_height * (num_rows + 1)) + footer_height + 20
+    
+    img = Image.new('RGB', (width, height), bg_color)
+    draw = ImageDraw.Draw(img)
+    
+    font_bold = get_font("sans_bold", 16)
+    font_regular = get_font("sans", 14)
+    font_small = get_font("sans", 11)
+    font_title = get_font("sans_bold", 22)
+    
+    draw.rectangle([(0, 0), (width, header_height)], fill=header_color)
+    title = f"{show_name.upper()} PREDICTION"
+    title_width = len(title) * 10
+    draw.text((width // 2 - title_width // 2, 18), title, fill=text_color, font=font_title)
+    
+    y = header_height + 5
+    col_positions = [15, 60, 220, 370, 450, 540, 630, 720, 810]
+    headers = ["#", "ARTIST", "SONG", "TOTAL", "DIG", "PHY", "SNS", "BRD", ""]
+    
+    draw.rectangle([(0, y), (width, y + row_height)], fill=header_color)
+    for i, header in enumerate(headers):
+        draw.text((col_positions[i], y + 12), header, fill=text_color, font=font_bold)
+    
+    y += row_height
+    
+    winner_idx = 0
+    max_total = 0
+    for i, album in enumerate(albums_scores[:10]):
+        if album['total'] > max_total:
+            max_total = album['total']
+            winner_idx = i
+    
+    for i, album in enumerate(albums_scores[:10]):
+        row_color = row_color_1 if i % 2 == 0 else row_color_2
+        draw.rectangle([(0, y), (width, y + row_height)], fill=row_color)
+        
+        rank_text = f"#{i + 1}"
+        draw.text((col_positions[0], y + 12), rank_text, fill=gold_color if i == 0 else text_color, font=font_bold)
+        
+        artist = album['group'][:15]
+        draw.text((col_positions[1], y + 12), artist, fill=pink_accent, font=font_bold)
+        
+        song = album['album'][:12]
+        draw.text((col_positions[2], y + 12), song, fill=text_color, font=font_regular)
+        
+        total_color = gold_color if i == winner_idx else text_color
+        draw.text((col_positions[3], y + 12), str(album['total']), fill=total_color, font=font_bold)
+        
+        draw.text((col_positions[4], y + 12), str(album['digital']), fill=text_color, font=font_regular)
+        draw.text((col_positions[5], y + 12), str(album['physical']), fill=text_color, font=font_regular)
+        draw.text((col_positions[6], y + 12), str(album['sns']), fill=text_color, font=font_regular)
+        draw.text((col_positions[7], y + 12), str(album['broadcast']), fill=text_color, font=font_regular)
+        
+        if i == winner_idx:
+            draw.text((col_positions[8], y + 12), "WIN", fill=gold_color, font=font_bold)
+        
+        y += row_height
+    
+    y += 10
+    disclaimer = "Auto Prediction — Not official"
+    draw.text((width // 2 - 80, y), disclaimer, fill=(150, 140, 160), font=font_small)
+    
+    return encode_image(img, "predict")
+
+
+# A shareable, Spotify-style artist profile image, drawn from scratch so it
+# adapts to any number of tracks/releases.
+
+def _spotify_font(size, bold=False):
+    return get_font("sans_bold" if bold else "sans", size)
+
+
+def _spotify_cjk_font(size):
+    """A font that can render Hangul, or None (see FONT_FAMILIES)."""
+    return get_font("cjk", size, fallback=False)
+
+
+def _spotify_square(img_bytes, size):
+    """Center-cropped square cover of `size`px, or a neutral placeholder."""
+    try:
+        return fitted_image(img_bytes, size, size, "cover", "RGB")
+    except Exception:
+        return Image.new("RGB", (size, size), (40, 40, 48))
+
+
+def _spotify_truncate(draw, text, font, max_w):
+    if draw.textlength(text, font=font) <= max_w:
+        return text
+    while text and draw.textlength(text + "…", font=font) > max_w:
+        text = text[:-1]
+    return text.rstrip() + "…"
+
+
+@OUTPUT_CACHE.memoize("spotify")
+def create_spotify_profile(profile: dict) -> io.BytesIO:
+    """Render a Spotify-style profile PNG. See /spotify for the data shape."""
+    W = 900
+    BG = (18, 18, 20)
+    GREEN = (30, 215, 96)
+    WHITE = (255, 255, 255)
+    GREY = (179, 179, 179)
+
+    header_h = 360
+    content_top = header_h + 34
+    tracks = profile["tracks"]
+    releases = profile["releases"]
+
+    f_name = _spotify_font(60, bold=True)
+    f_section = _spotify_font(24, bold=True)
+    f_track = _spotify_font(18)
+    f_small = _spotify_font(15)
+    f_tiny = _spotify_font(13)
+    f_rank = _spotify_font(16)
+    # CJK-capable fonts, used per-string only when a name actually has Hangul,
+    # so Latin text keeps the nicer DejaVu look.
+    cjk_track = _spotify_cjk_font(18)
+    cjk_small = _spotify_cjk_font(15)
+
+    def _pick(text, latin_font, cjk_font):
+        has_hangul = any('가' <= c <= '힣' or '㄰' <= c <= '㆏' for c in text)
+        return cjk_font if (has_hangul and cjk_font) else latin_font
+
+    # --- measure so the canvas is exactly tall enough ---
+    left_h = 40 + len(tracks) * 58
+    rel_rows = (len(releases) + 1) // 2
+    right_h = 40 + rel_rows * (150 + 48)
+    about = (profile.get("description") or "").strip()
+    # Bios sometimes use markdown (**bold**, *italic*, etc.) which can't render as
+    # styling in an image — strip the markers so they don't show literally.
+    about = re.sub(r'(\*\*|\*|__|~~|`)', '', about)
+    about_wrapped = textwrap.wrap(about, width=95)[:6] if about else []
+    about_h = (30 + len(about_wrapped) * 24 + 20) if about_wrapped else 0
+    height = content_top + max(left_h, right_h) + about_h + 30
+
+    img = Image.new("RGB", (W, height), BG)
+    draw = ImageDraw.Draw(img)
+
+    # --- header image + fade into the page ---
+    if profile.get("header"):
+        try:
+            img.paste(fitted_image(profile["header"], W, header_h, "cover_top", "RGB"), (0, 0))
+        except Exception:
+            draw.rectangle([0, 0, W, header_h], fill=(60, 40, 75))
+    else:
+        draw.rectangle([0, 0, W, header_h], fill=(60, 40, 75))
+
+    fade = Image.new("RGBA", (W, header_h), (0, 0, 0, 0))
+    fd = ImageDraw.Draw(fade)
+    for y in range(header_h):
+        alpha = int(255 * (y / header_h) ** 1.4)
+        fd.line([(0, y), (W, y)], fill=(BG[0], BG[1], BG[2], alpha))
+    img.paste(fade, (0, 0), fade)
+
+    # --- header text ---
+    x = 50
+    name = _spotify_truncate(draw, profile["name"], f_name, W - 100)
+    draw.text((x, header_h - 172), name, font=f_name, fill=WHITE)
+    # Verified badge sits under the name (where the korean name used to be).
+    draw.text((x, header_h - 92), "✓ Verified Artist", font=f_small, fill=GREEN)
+    listeners = f"{profile['monthly_listeners']:,} monthly listeners"
+    draw.text((x, header_h - 56), listeners, font=f_small, fill=WHITE)
+
+    # --- Top tracks (left column) ---
+    lx = 50
+    draw.text((lx, content_top), "Top tracks", font=f_section, fill=WHITE)
+    ty = content_top + 46
+    for i, t in enumerate(tracks, 1):
+        draw.text((lx, ty + 14), str(i), font=f_rank, fill=GREY)
+        cover = _spotify_square(t.get("cover"), 46)
+        img.paste(cover, (lx + 28, ty))
+        track_font = _pick(t["name"], f_track, cjk_track)
+        name = _spotify_truncate(draw, t["name"], track_font, 250)
+        draw.text((lx + 86, ty + 12), name, font=track_font, fill=WHITE)
+        plays = f"{t['plays']:,}"
+        draw.text((lx + 430, ty + 14), plays, font=f_small, fill=GREY, anchor="ra")
+        ty += 58
+
+    # --- Popular releases (right column, 2-wide grid) ---
+    rx = 520
+    draw.text((rx, content_top), "Popular releases", font=f_section, fill=WHITE)
+    gy = content_top + 46
+    for idx, r in enumerate(releases):
+        col = idx % 2
+        row = idx // 2
+        cx = rx + col * 168
+        cy = gy + row * (150 + 48)
+        img.paste(_spotify_square(r.get("cover"), 150), (cx, cy))
+        title_font = _pick(r["title"], f_small, cjk_small)
+        title = _spotify_truncate(draw, r["title"], title_font, 150)
+        draw.text((cx, cy + 156), title, font=title_font, fill=WHITE)
+        draw.text((cx, cy + 176), r.get("subtitle", ""), font=f_tiny, fill=GREY)
+
+    # --- About ---
+    # The description can contain Hangul (e.g. the korean name), so render it
+    # with the CJK font when available; DejaVu would show boxes.
+    f_about = _spotify_cjk_font(15) or f_small
+    if about_wrapped:
+        ay = content_top + max(left_h, right_h) + 10
+        draw.text((50, ay), "About", font=f_section, fill=WHITE)
+        ay += 34
+        for line in about_wrapped:
+            draw.text((50, ay), line, font=f_about, fill=GREY)
+            ay += 24
+
+    return encode_image(img, "spotify")
+
+
 def render_calibration(layout_name):
     """Draw every slot as a labelled box over the bare template.
 
@@ -413,7 +1015,7 @@ def render_calibration(layout_name):
         raise RuntimeError("Pillow is not installed. Run: pip install Pillow")
 
     layout = LAYOUTS[layout_name]
-    base = Image.open(os.path.join(ASSET_DIR, layout["file"])).convert("RGBA")
+    base = load_template(layout_name)
     draw = ImageDraw.Draw(base)
     label_font = _load_font(18)
 
@@ -428,7 +1030,4 @@ def render_calibration(layout_name):
             draw.line([x, y - 14, x, y + 14], fill=(255, 0, 255), width=2)
             draw.text((x + 16, y - 22), f"{slot.name} ({x},{y})", font=label_font, fill=(255, 0, 255))
 
-    out = io.BytesIO()
-    base.save(out, format="PNG")
-    out.seek(0)
-    return out
+    return encode_image(base, "calibration")
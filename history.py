@@ -0,0 +1,76 @@
+"""Bounded histories for groups and members.
+
+Several records are "the last N things that happened": a group's
+recent_events and reputation_history, a member's history, and each group's
+random_events_log. They used to be plain lists grown with append and then cut
+back by slicing, with a different cap at every call site (20 here, 10 there,
+none at all for member history and the random events log), so some of them
+grew for as long as a group existed and were rewritten on every save.
+
+BoundedHistory is a deque with one fixed cap per kind: appending is O(1) and
+drops the oldest entry once the cap is reached, so size stays flat forever.
+It saves as a plain JSON list (see to_json), so data.json keeps its shape.
+
+    history.record(group_entry, 'recent_events', {...})
+
+converts whatever is stored under that key (a list from an older save, or
+nothing yet) on first use.
+"""
+
+from collections import deque
+
+# Entries kept per kind. Member history is keyed 'history' on the member dict.
+HISTORY_CAPS = {
+    "recent_events": 20,
+    "reputation_history": 20,
+    "history": 20,
+    "random_events_log": 50,
+}
+
+
+class BoundedHistory(deque):
+    """A deque capped at HISTORY_CAPS[kind], oldest entries dropped first."""
+
+    def __init__(self, kind: str, items=()):
+        super().__init__(items or (), maxlen=HISTORY_CAPS[kind])
+        self.kind = kind
+
+    def __reduce__(self):
+        return type(self), (self.kind, list(self))
+
+    def __copy__(self):
+        return type(self)(self.kind, self)
+
+    def to_json(self):
+        return list(self)
+
+
+def history_of(entry: dict, key: str, kind: str = None) -> BoundedHistory:
+    """entry[key] as a BoundedHistory, converting (and trimming) it in place."""
+    value = entry.get(key)
+    if isinstance(value, BoundedHistory):
+        return value
+    value = BoundedHistory(kind or key, value if isinstance(value, list) else ())
+    entry[key] = value
+    return value
+
+
+def record(entry: dict, key: str, item, kind: str = None):
+    history_of(entry, key, kind).append(item)
+
+
+def bound_group(group_entry: dict):
+    """Convert a group's histories, and its members', after loading."""
+    history_of(group_entry, "recent_events")
+    history_of(group_entry, "reputation_history")
+    for member in group_entry.get("members") or []:
+        if isinstance(member, dict):
+            history_of(member, "history")
+
+
+
+def json_default(obj):
+    """`default=` hook for json.dump on state that may hold histories."""
+    if isinstance(obj, BoundedHistory):
+        return obj.to_json()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
@@ -0,0 +1,219 @@
+"""Downloaded image cache for era art, covers and profile pictures.
+
+Every /musicshow and /spotify downloaded its artwork again, cover by cover,
+even though the same handful of album covers come up over and over. Images
+are now kept here by canonical URL:
+
+    key = canonical_url(url)
+    found, data = art_images.get(key)   # found with data None: a cached 404
+    ...
+    art_images.put(key, data)           # or art_images.put_missing(key)
+
+Discord attachment links carry a signature in their query string that
+changes each time the link is refreshed, and media.discordapp.net serves the
+same files as cdn.discordapp.com. canonical_url() strips both, so a cover is
+one entry however its link was last signed.
+
+Two tiers, like render_cache.py:
+  - memory: an LRU capped by total bytes
+  - disk:   one file per image under `disk_dir`, capped by total bytes,
+            oldest dropped first; survives restarts
+Hits expire after `ttl` seconds (by file age on disk). 404s and 410s are
+remembered in memory for `missing_ttl`, so a dead link isn't retried on
+every render.
+"""
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import urlsplit, urlunsplit
+
+DISCORD_HOSTS = ("cdn.discordapp.com", "media.discordapp.net")
+_SUFFIX = ".img"
+
+
+def is_discord_url(url: str) -> bool:
+    return bool(url) and ("discordapp.com" in url or "discordapp.net" in url)
+
+
+def canonical_url(url: str) -> str:
+    """The URL an image is cached under.
+
+    Discord links lose their signature query and move to the CDN host; other
+    URLs only lose their fragment.
+    """
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host in DISCORD_HOSTS:
+        return urlunsplit(("https", DISCORD_HOSTS[0], parts.path, "", ""))
+    return urlunsplit((parts.scheme.lower(), host, parts.path, parts.query, ""))
+
+
+class ImageCache:
+    def __init__(self, memory_bytes: int, disk_dir: str = None, disk_bytes: int = 0,
+                 ttl: float = 7 * 86400, missing_ttl: float = 3600):
+        self.memory_bytes = memory_bytes
+        self.disk_dir = disk_dir or None
+        self.disk_bytes = disk_bytes
+        self.ttl = ttl
+        self.missing_ttl = missing_ttl
+        self._memory = OrderedDict()  # key -> (stored_at, bytes), least recent first
+        self._memory_total = 0
+        self._missing = {}            # key -> stored_at of the 404
+        self._disk = OrderedDict()    # file name -> size, oldest first
+        self._disk_total = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        if self.disk_dir:
+            self._scan_disk()
+
+    @classmethod
+    def from_env(cls):
+        mb = 1024 * 1024
+        return cls(
+            memory_bytes=int(float(os.getenv("ART_CACHE_MB", "64")) * mb),
+            disk_dir=os.getenv("ART_CACHE_DIR", "art_cache"),
+            disk_bytes=int(float(os.getenv("ART_CACHE_DISK_MB", "512")) * mb),
+            ttl=float(os.getenv("ART_CACHE_TTL_HOURS", "168")) * 3600,
+            missing_ttl=float(os.getenv("ART_CACHE_MISSING_MINUTES", "60")) * 60,
+        )
+
+    # --- Lookup -------------------------------------------------------------
+
+    def get(self, key: str):
+        """(found, bytes). (True, None) means the URL is known to be gone."""
+        now = time.time()
+        with self._lock:
+            missing_since = self._missing.get(key)
+            if missing_since is not None:
+                if now - missing_since < self.missing_ttl:
+                    self.hits += 1
+                    return True, None
+                del self._missing[key]
+
+            entry = self._memory.get(key)
+            if entry is not None:
+                if now - entry[0] < self.ttl:
+                    self._memory.move_to_end(key)
+                    self.hits += 1
+                    return True, entry[1]
+                self._forget_memory(key)
+
+            found = self._read_disk(key, now)
+            if found is not None:
+                stored_at, data = found
+                self._remember(key, data, stored_at)
+                self.hits += 1
+                return True, data
+
+            self.misses += 1
+            return False, None
+
+    def put(self, key: str, data: bytes):
+        now = time.time()
+        with self._lock:
+            self._missing.pop(key, None)
+            self._remember(key, data, now)
+            self._write_disk(key, data)
+
+    def put_missing(self, key: str):
+        with self._lock:
+            self._forget_memory(key)
+            self._missing[key] = time.time()
+
+    # --- Memory tier --------------------------------------------------------
+
+    def _remember(self, key, data, stored_at):
+        self._forget_memory(key)
+        if len(data) > self.memory_bytes:
+            return
+        self._memory[key] = (stored_at, data)
+        self._memory_total += len(data)
+        while self._memory_total > self.memory_bytes:
+            _, (_, evicted) = self._memory.popitem(last=False)
+            self._memory_total -= len(evicted)
+
+    def _forget_memory(self, key):
+        entry = self._memory.pop(key, None)
+        if entry is not None:
+            self._memory_total -= len(entry[1])
+
+    # --- Disk tier ----------------------------------------------------------
+
+    def _path(self, key):
+        return os.path.join(self.disk_dir, hashlib.sha256(key.encode("utf-8")).hexdigest() + _SUFFIX)
+
+    def _scan_disk(self):
+        # Files are named by hash, so the scan tracks them by file name; the
+        # lookups below hash the key the same way. The directory itself is
+        # only created by the first write.
+        if not os.path.isdir(self.disk_dir):
+            return
+        try:
+            entries = []
+            for entry in os.scandir(self.disk_dir):
+                if entry.name.endswith(_SUFFIX) and entry.is_file():
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, entry.name, stat.st_size))
+        except OSError as e:
+            print(f"Art cache: disk tier off, can't use {self.disk_dir}: {e}")
+            self.disk_dir = None
+            return
+        for _, name, size in sorted(entries):
+            self._disk[name] = size
+            self._disk_total += size
+        self._trim_disk()
+
+    def _read_disk(self, key, now):
+        if not self.disk_dir:
+            return None
+        path = self._path(key)
+        name = os.path.basename(path)
+        if name not in self._disk:
+            return None
+        try:
+            stored_at = os.path.getmtime(path)
+            if now - stored_at >= self.ttl:
+                self._drop_disk(name)
+                return None
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            self._disk_total -= self._disk.pop(name)
+            return None
+        self._disk.move_to_end(name)
+        return stored_at, data
+
+    def _write_disk(self, key, data):
+        if not self.disk_dir or len(data) > self.disk_bytes:
+            return
+        path = self._path(key)
+        name = os.path.basename(path)
+        temp_file = f"{path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(self.disk_dir, exist_ok=True)
+            with open(temp_file, "wb") as f:
+                f.write(data)
+            os.replace(temp_file, path)
+        except OSError as e:
+            # Only costs a download next time.
+            print(f"Art cache: could not write {path}: {e}")
+            return
+        self._disk_total -= self._disk.pop(name, 0)
+        self._disk[name] = len(data)
+        self._disk_total += len(data)
+        self._trim_disk()
+
+    def _drop_disk(self, name):
+        self._disk_total -= self._disk.pop(name, 0)
+        try:
+            os.remove(os.path.join(self.disk_dir, name))
+        except OSError:
+            pass
+
+    def _trim_disk(self):
+        while self._disk_total > self.disk_bytes and self._disk:
+            self._drop_disk(next(iter(self._disk)))
@@ -0,0 +1,166 @@
+"""Top-K leaderboards kept up to date as the numbers change.
+
+/groups, /companies, /groupchart and /groupweekly each sorted the whole
+collection on every call to show ten entries, and /groupweekly scanned every
+album once per group on top of that. A TopK instead holds the current best
+`size` entries in a small min-heap and is told about each change as it
+happens, so a read is O(K) no matter how many groups or companies exist.
+
+    board = TopK(10)
+    board.update("TWICE", 5400)      # on every change to that score
+    board.top()                      # [(key, score), ...] best first
+
+Most updates cost O(log K) or O(K). The heap only has to be rebuilt from all
+scores (O(N log K)) when an entry already on the board drops below something
+that might be waiting just outside it, and that rebuild waits for the next
+read.
+
+ScoreTable is a dict that keeps a TopK in step with every write made to it,
+for plain {name: score} tables like company_funds where every
+`table[name] = ...` / `+=` / `-=` is then covered automatically.
+"""
+
+import heapq
+
+DEFAULT_SIZE = 10
+
+
+class TopK:
+    """The best `size` keys by score.
+
+    Equal scores keep the order the keys were first reported in, which is what
+    sorting the source dict with sorted(..., reverse=True) used to give.
+    """
+
+    def __init__(self, size: int = DEFAULT_SIZE):
+        self.size = size
+        self.scores = {}
+        self._order = {}  # key -> when it was first reported, for ties
+        self._next_order = 0
+        self._heap = []  # Min-heap of (score, -order, key): the entries on the board
+        self._members = set()
+        self._outside_best = None  # No (score, -order) off the board is higher than this
+        self._stale = False
+        self._view = None
+
+    def __len__(self):
+        return len(self.scores)
+
+    def __contains__(self, key):
+        return key in self.scores
+
+    def _entry(self, key, score):
+        if key not in self._order:
+            self._order[key] = self._next_order
+            self._next_order += 1
+        return (score, -self._order[key], key)
+
+    def update(self, key, score):
+        self.scores[key] = score
+        entry = self._entry(key, score)
+        if self._stale:
+            return
+        self._view = None
+
+        if key in self._members:
+            if self._outside_best is not None and entry[:2] < self._outside_best:
+                # Something off the board may now beat it; find out on read.
+                self._stale = True
+                return
+            index = next(i for i, (_, _, k) in enumerate(self._heap) if k == key)
+            self._heap[index] = entry
+            heapq.heapify(self._heap)
+        elif len(self._heap) < self.size:
+            heapq.heappush(self._heap, entry)
+            self._members.add(key)
+        elif entry > self._heap[0]:
+            evicted = heapq.heapreplace(self._heap, entry)
+            self._members.discard(evicted[2])
+            self._members.add(key)
+            self._note_outside(evicted[:2])
+        else:
+            self._note_outside(entry[:2])
+
+    def discard(self, key):
+        if key not in self.scores:
+            return
+        del self.scores[key]
+        del self._order[key]  # Reported again later, it ties as a newcomer
+        if key in self._members:
+            # Whatever replaces it is off the board; rebuild on the next read.
+            self._stale = True
+        self._view = None
+
+    def clear(self):
+        self.scores.clear()
+        self._order.clear()
+        self._next_order = 0
+        self._heap = []
+        self._members = set()
+        self._outside_best = None
+        self._stale = False
+        self._view = None
+
+    def rebuild(self):
+        best = heapq.nlargest(self.size + 1, (
+            (score, -self._order[key], key) for key, score in self.scores.items()))
+        self._heap = best[:self.size]
+        heapq.heapify(self._heap)
+        self._members = {key for _, _, key in self._heap}
+        self._outside_best = best[self.size][:2] if len(best) > self.size else None
+        self._stale = False
+        self._view = None
+
+    def _note_outside(self, rank):
+        if self._outside_best is None or rank > self._outside_best:
+            self._outside_best = rank
+
+    def top(self, limit: int = None):
+        """[(key, score), ...] best first, at most `limit` (default: all K)."""
+        if self._stale:
+            self.rebuild()
+        if self._view is None:
+            self._view = [(key, score) for score, _, key in sorted(self._heap, reverse=True)]
+        return self._view[:limit] if limit is not None else list(self._view)
+
+
+class ScoreTable(dict):
+    """A {key: score} dict whose every write is mirrored into `board`."""
+
+    def __init__(self, board: TopK, *args, **kwargs):
+        super().__init__()
+        self.board = board
+        self.update(*args, **kwargs)
+
+    def __setitem__(self, key, score):
+        super().__setitem__(key, score)
+        self.board.update(key, score)
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self.board.discard(key)
+
+    def __reduce__(self):
+        return type(self), (TopK(self.board.size), dict(self))
+
+    def pop(self, key, *default):
+        self.board.discard(key)
+        return super().pop(key, *default)
+
+    def popitem(self):
+        key, score = super().popitem()
+        self.board.discard(key)
+        return key, score
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def update(self, *args, **kwargs):
+        for key, score in dict(*args, **kwargs).items():
+            self[key] = score
+
+    def clear(self):
+        super().clear()
+        self.board.clear()
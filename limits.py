@@ -0,0 +1,167 @@
+"""Daily usage limits, purchased extra uses and cooldowns.
+
+Previously these lived in two free-form dicts: user_daily_limits kept a
+{date: count} map per user per command that was never pruned, so every day
+anyone played added a key that was rewritten on every save forever after, and
+user_cooldowns held datetimes that had to be converted on every load and save.
+
+UsageLimits keeps only what the rules need:
+
+  - counts     uses of each command today. One "day" for everyone (Argentina
+               time, see get_today_str); when it changes, every counter resets
+               at once and yesterday's counts are simply dropped.
+  - extras     extra daily uses bought in the shop. Permanent, kept apart from
+               the counters so a rollover never touches them.
+  - cooldowns  last use of a command as integer epoch seconds. Entries older
+               than COOLDOWN_RETENTION are dropped at rollover.
+
+Recording a use only marks the store dirty; it no longer writes data.json by
+itself. The next save (nearly every command saves anyway) or the periodic
+flush in main.py picks it up.
+
+Saved as:
+
+    "user_daily_limits": {"day": "2026-10-19",
+                          "counts": {user: {command: uses}},
+                          "extras": {user: {command: extra_uses}}},
+    "user_cooldowns": {user: {command: epoch_seconds}}
+
+load() also accepts the old shapes and converts them.
+"""
+
+import time
+from datetime import datetime
+
+COOLDOWN_RETENTION = 30 * 24 * 3600  # Longer than any cooldown in the game
+
+_LEGACY_EXTRA_PREFIX = "extra_"
+
+
+class UsageLimits:
+    def __init__(self, today, now=time.time):
+        """today: callable returning the current game day as 'YYYY-MM-DD'.
+        now: callable returning epoch seconds, for cooldown stamps.
+        """
+        self._today = today
+        self._now = now
+        self.day = None
+        self.counts = {}
+        self.extras = {}
+        self.cooldowns = {}
+        self.dirty = False
+
+    def _rollover(self):
+        today = self._today()
+        if today != self.day:
+            self.day = today
+            self.counts = {}
+            self.prune_cooldowns()
+        return today
+
+    # --- Daily counters -----------------------------------------------------
+
+    def uses_today(self, user_id: str, command: str) -> int:
+        self._rollover()
+        return self.counts.get(user_id, {}).get(command, 0)
+
+    def record_use(self, user_id: str, command: str) -> int:
+        """Count one use of command today. Returns the new count."""
+        self._rollover()
+        user_counts = self.counts.setdefault(user_id, {})
+        user_counts[command] = user_counts.get(command, 0) + 1
+        self.dirty = True
+        return user_counts[command]
+
+    # --- Purchased extras ---------------------------------------------------
+
+    def extra_uses(self, user_id: str, command: str) -> int:
+        return self.extras.get(user_id, {}).get(command, 0)
+
+    def add_extra(self, user_id: str, command: str, amount: int = 1):
+        user_extras = self.extras.setdefault(user_id, {})
+        user_extras[command] = user_extras.get(command, 0) + amount
+        self.dirty = True
+
+    def total_extras(self, user_id: str) -> int:
+        return sum(self.extras.get(user_id, {}).values())
+
+    # --- Cooldowns ----------------------------------------------------------
+
+    def now(self) -> float:
+        return self._now()
+
+    def last_used(self, user_id: str, command: str):
+        """Epoch seconds of the last recorded use, or None."""
+        return self.cooldowns.get(user_id, {}).get(command)
+
+    def touch(self, user_id: str, command: str, now: float = None):
+        stamp = int(now if now is not None else self._now())
+        user_cooldowns = self.cooldowns.setdefault(user_id, {})
+        # Never move a cooldown backwards, even if the wall clock does.
+        user_cooldowns[command] = max(stamp, user_cooldowns.get(command, 0))
+        self.dirty = True
+
+    def prune_cooldowns(self, now: float = None):
+        cutoff = int(now if now is not None else self._now()) - COOLDOWN_RETENTION
+        for user_id in list(self.cooldowns):
+            kept = {cmd: ts for cmd, ts in self.cooldowns[user_id].items() if ts >= cutoff}
+            if kept:
+                self.cooldowns[user_id] = kept
+            else:
+                del self.cooldowns[user_id]
+
+    # --- Persistence --------------------------------------------------------
+
+    def clear(self):
+        self.day = None
+        self.counts = {}
+        self.extras = {}
+        self.cooldowns = {}
+        self.dirty = False
+
+    def to_json(self):
+        """(user_daily_limits, user_cooldowns) as written to data.json."""
+        self._rollover()
+        return (
+            {"day": self.day, "counts": self.counts, "extras": self.extras},
+            self.cooldowns,
+        )
+
+    def load(self, daily_limits: dict, cooldowns: dict):
+        self.clear()
+        daily_limits = daily_limits or {}
+        if "counts" in daily_limits or "extras" in daily_limits:
+            self.day = daily_limits.get("day")
+            self.counts = {u: dict(c) for u, c in (daily_limits.get("counts") or {}).items()}
+            self.extras = {u: dict(e) for u, e in (daily_limits.get("extras") or {}).items()}
+        else:
+            self._load_legacy_limits(daily_limits)
+
+        for user_id, commands in (cooldowns or {}).items():
+            for command, stamp in commands.items():
+                if isinstance(stamp, str):  # Old ISO datetime
+                    try:
+                        stamp = datetime.fromisoformat(stamp).timestamp()
+                    except ValueError:
+                        continue
+                self.cooldowns.setdefault(user_id, {})[command] = int(stamp)
+        self._rollover()
+        self.dirty = False
+
+    def _load_legacy_limits(self, daily_limits: dict):
+        """{user: {command: {date: n}, 'extra_<command>': n,
+        'boycott': {'date': d, 'count': n}}} -> today's counts and extras."""
+        today = self._today()
+        self.day = today
+        for user_id, entries in daily_limits.items():
+            for key, value in entries.items():
+                if key.startswith(_LEGACY_EXTRA_PREFIX) and isinstance(value, int):
+                    if value:
+                        self.extras.setdefault(user_id, {})[key[len(_LEGACY_EXTRA_PREFIX):]] = value
+                elif isinstance(value, dict):
+                    if "date" in value:
+                        uses = value.get("count", 0) if value.get("date") == today else 0
+                    else:
+                        uses = value.get(today, 0)
+                    if uses:
+                        self.counts.setdefault(user_id, {})[key] = uses
@@ -0,0 +1,226 @@
+"""Event-loop lag monitor: catch the code that blocks everyone else.
+
+The bot, its scheduled tasks, the dashboard API and the tunnel bootstrap all
+share one asyncio loop. Anything synchronous that runs on it - save_data, a
+directory listing in _local_era_file, Pillow work done outside to_thread -
+freezes all of them at once, and if it lasts long enough Discord gives up on
+whichever interaction was waiting and the user sees "The application did not
+respond".
+
+Two pieces:
+
+  - A heartbeat coroutine on the loop sleeps for INTERVAL and measures how late
+    it woke up. That lateness is the loop lag every other callback saw too.
+  - A watchdog thread notices when the heartbeat has been silent for longer
+    than the threshold and, while the loop is still stuck, grabs the loop
+    thread's stack. That stack is the blocking call, caught in the act, along
+    with the slash command that was running it (see command_metrics.active).
+
+Each stall is printed when it ends and kept in a ring buffer for
+`/admin lag stalls` / `/admin lag export`.
+
+On by default. LOOP_LAG_THRESHOLD_MS sets what counts as a stall (default
+250); set it to 0 to turn the monitor off.
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+
+import command_metrics
+
+INTERVAL = 0.1             # Heartbeat period, seconds
+DEFAULT_THRESHOLD_MS = 250
+LAG_WINDOW = 3000          # Recent lag samples kept (~5 minutes at INTERVAL)
+STALLS_KEPT = 50
+STACK_DEPTH = 40
+
+_REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def _frame_chain(frame):
+    frames = []
+    while frame is not None:
+        frames.append(frame)
+        frame = frame.f_back
+    return frames
+
+
+def _blame(summary):
+    """The innermost frame that is our code, which is usually the culprit."""
+    for entry in reversed(summary):
+        if entry.filename.startswith(_REPO_DIR) and os.path.basename(entry.filename) != "loop_monitor.py":
+            return f"{os.path.basename(entry.filename)}:{entry.lineno} in {entry.name}"
+    if summary:
+        entry = summary[-1]
+        return f"{os.path.basename(entry.filename)}:{entry.lineno} in {entry.name}"
+    return "unknown"
+
+
+class LoopMonitor:
+    def __init__(self, threshold_ms=DEFAULT_THRESHOLD_MS, interval=INTERVAL):
+        self.threshold = threshold_ms / 1000
+        self.interval = interval
+        self.lags = deque(maxlen=LAG_WINDOW)
+        self.stalls = deque(maxlen=STALLS_KEPT)
+        self.max_lag = 0.0
+        self.total_stalls = 0
+        self.since = time.time()
+        self._loop = None
+        self._loop_thread_id = None
+        self._last_beat = time.perf_counter()
+        self._pending = None  # Stall captured by the watchdog, finished by the heartbeat
+        self._heartbeat_task = None
+        self._watchdog = None
+        self._stopping = threading.Event()
+
+    @property
+    def running(self):
+        return self._heartbeat_task is not None and not self._heartbeat_task.done()
+
+    def start(self, loop=None):
+        """Start monitoring the running loop. Call from inside that loop."""
+        if self.running:
+            return
+        self._loop = loop or asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.perf_counter()
+        self._stopping.clear()
+        self._heartbeat_task = self._loop.create_task(self._heartbeat(), name="loop-monitor-heartbeat")
+        self._watchdog = threading.Thread(target=self._watch, name="loop-monitor-watchdog", daemon=True)
+        self._watchdog.start()
+        print(f"Loop monitor: reporting stalls over {self.threshold * 1000:.0f}ms")
+
+    def stop(self):
+        self._stopping.set()
+        if self._heartbeat_task:
+            self._heartbeat_task.cancel()
+
+    def reset(self):
+        self.lags.clear()
+        self.stalls.clear()
+        self.max_lag = 0.0
+        self.total_stalls = 0
+        self.since = time.time()
+
+    # --- Loop side ----------------------------------------------------------
+
+    async def _heartbeat(self):
+        while True:
+            expected = time.perf_counter() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.perf_counter()
+            lag = max(0.0, now - expected)
+            self._last_beat = now
+            self.lags.append(lag)
+            self.max_lag = max(self.max_lag, lag)
+
+            pending, self._pending = self._pending, None
+            if pending is not None:
+                # Measured from the last beat before the stall rather than this
+                # beat's lag, so a capture that lands just after the loop woke
+                # up still gets the right length.
+                stalled = max(now - pending.pop("_beat") - self.interval, lag)
+                if stalled < self.threshold:
+                    continue  # The watchdog was early (or slow itself); not a stall
+                pending["duration_ms"] = round(stalled * 1000, 1)
+                self.stalls.append(pending)
+                self.total_stalls += 1
+                print(f"LOOP STALL: blocked {pending['duration_ms']:,.0f}ms at {pending['where']}"
+                      + (f" during /{pending['command']}" if pending["command"] else ""))
+
+    # --- Watchdog thread ----------------------------------------------------
+
+    def _watch(self):
+        captured_for = None
+        while not self._stopping.wait(self.interval / 2):
+            last_beat = self._last_beat
+            # The heartbeat sleeps INTERVAL between beats; only time past that is lag.
+            if time.perf_counter() - last_beat - self.interval < self.threshold:
+                continue
+            if captured_for == last_beat:
+                continue  # Already caught this stall; wait for the loop to come back
+            captured_for = last_beat
+            try:
+                self._pending = self._capture(last_beat)
+            except Exception as e:
+                print(f"Loop monitor: could not capture stack: {e}")
+
+    def _capture(self, last_beat):
+        frame = sys._current_frames().get(self._loop_thread_id)
+        if frame is None:
+            return None
+        chain = _frame_chain(frame)
+        summary = traceback.StackSummary.extract(
+            ((f, f.f_lineno) for f in reversed(chain[:STACK_DEPTH])), capture_locals=False
+        )
+        return {
+            "_beat": last_beat,
+            "at": round(time.time(), 3),
+            "duration_ms": None,
+            "command": self._active_command(chain),
+            "where": _blame(summary),
+            "stack": [f"{os.path.basename(e.filename)}:{e.lineno} in {e.name}" for e in summary],
+        }
+
+    @staticmethod
+    def _active_command(chain):
+        """Which running slash command owns the blocked frames, if any."""
+        frame_ids = {id(f) for f in chain}
+        try:
+            active = list(command_metrics.metrics.active.items())
+        except RuntimeError:  # Resized under us; the loop just woke up
+            return None
+        for task, sample in active:
+            coro = task.get_coro()
+            if coro is not None and id(getattr(coro, "cr_frame", None)) in frame_ids:
+                return sample.command
+        return None
+
+    # --- Reporting ----------------------------------------------------------
+
+    def summary(self):
+        ordered = sorted(self.lags)
+
+        def pct(p):
+            if not ordered:
+                return 0.0
+            return round(ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))] * 1000, 1)
+
+        return {
+            "running": self.running,
+            "threshold_ms": round(self.threshold * 1000),
+            "since": round(self.since, 3),
+            "samples": len(ordered),
+            "lag_p50_ms": pct(50),
+            "lag_p99_ms": pct(99),
+            "lag_max_ms": round(self.max_lag * 1000, 1),
+            "stalls": self.total_stalls,
+        }
+
+    def export(self):
+        return {**self.summary(), "recent_stalls": list(self.stalls)}
+
+
+def _threshold_from_env():
+    raw = os.getenv("LOOP_LAG_THRESHOLD_MS", "").strip()
+    try:
+        return float(raw) if raw else DEFAULT_THRESHOLD_MS
+    except ValueError:
+        print(f"Loop monitor: ignoring invalid LOOP_LAG_THRESHOLD_MS={raw!r}")
+        return DEFAULT_THRESHOLD_MS
+
+
+# The process-wide monitor; main.py starts it from setup_hook.
+monitor = LoopMonitor(_threshold_from_env())
+
+
+def start():
+    if monitor.threshold <= 0:
+        print("Loop monitor: disabled (LOOP_LAG_THRESHOLD_MS=0)")
+        return
+    monitor.start()
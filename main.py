@@ -2,22 +2,55 @@ import discord
 from discord.ext import commands, tasks
 from discord import app_commands, ui
 import os
-import random
 import io
 from dotenv import load_dotenv
 from datetime import datetime, timedelta, timezone
 import asyncio
 import json
+import time
 import traceback
 import aiohttp # For fetching era art when rendering show graphics
+import image_cache # Downloaded art by canonical URL, in memory and on disk
+import discord_links # Batched refresh of expired Discord attachment links
 import graphics # Template-based show boards (see graphics.py)
 import dashboard_api # In-process management API for the web dashboard
 import tunnel # Optional Cloudflare Tunnel that exposes the dashboard API
-from PIL import Image, ImageDraw, ImageFont
+import rng # Named, seedable random streams (see rng.py)
+import command_trace # Optional recording of slash commands for offline replay
+import command_metrics # Per-command latency and I/O breakdown (see /admin perf)
+import loop_monitor # Event-loop stall detection (see /admin lag)
+import sampling_profiler # On-demand profiling of the live process (see /admin profile)
+import limits # Daily use counters, purchased extras and cooldowns
+import audit_log # Append-only admin audit trail, kept out of data.json
+import history # Capped recent_events / reputation / member histories
+import game_clock # Cached day/week keys and Argentina-time rollover events
+import chart_history # Hourly chart ranks, kept as compact per-album series
+import leaderboards # Top-K boards updated as scores change
+import global_chart # Daily Global Top Songs positions, kept out of data.json
+import stat_effects # Batched, all-or-nothing stat changes for events
+import render_pool # Graphics rendered in worker processes
 import calendar
+import copy
 
 ARG_TZ = timezone(timedelta(hours=-3))
 
+# Day/week/month keys and rollover events in Argentina time (see game_clock.py).
+clock = game_clock.GameClock(ARG_TZ)
+
+# One random stream per subsystem. Set RNG_SEED to make a run reproducible;
+# unseeded, these behave exactly like the global random module.
+performance_rng = rng.stream("performance")   # calculate_dynamic_result
+streams_rng = rng.stream("streams")           # b-side splits of album streams
+demographics_rng = rng.stream("demographics")
+members_rng = rng.stream("members")           # member popularity, levels, training
+activities_rng = rng.stream("activities")     # work, posts, concerts, variety, ...
+releases_rng = rng.stream("releases")         # stock and preorders
+fandom_rng = rng.stream("fandom")             # boycotts and trucks
+events_rng = rng.stream("events")             # /random and scandal outcomes
+media_rng = rng.stream("media")               # articles
+payola_rng = rng.stream("payola")
+charts_rng = rng.stream("charts")
+
 # Load token from .env
 load_dotenv()
 TOKEN = os.getenv("DISCORD_TOKEN")
@@ -119,14 +152,16 @@ MUSIC_SHOWS = {
 
 # Initialize global dictionaries. These will be loaded from data.json on startup.
 group_popularity = {}
-company_funds = {}
+# Keeps the /companies board current on every write (see leaderboards.py)
+company_funds = leaderboards.ScoreTable(leaderboards.TopK())
 group_data = {}
 company_data = {}
 album_data = {}
 user_balances = {}
 user_companies = {}
-user_cooldowns = {}
-user_daily_limits = {}
+# Daily command counters, purchased extra uses and cooldowns (see limits.py).
+# Saved as user_daily_limits / user_cooldowns.
+usage_limits = limits.UsageLimits(lambda: get_today_str(), now=lambda: clock.time_source())
 user_stream_counts = {}
 records_24h = {"global": {"streams": 0, "sales": 0, "views": 0}, "personal": {}}
 weekly_streams = {}
@@ -264,7 +299,7 @@ ARTICLE_BAD_TEMPLATES = [
 
 def load_data():
     """Loads data from data.json into global dictionaries."""
-    global group_popularity, company_funds, group_data, album_data, user_balances, user_companies, user_cooldowns, user_daily_limits, user_stream_counts, records_24h, weekly_streams, preorder_data, article_history, random_events_log, events_channel_id, last_random_timestamp, admin_logs
+    global group_popularity, company_funds, group_data, album_data, user_balances, user_companies, user_stream_counts, records_24h, weekly_streams, preorder_data, article_history, random_events_log, events_channel_id, last_random_timestamp
 
     if os.path.exists(DATA_FILE):
         corrupt_error = None
@@ -285,13 +320,12 @@ def load_data():
                     data.setdefault('active_hate_train', False)
                     data.setdefault('hate_train_fanbase_boost', 0)
                     data.setdefault('members', [])
-                    data.setdefault('recent_events', [])
                     data.setdefault('is_subunit', False)
                     data.setdefault('parent_group', None)
                     data.setdefault('subunits', [])
                     data.setdefault('last_tax_month', None)
                     data.setdefault('reputation', 50)
-                    data.setdefault('reputation_history', [])
+                    history.bound_group(data)
                     group_data[group_name] = data
 
                 loaded_album_data = loaded_data.get('album_data', {})
@@ -322,10 +356,13 @@ def load_data():
                             data['promotion_end_date'] = None
                         # If it's already a datetime object, keep it.
 
-                    # Ensure charts_info structure is always present
-                    data.setdefault('charts_info', {})
-                    for chart_type_key in ["MelOn", "Genie", "Bugs", "FLO"]:
-                        data['charts_info'].setdefault(chart_type_key, {'rank': None, 'peak': None, 'prev_rank': None})
+                    # Ensure charts_info structure is always present; platforms
+                    # are added by the chart tick once the album charts there,
+                    # and older saves' never-charted placeholders are dropped.
+                    data['charts_info'] = {
+                        chart_key: chart_info for chart_key, chart_info in data.get('charts_info', {}).items()
+                        if any(value is not None for value in chart_info.values())
+                    }
                     
                     data.setdefault('songs', [])
                     data.setdefault('preorders', 0)
@@ -361,7 +398,8 @@ def load_data():
                 weekly_streams.update(loaded_data.get('weekly_streams', {}))
                 preorder_data.update(loaded_data.get('preorder_data', {}))
                 article_history.update(loaded_data.get('article_history', {}))
-                random_events_log.update(loaded_data.get('random_events_log', {}))
+                for group_name, events in loaded_data.get('random_events_log', {}).items():
+                    random_events_log[group_name] = history.BoundedHistory('random_events_log', events)
 
                 # Handle user_companies: convert single string to list if old format
                 # Ensure user_companies is properly loaded, defaulting to an empty dict if not found
@@ -373,14 +411,9 @@ def load_data():
                         user_companies[user_id] = companies # Assume it's already a list or empty
 
 
-                # Load cooldowns, converting ISO strings back to datetime objects
-                loaded_cooldowns = loaded_data.get('user_cooldowns', {})
-                for user_id, commands in loaded_cooldowns.items():
-                    user_cooldowns[user_id] = {
-                        cmd: datetime.fromisoformat(ts) for cmd, ts in commands.items()
-                    }
-
-                user_daily_limits.update(loaded_data.get('user_daily_limits', {}))
+                # Converts the old per-date counters and ISO cooldowns on first load
+                usage_limits.load(loaded_data.get('user_daily_limits', {}),
+                                  loaded_data.get('user_cooldowns', {}))
                 user_stream_counts.update(loaded_data.get('user_stream_counts', {}))
                 loaded_records = loaded_data.get('records_24h', {})
                 if 'global' in loaded_records:
@@ -391,7 +424,24 @@ def load_data():
 
                 events_channel_id = loaded_data.get('events_channel_id', None)
                 last_random_timestamp = loaded_data.get('last_random_timestamp', None)
-                admin_logs = loaded_data.get('admin_logs', [])
+                # Older saves kept the audit log in data.json; move it to its own file.
+                moved = admin_audit.import_legacy(loaded_data.get('admin_logs', []))
+                if moved:
+                    print(f"Moved {moved} audit log entries to {admin_audit.path}")
+                # Global chart positions used to be kept on each song; they have their own file now.
+                # Written out straight away: the next save_data() drops them from data.json.
+                imported = False
+                for album_name, album_entry in album_data.items():
+                    songs = album_entry.get('songs')
+                    if not isinstance(songs, dict):
+                        continue
+                    for song_name, song_data in songs.items():
+                        if isinstance(song_data, dict) and 'global_chart' in song_data:
+                            imported |= global_top_songs.import_legacy(
+                                chart_history.song_key(album_name, song_name), song_data.pop('global_chart'))
+                if imported:
+                    global_top_songs.save()
+                refresh_group_boards()
                 
                 print("Data loaded from data.json successfully!")
             except json.JSONDecodeError as e:
@@ -417,6 +467,8 @@ def load_data():
 
 def save_data():
     """Saves global dictionaries to data.json."""
+    global charts_unsaved
+    daily_limits_to_save, cooldowns_to_save = usage_limits.to_json()
     data_to_save = {
         'group_popularity': group_popularity,
         'company_funds': company_funds,
@@ -424,8 +476,8 @@ def save_data():
         'company_data': company_data,
         'album_data': album_data,
         'user_balances': user_balances,
-        'user_cooldowns': user_cooldowns,
-        'user_daily_limits': user_daily_limits,
+        'user_cooldowns': cooldowns_to_save,
+        'user_daily_limits': daily_limits_to_save,
         'user_companies': user_companies,
         'user_stream_counts': user_stream_counts,
         'records_24h': records_24h,
@@ -435,24 +487,26 @@ def save_data():
         'random_events_log': random_events_log,
         'events_channel_id': events_channel_id,
         'last_random_timestamp': last_random_timestamp,
-        'admin_logs': admin_logs
     }
     # Custom encoder for datetime objects
     class DateTimeEncoder(json.JSONEncoder):
         def default(self, obj):
             if isinstance(obj, datetime):
                 return obj.isoformat()
-            return json.JSONEncoder.default(self, obj)
+            return history.json_default(obj)
 
     # Write to a temp file and swap it into place, so an interrupted write can
     # never leave a truncated save. Opening data.json in 'w' truncates it to
     # zero bytes immediately, which is how a crash mid-write loses everything.
+    refresh_group_boards()  # See "Leaderboards"
     temp_file = DATA_FILE + ".tmp"
+    save_started = time.perf_counter()
     try:
         with open(temp_file, 'w', encoding='utf-8') as f:
             json.dump(data_to_save, f, indent=4, cls=DateTimeEncoder)
             f.flush()
             os.fsync(f.fileno())
+            bytes_written = f.tell()
         os.replace(temp_file, DATA_FILE) # Atomic on POSIX and Windows
     except Exception as e:
         print(f"ERROR: Failed to save data: {e}")
@@ -462,12 +516,34 @@ def save_data():
         except OSError:
             pass
         return
+    usage_limits.dirty = False
+    charts_unsaved = False
+    command_metrics.record_save(time.perf_counter() - save_started, bytes_written)
     print("Data saved to data.json.")
 
 # --- Bot Setup ---
+class InstrumentedTree(app_commands.CommandTree):
+    """Times every slash command end to end (see command_metrics.py).
+
+    Wraps the tree's dispatch rather than each callback, so checks, the command
+    itself and on_app_command_error are all inside the measurement.
+    """
+    async def _call(self, interaction: discord.Interaction):
+        if interaction.type != discord.InteractionType.application_command:
+            return await super()._call(interaction)
+        command_name, _ = command_trace.flatten_command_data(interaction.data or {})
+        token = command_metrics.metrics.start(command_name, interaction.user.id)
+        try:
+            await super()._call(interaction)
+        finally:
+            command_metrics.metrics.finish(token, failed=interaction.command_failed)
+
 class MyBot(commands.Bot):
     async def setup_hook(self):
         print("Setting up bot...")
+        # Watch the event loop from here on, so blocking in load_data, the
+        # dashboard or the tunnel bootstrap is caught too.
+        loop_monitor.start()
         load_data()
         await self.tree.sync()
         print(f'Bot {bot.user} has synced slash commands.')
@@ -493,7 +569,12 @@ class MyBot(commands.Bot):
         # is set. No-op otherwise, so nothing changes until you configure it.
         await tunnel.start()
 
-bot = MyBot(command_prefix="/", intents=intents)
+    async def close(self):
+        await close_http_session()
+        render_service.shutdown()
+        await super().close()
+
+bot = MyBot(command_prefix="/", intents=intents, tree_cls=InstrumentedTree)
 
 
 # --- ERROR HANDLING ---
@@ -542,39 +623,59 @@ def attach_task_error_handler(task, task_name: str):
     task.error(handler)
 
 # --- EVENTS ---
+# Opt-in: with TRACE_FILE set, every slash command is appended to a trace that
+# replay.py can run offline against a copy of data.json.
+command_recorder = command_trace.recorder_from_env()
+
+@bot.event
+async def on_interaction(interaction: discord.Interaction):
+    if command_recorder and interaction.type == discord.InteractionType.application_command:
+        command_recorder.record_interaction(interaction)
+
 @bot.event
 async def on_ready():
     print(f'Logged in as {bot.user}')
     scheduled_tasks = {
-        'monthly_tax_check': monthly_tax_check,
-        'weekly_streams_reset': weekly_streams_reset,
-        'birthday_check': birthday_check,
         'check_expired_boycotts': check_expired_boycotts,
-        'decay_company_pressure': decay_company_pressure,
+        'flush_usage_limits': flush_usage_limits,
     }
     for task_name, task in scheduled_tasks.items():
         attach_task_error_handler(task, task_name)
         if not task.is_running():
             task.start()
+
+    # Calendar jobs run on the clock's rollover events instead of polling.
+    # The 1st is the one boundary worth catching up on after a restart; the
+    # last_tax_month guard stops it taxing twice.
+    if clock.keys().now.day == 1:
+        await monthly_tax_check(clock.keys())
+    # The charts are only ever read between ticks, so make sure there is one.
+    if _chart_tick_due():
+        await chart_tick(clock.keys())
+    clock.start()
+
+    # Decode the show templates now rather than on the first /show, here and
+    # in the render workers.
+    await asyncio.to_thread(graphics.warm_templates)
+    render_service.start()
     
     # Backfill any missing pre-release entries to group profiles
     backfill_prereleases()
 
 def get_today_str():
     """Returns today's date in Argentina timezone (UTC-3) as YYYY-MM-DD"""
-    return datetime.now(ARG_TZ).strftime("%Y-%m-%d")
+    return clock.today()
 
 def get_current_week_key():
     """Returns the current week key in format YYYY-WW"""
-    now = datetime.now(ARG_TZ)
-    return f"{now.year}-{now.isocalendar()[1]:02d}"
+    return clock.week_key()
 
 def get_random_member(group_name: str) -> str:
     """Get a random member from a group, or return 'a member' if none exist."""
     group_entry = group_data.get(group_name, {})
     members = group_entry.get('members', [])
     if members:
-        member = random.choice(members)
+        member = members_rng.choice(members)
         # FIX: Handle both dict and string members
         if isinstance(member, dict):
             return member.get('name', 'a member')
@@ -586,15 +687,14 @@ def get_random_other_group(exclude_group: str) -> str | None:
         g for g, gd in group_data.items()
         if not gd.get('is_disbanded') and g != exclude_group
     ]
-    return random.choice(active_groups) if active_groups else None
+    return events_rng.choice(active_groups) if active_groups else None
 
-@tasks.loop(hours=1)
-async def monthly_tax_check():
-    """Check if it's the first day of a new month and deduct taxes from companies."""
-    now = datetime.now()
-    current_month_key = f"{now.year}-{now.month:02d}"
+@clock.on("month")
+async def monthly_tax_check(keys):
+    """Deduct monthly taxes from companies when a new month starts."""
+    current_month_key = keys.month
     
-    if now.day == 1:
+    if keys.now.day == 1:
         companies_taxed = []
         tax_amount = 30_000_000
         
@@ -694,8 +794,8 @@ def apply_album_streams(album_entry: dict, amount: int, current_week: str = None
         if other_songs:
             title_share = int(amount * 0.6)
             remaining = amount - title_share
-            weights = [(0.3 ** i) * random.uniform(0.5, 1.5) for i in range(len(other_songs))]
-            random.shuffle(weights)
+            weights = [(0.3 ** i) * streams_rng.uniform(0.5, 1.5) for i in range(len(other_songs))]
+            streams_rng.shuffle(weights)
             total_w = sum(weights) or 1
             for i, song_name in enumerate(other_songs):
                 add_song_streams(songs, song_name, int(remaining * (weights[i] / total_w)), current_week)
@@ -704,27 +804,23 @@ def apply_album_streams(album_entry: dict, amount: int, current_week: str = None
         add_song_streams(songs, title_track, title_share, current_week)
     else:
         song_list = list(songs.keys())
-        weights = [(0.3 ** i) * random.uniform(0.5, 1.5) for i in range(len(song_list))]
-        random.shuffle(weights)
+        weights = [(0.3 ** i) * streams_rng.uniform(0.5, 1.5) for i in range(len(song_list))]
+        streams_rng.shuffle(weights)
         total_w = sum(weights) or 1
         for i, song_name in enumerate(song_list):
             add_song_streams(songs, song_name, int(amount * (weights[i] / total_w)), current_week)
 
-@tasks.loop(hours=1)
-async def weekly_streams_reset():
+@clock.on("week")
+async def weekly_streams_reset(keys):
     """Open a new weekly bucket at the start of each week (Monday midnight).
 
-    Uses Argentina time throughout, matching get_current_week_key(), so the
-    rollover fires in the same timezone the week key is derived from.
+    Fired by the clock's week rollover, so it uses the same Argentina-time
+    week key get_current_week_key() returns.
 
     Previous weeks are kept: this opens the new week's counter rather than
     replacing the dict, which used to erase all stream history every Monday.
     """
-    now = datetime.now(ARG_TZ)
-    if now.weekday() != 0 or now.hour != 0:
-        return
-
-    current_week = get_current_week_key()
+    current_week = keys.week
     opened = 0
     for album_name, album_entry in album_data.items():
         weeks = album_entry.get('weekly_streams')
@@ -739,24 +835,33 @@ async def weekly_streams_reset():
         save_data()
         print(f"Weekly streams: opened week {current_week} for {opened} album(s), history preserved")
 
+@tasks.loop(minutes=5)
+async def flush_usage_limits():
+    """Persist daily-limit and cooldown changes no other save has picked up.
+
+    check_daily_limit and update_cooldown no longer save on every call; almost
+    every command saves shortly after anyway, and this catches the rest.
+    """
+    if usage_limits.dirty or charts_unsaved:
+        save_data()
+
 # Track which birthdays have been announced today to avoid duplicates
 announced_birthdays_today = set()
 
-@tasks.loop(hours=1)
-async def birthday_check():
+@clock.on("hour")
+async def birthday_check(keys):
     """Check for member birthdays and announce them."""
     global announced_birthdays_today
     
-    now = datetime.now(ARG_TZ)
-    today_str = now.strftime("%m-%d")
-    today_date = now.strftime("%Y-%m-%d")
+    today_str = keys.now.strftime("%m-%d")
+    today_date = keys.day
     
     # Reset announced set at midnight
-    if now.hour == 0:
+    if keys.hour == 0:
         announced_birthdays_today = set()
     
     # Only announce at specific hours (9 AM Argentina time)
-    if now.hour != 9:
+    if keys.hour != 9:
         return
     
     if not events_channel_id:
@@ -796,10 +901,6 @@ async def birthday_check():
                 except discord.errors.Forbidden:
                     pass
 
-@birthday_check.before_loop
-async def before_birthday_check():
-    await bot.wait_until_ready()
-
 # === UTILS ===
 def ordinal(n):
     if 10 <= n % 100 <= 20:
@@ -833,80 +934,59 @@ def is_user_group_owner(user_id: str, group_name: str):
 
 def check_cooldown(user_id: str, command_name: str, cooldown_minutes: int):
     """Checks if a user is on cooldown for a specific command."""
-    last_used = user_cooldowns.get(user_id, {}).get(command_name)
-    if last_used and (datetime.now() - last_used) < timedelta(minutes=cooldown_minutes):
-        remaining = timedelta(minutes=cooldown_minutes) - (datetime.now() - last_used)
-        return True, remaining
+    last_used = usage_limits.last_used(user_id, command_name)
+    if last_used is not None:
+        elapsed = timedelta(seconds=usage_limits.now() - last_used)
+        if elapsed < timedelta(minutes=cooldown_minutes):
+            return True, timedelta(minutes=cooldown_minutes) - elapsed
     return False, None
 
 def update_cooldown(user_id: str, command_name: str):
-    """Updates the cooldown for a user and command."""
-    if user_id not in user_cooldowns:
-        user_cooldowns[user_id] = {}
-    user_cooldowns[user_id][command_name] = datetime.now()
-    save_data()
+    """Updates the cooldown for a user and command. Saved with the next save."""
+    usage_limits.touch(user_id, command_name)
 
 def get_extra_uses(user_id: str, command_name: str) -> int:
     """Get the number of extra uses a user has purchased for a command."""
-    user_data = user_daily_limits.setdefault(user_id, {})
-    extras_key = f"extra_{command_name}"
-    return user_data.get(extras_key, 0)
+    return usage_limits.extra_uses(user_id, command_name)
 
 def add_extra_use(user_id: str, command_name: str):
     """Add one extra use for a command."""
-    user_data = user_daily_limits.setdefault(user_id, {})
-    extras_key = f"extra_{command_name}"
-    user_data[extras_key] = user_data.get(extras_key, 0) + 1
-    save_data()
+    usage_limits.add_extra(user_id, command_name)
+    save_data() # A purchase: persist right away
 
 def get_total_extras_purchased(user_id: str) -> int:
     """Get total extra uses purchased across all commands (for pricing tiers)."""
-    user_data = user_daily_limits.get(user_id, {})
-    total = 0
-    for key in user_data:
-        if key.startswith('extra_'):
-            total += user_data[key]
-    return total
+    return usage_limits.total_extras(user_id)
 
 def check_daily_limit(user_id: str, command_name: str, max_uses: int):
     """Checks and updates daily command usage, including purchased extra uses.
-    Resets at 00:00 Argentina time (UTC-3)."""
-    today = datetime.now(ARG_TZ).strftime("%Y-%m-%d")
-    user_data = user_daily_limits.setdefault(user_id, {})
-    command_data = user_data.setdefault(command_name, {})
-    
-    extra_uses = get_extra_uses(user_id, command_name)
-    total_max = max_uses + extra_uses
-
-    current_uses = command_data.get(today, 0)
+    Resets at 00:00 Argentina time (UTC-3). Saved with the next save."""
+    total_max = max_uses + get_extra_uses(user_id, command_name)
+    current_uses = usage_limits.uses_today(user_id, command_name)
 
     if current_uses >= total_max:
         return True, total_max - current_uses # True for limited, 0 remaining
 
-    command_data[today] = current_uses + 1
-    save_data()
+    usage_limits.record_use(user_id, command_name)
     return False, total_max - (current_uses + 1) # False for not limited, remaining uses
 
 
 ADMIN_USER_ID = 979346606233104415
 
-admin_logs = []
+# Admin audit trail (see audit_log.py). AUDIT_LOG_FILE moves it elsewhere.
+admin_audit = audit_log.AuditLog(os.getenv("AUDIT_LOG_FILE", "admin_audit.jsonl"))
+admin_audit.load_recent()
 
 def add_audit_log(admin_id: str, action: str, target: str, before, after):
-    """Add an entry to the admin audit log."""
-    global admin_logs
-    entry = {
+    """Add an entry to the admin audit log. Appends one line; data.json is untouched."""
+    admin_audit.append({
         "admin_id": admin_id,
         "action": action,
         "target": target,
         "before": before,
         "after": after,
         "timestamp": datetime.now().isoformat()
-    }
-    admin_logs.append(entry)
-    if len(admin_logs) > 500:
-        admin_logs = admin_logs[-500:]
-    save_data()
+    })
 
 def ensure_member_schema(member_data: dict, base_pop: int = None) -> dict:
     """Ensure member has all required fields with proper schema.
@@ -935,7 +1015,7 @@ def ensure_member_schema(member_data: dict, base_pop: int = None) -> dict:
     member_data.setdefault('fan_multipliers', {'teen': 1.0, 'adult': 1.0, 'female': 1.0, 'male': 1.0})
     member_data.setdefault('image_url', None)
     member_data.setdefault('bio', '')
-    member_data.setdefault('history', [])
+    history.history_of(member_data, 'history')
     member_data.setdefault('group', None)
     return member_data
 
@@ -988,7 +1068,7 @@ def redistribute_popularity(group_name: str, target_total: int = None):
     base_share = total_pop // num_members
     
     # Generate random weights for variance (0.7 to 1.3)
-    weights = [random.uniform(0.7, 1.3) for _ in range(num_members)]
+    weights = [members_rng.uniform(0.7, 1.3) for _ in range(num_members)]
     weight_sum = sum(weights)
     
     # Normalize weights and distribute popularity
@@ -1001,7 +1081,7 @@ def redistribute_popularity(group_name: str, target_total: int = None):
     diff = total_pop - sum(member_pops)
     if diff != 0:
         # Add/remove the difference from a random member
-        idx = random.randint(0, num_members - 1)
+        idx = members_rng.randint(0, num_members - 1)
         member_pops[idx] = max(10, member_pops[idx] + diff)
     
     # Apply to members
@@ -1033,7 +1113,7 @@ def calculate_dynamic_result(base_value: int, tier_floor: int, tier_cap: int,
     Returns dict with: base, variance_mult, result, went_viral, viral_bonus, final
     """
     # Apply random variance (never identical outputs)
-    variance_mult = random.uniform(variance_range[0], variance_range[1])
+    variance_mult = performance_rng.uniform(variance_range[0], variance_range[1])
     varied_result = int(base_value * variance_mult)
     
     # Clamp to tier bounds
@@ -1042,9 +1122,9 @@ def calculate_dynamic_result(base_value: int, tier_floor: int, tier_cap: int,
     # Check for viral (rare, chance-based)
     went_viral = False
     viral_bonus = 0
-    if viral_chance > 0 and random.random() < viral_chance:
+    if viral_chance > 0 and performance_rng.random() < viral_chance:
         went_viral = True
-        viral_mult = random.uniform(viral_mult_range[0], viral_mult_range[1])
+        viral_mult = performance_rng.uniform(viral_mult_range[0], viral_mult_range[1])
         viral_bonus = int(clamped_result * (viral_mult - 1))
     
     final = min(tier_cap * 2, clamped_result + viral_bonus)  # Allow viral to exceed cap slightly
@@ -1142,7 +1222,7 @@ def shift_demographics(group_entry: dict, activity_type: str):
         return
     
     # Define shift amounts (small: 0.01-0.03)
-    shift_amount = random.uniform(0.01, 0.03)
+    shift_amount = demographics_rng.uniform(0.01, 0.03)
     
     activity_effects = {
         # Post types (all capped at 1.0x to stay within 0.01-0.03)
@@ -1222,7 +1302,7 @@ def shift_demographics_for_members(members_list: list, activity_type: str):
     if not members_list:
         return
     
-    shift_amount = random.uniform(0.01, 0.03)
+    shift_amount = demographics_rng.uniform(0.01, 0.03)
     
     activity_effects = {
         'selfie': {'teen': shift_amount, 'female': shift_amount},
@@ -1278,15 +1358,15 @@ def apply_level_up_bonuses(group_name: str, member: dict, old_level: int, new_le
     group_entry = group_data.get(group_name, {})
     
     # Popularity bonus: 5-15 per level gained (distributed to group)
-    pop_bonus = levels_gained * random.randint(5, 15)
+    pop_bonus = levels_gained * members_rng.randint(5, 15)
     member['popularity'] = member.get('popularity', 50) + pop_bonus
     
     # GP bonus for group: 1-3 per level
-    gp_bonus = levels_gained * random.randint(1, 3)
+    gp_bonus = levels_gained * members_rng.randint(1, 3)
     group_entry['gp'] = group_entry.get('gp', 30) + gp_bonus
     
     # Fanbase bonus: 1-2 per level
-    fanbase_bonus = levels_gained * random.randint(1, 2)
+    fanbase_bonus = levels_gained * members_rng.randint(1, 2)
     group_entry['fanbase'] = group_entry.get('fanbase', 50) + fanbase_bonus
     
     # Recalculate group popularity from member sum
@@ -1695,7 +1775,7 @@ async def work(interaction: discord.Interaction):
         return
     
     current_bal = user_balances.get(user_id, 0)
-    pay = random.randint(10000, 50000)
+    pay = activities_rng.randint(10000, 50000)
     new_bal = current_bal + pay
     user_balances[user_id] = new_bal
     save_data() 
@@ -2049,15 +2129,15 @@ async def newpost(interaction: discord.Interaction, group_name: str, post_type:
     group_entry = group_data[group_name_upper]
     base_pop = get_group_derived_popularity(group_entry)
 
-    variance = random.uniform(0.6, 1.4)
+    variance = activities_rng.uniform(0.6, 1.4)
     likes = max(100, int(base_pop * 30 * variance))
     comments = max(10, int(base_pop * 3 * variance))
 
-    popularity_gain = random.randint(1, 5)
+    popularity_gain = activities_rng.randint(1, 5)
     went_viral = False
 
-    if random.random() < 0.12:
-        viral_popularity_boost = random.randint(15, 30)
+    if activities_rng.random() < 0.12:
+        viral_popularity_boost = activities_rng.randint(15, 30)
         popularity_gain += viral_popularity_boost
         went_viral = True
 
@@ -2226,8 +2306,8 @@ async def streams(interaction: discord.Interaction, album_name: str):
             if other_songs:
                 title_share = int(streams_to_add * 0.6)
                 remaining = streams_to_add - title_share
-                base_weights = [(0.3 ** i) * random.uniform(0.5, 1.5) for i in range(len(other_songs))]
-                random.shuffle(base_weights)
+                base_weights = [(0.3 ** i) * streams_rng.uniform(0.5, 1.5) for i in range(len(other_songs))]
+                streams_rng.shuffle(base_weights)
                 total_weight = sum(base_weights)
                 bside_shares = [int(remaining * (w / total_weight)) for w in base_weights]
                 
@@ -2239,8 +2319,8 @@ async def streams(interaction: discord.Interaction, album_name: str):
             add_song_streams(songs, title_track, title_share, current_week)
         else:
             song_list = list(songs.keys())
-            base_weights = [(0.3 ** i) * random.uniform(0.5, 1.5) for i in range(len(song_list))]
-            random.shuffle(base_weights)
+            base_weights = [(0.3 ** i) * streams_rng.uniform(0.5, 1.5) for i in range(len(song_list))]
+            streams_rng.shuffle(base_weights)
             total_weight = sum(base_weights)
             shares = [int(streams_to_add * (w / total_weight)) for w in base_weights]
             
@@ -2309,17 +2389,17 @@ async def perform(interaction: discord.Interaction, group_name: str):
     
     # Dynamic popularity gain with variance (15-60 range based on stats)
     base_pop_gain = 20 + int((fanbase + gp) / 20)
-    variance = random.uniform(0.5, 1.5)
+    variance = activities_rng.uniform(0.5, 1.5)
     popularity_gain = max(10, int(base_pop_gain * variance))
     
     # Chance for exceptional performance (5% chance for 2-3x boost)
-    went_exceptional = random.random() < 0.05
+    went_exceptional = activities_rng.random() < 0.05
     if went_exceptional:
-        popularity_gain = int(popularity_gain * random.uniform(2.0, 3.0))
+        popularity_gain = int(popularity_gain * activities_rng.uniform(2.0, 3.0))
     
     # Small GP and fanbase gains with variance
-    gp_gain = random.randint(0, 3) if random.random() < 0.4 else 0
-    fanbase_gain = random.randint(0, 2) if random.random() < 0.3 else 0
+    gp_gain = activities_rng.randint(0, 3) if activities_rng.random() < 0.4 else 0
+    fanbase_gain = activities_rng.randint(0, 2) if activities_rng.random() < 0.3 else 0
     
     group_entry['gp'] = group_entry.get('gp', 30) + gp_gain
     group_entry['fanbase'] = group_entry.get('fanbase', 50) + fanbase_gain
@@ -2393,16 +2473,12 @@ async def addmember(interaction: discord.Interaction, group_name: str, member_na
         members.append(member_name_clean)
         added.append(member_name_clean)
         
-        group_entry.setdefault('recent_events', [])
-        group_entry['recent_events'].append({
+        history.record(group_entry, 'recent_events', {
             'type': 'member_added',
             'member': member_name_clean,
             'date': datetime.now().isoformat()
         })
     
-    if len(group_entry.get('recent_events', [])) > 20:
-        group_entry['recent_events'] = group_entry['recent_events'][-20:]
-    
     group_entry['members'] = members
     save_data()
     
@@ -2463,14 +2539,11 @@ async def removemember(interaction: discord.Interaction, group_name: str, member
     members.pop(matching_index)
     group_entry['members'] = members
     
-    group_entry.setdefault('recent_events', [])
-    group_entry['recent_events'].append({
+    history.record(group_entry, 'recent_events', {
         'type': 'member_removed',
         'member': matching_member,
         'date': datetime.now().isoformat()
     })
-    if len(group_entry['recent_events']) > 20:
-        group_entry['recent_events'] = group_entry['recent_events'][-20:]
     
     save_data()
     
@@ -2915,13 +2988,13 @@ class SponsorshipDealView(ui.View):
             color=discord.Color.light_grey()
         )
 
-        if random.random() < success_chance:
+        if activities_rng.random() < success_chance:
             outcome_embed.color = discord.Color.green()
             outcome_embed.title = f"🎉 Sponsorship Deal Secured with {self.chosen_brand_name.replace('_', ' ').title()}!"
             outcome_embed.description = f"{self.group_name} has successfully landed the deal!"
 
             sponsorship_amount = deal_details["base_amount"]
-            popularity_gain = random.randint(*deal_details["popularity_gain"])
+            popularity_gain = activities_rng.randint(*deal_details["popularity_gain"])
             distribute_stat_gain_to_members(self.group_name, 'popularity', popularity_gain)
 
             demo_category = deal_details.get("demo_category", "luxury_fashion")
@@ -3021,7 +3094,7 @@ async def sponsorship(interaction: discord.Interaction, group_name: str, investm
 
     # Select a random subset of eligible deals, up to a maximum of 5
     num_to_display = min(5, len(eligible_deals_pool))
-    random_deals_to_display = random.sample(eligible_deals_pool, num_to_display)
+    random_deals_to_display = activities_rng.sample(eligible_deals_pool, num_to_display)
 
     eligible_deals_str = ""
     # Sort selected random deals by min_popularity for better display order
@@ -3104,7 +3177,7 @@ async def concert(interaction: discord.Interaction, group_name: str, city: str):
     base_fill_rate = min(1.0, 0.4 + log_pop * 0.15 + log_fanbase * 0.1)
     
     # Wide variance for tickets (0.5-1.3x) - sometimes great turnout, sometimes poor
-    fill_variance = random.uniform(0.5, 1.3)
+    fill_variance = activities_rng.uniform(0.5, 1.3)
     tickets_sold = max(500, int(venue_capacity * base_fill_rate * fill_variance))
 
     base_ticket_price = 50
@@ -3112,12 +3185,12 @@ async def concert(interaction: discord.Interaction, group_name: str, city: str):
     ticket_revenue = tickets_sold * ticket_price
     
     # Merch with variance
-    merch_mult = random.uniform(2, 10)
+    merch_mult = activities_rng.uniform(2, 10)
     merch_sales = int(tickets_sold * merch_mult)
     total_revenue = ticket_revenue + merch_sales
     
     # Apply variance to total revenue
-    revenue_variance = random.uniform(0.7, 1.3)
+    revenue_variance = activities_rng.uniform(0.7, 1.3)
     total_revenue = int(total_revenue * revenue_variance)
     
     CONCERT_REVENUE_CAP = 15_000_000
@@ -3125,7 +3198,7 @@ async def concert(interaction: discord.Interaction, group_name: str, city: str):
     total_revenue = min(total_revenue, CONCERT_REVENUE_CAP)
     
     # Rare sold-out bonus (8% chance)
-    went_soldout = random.random() < 0.08
+    went_soldout = activities_rng.random() < 0.08
     if went_soldout:
         total_revenue = int(total_revenue * 1.5)
         total_revenue = min(total_revenue, CONCERT_REVENUE_CAP)
@@ -3139,13 +3212,13 @@ async def concert(interaction: discord.Interaction, group_name: str, city: str):
 
     # Dynamic popularity boost with variance
     base_pop_boost = max(5, tickets_sold // 8000)
-    pop_variance = random.uniform(0.5, 1.5)
+    pop_variance = activities_rng.uniform(0.5, 1.5)
     popularity_boost = max(3, int(base_pop_boost * pop_variance))
     if went_soldout:
         popularity_boost = int(popularity_boost * 1.5)
     
-    fanbase_gain = random.randint(1, 5) if random.random() < 0.6 else 0
-    gp_gain = random.randint(1, 3) if random.random() < 0.4 else 0
+    fanbase_gain = activities_rng.randint(1, 5) if activities_rng.random() < 0.6 else 0
+    gp_gain = activities_rng.randint(1, 3) if activities_rng.random() < 0.4 else 0
     
     distribute_stat_gain_to_members(group_name_upper, 'popularity', popularity_boost)
     group_entry['fanbase'] = group_entry.get('fanbase', 50) + fanbase_gain
@@ -3281,7 +3354,7 @@ async def worldtour(interaction: discord.Interaction, group_name: str, countries
         gp_factor = gp / 100  # GP matters now
         
         # Attendance harder to achieve (0.2x to 1.0x base, reduced from 0.3-1.5)
-        attendance_mult = random.uniform(0.2, 1.0) * popularity_factor * (0.3 + fanbase_factor * 0.4 + gp_factor * 0.3)
+        attendance_mult = activities_rng.uniform(0.2, 1.0) * popularity_factor * (0.3 + fanbase_factor * 0.4 + gp_factor * 0.3)
         attendance = int(base_attendance * attendance_mult)
         
         # Cap at 100% capacity - no overselling
@@ -3321,9 +3394,9 @@ async def worldtour(interaction: discord.Interaction, group_name: str, countries
     net_profit = total_revenue - total_cost
     
     # Stat gains
-    pop_gain = random.randint(20, 50) * len(valid_stops)
-    fanbase_gain = random.randint(5, 15)
-    gp_gain = random.randint(3, 10)
+    pop_gain = activities_rng.randint(20, 50) * len(valid_stops)
+    fanbase_gain = activities_rng.randint(5, 15)
+    gp_gain = activities_rng.randint(3, 10)
     
     # Reduce gains if tour had flops
     if flop_stops:
@@ -3479,8 +3552,8 @@ def get_reputation_level(group_entry: dict) -> dict:
     }
 
 
-def apply_reputation_change(group_name: str, change: int, reason: str = None):
-    """Apply reputation change with reason tracking."""
+def apply_reputation_change(group_name: str, change: int, reason: str = None, save: bool = True):
+    """Apply reputation change with reason tracking. save=False leaves saving to the caller."""
     if group_name not in group_data:
         return
     
@@ -3490,9 +3563,8 @@ def apply_reputation_change(group_name: str, change: int, reason: str = None):
     
     group_entry['reputation'] = new_rep
     
-    # Track history
-    group_entry.setdefault('reputation_history', [])
-    group_entry['reputation_history'].append({
+    # Track history (capped, see history.py)
+    history.record(group_entry, 'reputation_history', {
         'change': change,
         'reason': reason or 'Unknown',
         'timestamp': datetime.now().isoformat(),
@@ -3500,15 +3572,127 @@ def apply_reputation_change(group_name: str, change: int, reason: str = None):
         'new': new_rep
     })
     
-    # Keep last 20 events
-    if len(group_entry['reputation_history']) > 20:
-        group_entry['reputation_history'] = group_entry['reputation_history'][-20:]
-    
-    save_data()
+    if save:
+        save_data()
     
     return old_rep, new_rep
 
 
+# --- Stat effect pipeline (see stat_effects.py) ---
+# Events build their whole outcome as a list of effects and apply it with
+# group_effects.run(): all or nothing, derived totals recomputed and data.json
+# saved once at the end.
+group_effects = stat_effects.Pipeline()
+
+
+@group_effects.validator
+def _check_group_effect(effect):
+    if effect.group not in group_data:
+        raise stat_effects.EffectError(f"Unknown group {effect.group!r}")
+    if isinstance(effect, stat_effects.SongStreams) and effect.album not in album_data:
+        raise stat_effects.EffectError(f"Unknown album {effect.album!r}")
+
+
+def _snapshot_effect_targets(batch):
+    # One copy per group or album, however many effects touch it.
+    groups = {g: copy.deepcopy(group_data[g]) for g in dict.fromkeys(e.group for e in batch)}
+    albums = {
+        a: copy.deepcopy(album_data[a])
+        for a in dict.fromkeys(e.album for e in batch if isinstance(e, stat_effects.SongStreams))
+    }
+    companies = {}
+    for group_name in groups:
+        company = group_data[group_name].get('company')
+        if company in company_funds:
+            companies[company] = company_funds[company]
+    return groups, albums, companies
+
+
+def _restore_effect_targets(snapshot):
+    # The group and album dicts themselves are refilled in place, so references
+    # to them stay valid; anything nested (members, songs, histories) is
+    # replaced by the snapshot's copy.
+    groups, albums, companies = snapshot
+    for target, saved in ((group_data, groups), (album_data, albums)):
+        for name, entry in saved.items():
+            target[name].clear()
+            target[name].update(entry)
+    for company, funds in companies.items():
+        company_funds[company] = funds
+
+
+group_effects.snapshot = _snapshot_effect_targets
+group_effects.restore = _restore_effect_targets
+
+
+@group_effects.applies(stat_effects.Stat)
+def _apply_stat_effect(effect):
+    group_entry = group_data[effect.group]
+    before = group_entry.get(effect.field, effect.default)
+    after = before + effect.delta
+    if effect.low is not None:
+        after = max(effect.low, after)
+    if effect.high is not None:
+        after = min(effect.high, after)
+    group_entry[effect.field] = after
+    return after - before
+
+
+@group_effects.applies(stat_effects.SetField)
+def _apply_set_field_effect(effect):
+    group_data[effect.group][effect.field] = effect.value
+    return effect.value
+
+
+@group_effects.applies(stat_effects.Reputation)
+def _apply_reputation_effect(effect):
+    return apply_reputation_change(effect.group, effect.delta, effect.reason, save=False)
+
+
+@group_effects.applies(stat_effects.MemberPopularity)
+def _apply_member_popularity_effect(effect):
+    distribute_stat_gain_to_members(effect.group, 'popularity', effect.delta, recalc=False)
+    return effect.delta
+
+
+@group_effects.applies(stat_effects.CompanyFunds)
+def _apply_company_funds_effect(effect):
+    company_name = group_data[effect.group].get('company')
+    if not company_name or company_name not in company_funds:
+        return 0
+    before = company_funds[company_name]
+    company_funds[company_name] = max(0, before + effect.delta)
+    return company_funds[company_name] - before
+
+
+@group_effects.applies(stat_effects.SongStreams)
+def _apply_song_streams_effect(effect):
+    album_entry = album_data[effect.album]
+    current_week = get_current_week_key()
+    songs = album_entry.get('songs', {})
+    if effect.song in songs:
+        add_song_streams(songs, effect.song, effect.amount, current_week)
+    album_entry['streams'] = album_entry.get('streams', 0) + effect.amount
+    album_entry.setdefault('weekly_streams', {})
+    album_entry['weekly_streams'][current_week] = album_entry['weekly_streams'].get(current_week, 0) + effect.amount
+    return effect.amount
+
+
+# Fields that can change who holds the Nation's Group title.
+_NATIONS_GROUP_FIELDS = ('gp', 'active_hate_train', 'is_disbanded')
+
+
+@group_effects.finisher
+def _finish_group_effects(batch, save):
+    for group_name in dict.fromkeys(effect.group for effect in batch):
+        if any(isinstance(effect, stat_effects.MemberPopularity) for effect in batch if effect.group == group_name):
+            recalc_group_from_members(group_name)
+    if any(getattr(effect, 'field', None) in _NATIONS_GROUP_FIELDS for effect in batch):
+        update_nations_group()
+    if save:
+        save_data()
+
+
 @bot.tree.command(description="View your group's reputation and fandom power")
 @app_commands.autocomplete(group_name=group_autocomplete)
 async def reputation(interaction: discord.Interaction, group_name: str):
@@ -3752,23 +3936,23 @@ async def check_expired_boycotts():
             ends_at = datetime.fromisoformat(boycott['ends_at'])
             if now >= ends_at:
                 boycott['ended'] = True
-                await end_boycott_effects(group_name, boycott)
+                await end_boycott_effects(group_name, boycott, save=False)
     
     save_data()
 
 
-@tasks.loop(hours=24)
-async def decay_company_pressure():
-    """Slowly reduce company pressure over time."""
+@clock.on("day")
+async def decay_company_pressure(keys):
+    """Slowly reduce company pressure, once per game day."""
     for group_name, group_entry in group_data.items():
         pressure = group_entry.get('company_pressure', 0)
         if pressure > 0:
-            decay = random.randint(5, 10)
+            decay = fandom_rng.randint(5, 10)
             group_entry['company_pressure'] = max(0, pressure - decay)
     save_data()
 
 
-async def end_boycott_effects(group_name: str, boycott: dict):
+async def end_boycott_effects(group_name: str, boycott: dict, save: bool = True):
     """Apply final effects when boycott ends and notify owner."""
     if group_name not in group_data:
         return
@@ -3776,28 +3960,31 @@ async def end_boycott_effects(group_name: str, boycott: dict):
     group_entry = group_data[group_name]
     effects = boycott['effects']
 
-    # Apply lasting effects
+    # Roll the lasting effects, then apply them together
+    outcome = []
     if 'fanbase_loyalty' in effects:
-        change = random.randint(*effects['fanbase_loyalty'])
-        group_entry['fanbase'] = max(0, min(100, group_entry.get('fanbase', 50) + change))
+        change = fandom_rng.randint(*effects['fanbase_loyalty'])
+        outcome.append(stat_effects.Stat(group_name, 'fanbase', change, high=100, default=50))
 
     if 'gp' in effects:
-        change = random.randint(*effects['gp'])
-        group_entry['gp'] = max(0, min(100, group_entry.get('gp', 30) + change))
+        change = fandom_rng.randint(*effects['gp'])
+        outcome.append(stat_effects.Stat(group_name, 'gp', change, high=100, default=30))
 
     if 'reputation' in effects:
-        change = random.randint(*effects['reputation'])
-        apply_reputation_change(group_name, change, f"Boycott ended: {boycott['name']}")
+        change = fandom_rng.randint(*effects['reputation'])
+        outcome.append(stat_effects.Reputation(group_name, change, f"Boycott ended: {boycott['name']}"))
 
     if 'group_popularity' in effects:
-        change = random.randint(*effects['group_popularity'])
-        distribute_stat_gain_to_members(group_name, 'popularity', change)
+        change = fandom_rng.randint(*effects['group_popularity'])
+        outcome.append(stat_effects.MemberPopularity(group_name, change))
 
     if 'company_funds' in effects:
         company_name = group_entry.get('company')
         if company_name and company_name in company_funds:
-            loss = random.randint(*effects['company_funds'])
-            company_funds[company_name] = max(0, company_funds[company_name] + loss)
+            loss = fandom_rng.randint(*effects['company_funds'])
+            outcome.append(stat_effects.CompanyFunds(group_name, loss))
+
+    group_effects.run(outcome, save=save)
 
     # Notify company owner
     owner_id = get_group_owner_user_id(group_name)
@@ -3850,10 +4037,7 @@ async def boycott(interaction: discord.Interaction, group_name: str, boycott_typ
     group_name_upper = group_name.upper()
     
     # Daily limit check (1 per day per user)
-    today = get_today_str()
-    user_daily_limits.setdefault(user_id, {})
-    boycott_uses = user_daily_limits[user_id].get('boycott', {})
-    if boycott_uses.get('date') == today and boycott_uses.get('count', 0) >= 1:
+    if usage_limits.uses_today(user_id, 'boycott') >= 1:
         await interaction.response.send_message("❌ You can only start 1 boycott per day!", ephemeral=True)
         return
 
@@ -3928,10 +4112,7 @@ async def boycott(interaction: discord.Interaction, group_name: str, boycott_typ
         embed.set_footer(text=f"Company owner: <@{owner_id}>")
 
     # Track daily usage
-    if boycott_uses.get('date') != today:
-        user_daily_limits[user_id]['boycott'] = {'date': today, 'count': 1}
-    else:
-        user_daily_limits[user_id]['boycott']['count'] = boycott_uses.get('count', 0) + 1
+    usage_limits.record_use(user_id, 'boycott')
     save_data()
     
     await interaction.response.send_message(embed=embed)
@@ -4063,10 +4244,7 @@ async def truck(interaction: discord.Interaction, target: str, truck_type: str,
     target_upper = target.upper()
     
     # Daily limit check (1 per day per user)
-    today = get_today_str()
-    user_daily_limits.setdefault(user_id, {})
-    truck_uses = user_daily_limits[user_id].get('truck', {})
-    if truck_uses.get('date') == today and truck_uses.get('count', 0) >= 1:
+    if usage_limits.uses_today(user_id, 'truck') >= 1:
         await interaction.response.send_message("❌ You can only send 1 truck per day!", ephemeral=True)
         return
 
@@ -4099,7 +4277,7 @@ async def truck(interaction: discord.Interaction, target: str, truck_type: str,
     if custom_message:
         message = custom_message[:100]
     else:
-        message = random.choice(truck_info['messages'])
+        message = fandom_rng.choice(truck_info['messages'])
         if is_group:
             message = message.replace('[GROUP]', target_upper)
         else:
@@ -4113,42 +4291,42 @@ async def truck(interaction: discord.Interaction, target: str, truck_type: str,
         changes = {}
 
         if 'fanbase' in effects:
-            change = random.randint(*effects['fanbase'])
+            change = fandom_rng.randint(*effects['fanbase'])
             old_fanbase = group_entry.get('fanbase', 50)
             group_entry['fanbase'] = max(0, min(100, old_fanbase + change))
             changes['fanbase'] = change
 
         if 'reputation' in effects:
-            change = random.randint(*effects['reputation'])
+            change = fandom_rng.randint(*effects['reputation'])
             apply_reputation_change(target_upper, change, f"Truck protest: {truck_info['name']}")
             changes['reputation'] = change
 
         if 'gp' in effects:
-            change = random.randint(*effects['gp'])
+            change = fandom_rng.randint(*effects['gp'])
             group_entry['gp'] = max(0, min(100, group_entry.get('gp', 30) + change))
             changes['gp'] = change
 
         if 'group_popularity' in effects:
-            change = random.randint(*effects['group_popularity'])
+            change = fandom_rng.randint(*effects['group_popularity'])
             distribute_stat_gain_to_members(target_upper, 'popularity', change)
             changes['popularity'] = change
 
         if 'fanbase_rally' in effects:
             # Fans rally in defense
-            rally = random.randint(*effects['fanbase_rally'])
+            rally = fandom_rng.randint(*effects['fanbase_rally'])
             group_entry['fanbase'] = min(100, group_entry.get('fanbase', 50) + rally)
             changes['fanbase_rally'] = rally
 
         if 'company_funds' in effects:
             company_name = group_entry.get('company')
             if company_name and company_name in company_funds:
-                loss = random.randint(*effects['company_funds'])
+                loss = fandom_rng.randint(*effects['company_funds'])
                 company_funds[company_name] = max(0, company_funds[company_name] + loss)
 
         # Track pressure
         if 'company_pressure' in effects:
             group_entry.setdefault('company_pressure', 0)
-            pressure = random.randint(*effects['company_pressure'])
+            pressure = fandom_rng.randint(*effects['company_pressure'])
             group_entry['company_pressure'] += pressure
             changes['pressure'] = pressure
 
@@ -4158,7 +4336,7 @@ async def truck(interaction: discord.Interaction, target: str, truck_type: str,
         changes = {'affected_groups': len(affected_groups)}
 
         if 'company_funds' in truck_info['effects']:
-            loss = random.randint(*truck_info['effects']['company_funds'])
+            loss = fandom_rng.randint(*truck_info['effects']['company_funds'])
             company_funds[target_upper] = max(0, company_funds.get(target_upper, 0) + loss)
             changes['funds_lost'] = abs(loss)
 
@@ -4208,10 +4386,7 @@ async def truck(interaction: discord.Interaction, target: str, truck_type: str,
         embed.set_footer(text="The controversy continues...")
 
     # Track daily usage
-    if truck_uses.get('date') != today:
-        user_daily_limits[user_id]['truck'] = {'date': today, 'count': 1}
-    else:
-        user_daily_limits[user_id]['truck']['count'] = truck_uses.get('count', 0) + 1
+    usage_limits.record_use(user_id, 'truck')
     save_data()
 
     await interaction.response.send_message(embed=embed)
@@ -4477,7 +4652,7 @@ async def debut(
         'fanbase': base_fanbase,
         'gp': base_gp,
         'payola_suspicion': 0,
-        'debut_date': datetime.now(ARG_TZ).strftime("%Y-%m-%d"),
+        'debut_date': get_today_str(),
         'is_disbanded': False,
         'profile_picture': None,
         'banner_url': None,
@@ -4487,12 +4662,12 @@ async def debut(
     group_data[group_name_upper] = new_group_data
     group_popularity[group_name_upper] = new_group_data['popularity']
 
-    initial_stock = random.randint(500000, 1500000) if album_format == "physical" else 0
+    initial_stock = releases_rng.randint(500000, 1500000) if album_format == "physical" else 0
     
     new_album_data = {
         'group': group_name_upper,
         'wins': 0,
-        'release_date': datetime.now(ARG_TZ).strftime("%Y-%m-%d"),
+        'release_date': get_today_str(),
         'streams': 0, 
         'sales': 0,
         'views': 0,
@@ -4503,12 +4678,7 @@ async def debut(
         'album_type': album_type,
         'album_format': album_format,
         'stock': initial_stock,
-        'charts_info': {
-            "MelOn": {'rank': None, 'peak': None, 'prev_rank': None},
-            "Genie": {'rank': None, 'peak': None, 'prev_rank': None},
-            "Bugs": {'rank': None, 'peak': None, 'prev_rank': None},
-            "FLO": {'rank': None, 'peak': None, 'prev_rank': None}
-        }
+        'charts_info': {}  # Filled in by the chart tick once the album charts
     }
     album_data[album_name] = new_album_data
     save_data()
@@ -4599,36 +4769,36 @@ async def comeback(
     if album_type == "full":
         singles_minis_streak = sum(1 for t in recent_types if t in ['single', 'mini'])
         if singles_minis_streak >= 2:
-            fanbase_change = random.randint(8, 15)
+            fanbase_change = releases_rng.randint(8, 15)
             fanbase_note = "Fans excited for full album!"
         else:
-            fanbase_change = random.randint(3, 8)
+            fanbase_change = releases_rng.randint(3, 8)
             fanbase_note = "Full album boosts loyalty"
     elif album_type == "single":
         single_count = sum(1 for t in recent_types if t == 'single')
         if single_count >= 2:
-            fanbase_change = random.randint(-8, -3)
+            fanbase_change = releases_rng.randint(-8, -3)
             fanbase_note = "Too many singles, fans disappointed"
         else:
-            fanbase_change = random.randint(1, 3)
+            fanbase_change = releases_rng.randint(1, 3)
     elif album_type == "mini":
         mini_count = sum(1 for t in recent_types if t == 'mini')
         if mini_count >= 3:
-            fanbase_change = random.randint(-5, -2)
+            fanbase_change = releases_rng.randint(-5, -2)
             fanbase_note = "Fans want a full album"
         else:
-            fanbase_change = random.randint(2, 5)
+            fanbase_change = releases_rng.randint(2, 5)
     
     investment_boost = min(5, investment // 500000)
     total_fanbase_change = fanbase_change + investment_boost
     group_entry['fanbase'] = max(0, min(100, group_entry.get('fanbase', 50) + total_fanbase_change))
     
-    initial_stock = random.randint(500000, 1500000) if album_format == "physical" else 0
+    initial_stock = releases_rng.randint(500000, 1500000) if album_format == "physical" else 0
     
     new_album_data = {
         'group': group_name_upper,
         'wins': 0,
-        'release_date': datetime.now(ARG_TZ).strftime("%Y-%m-%d"),
+        'release_date': get_today_str(),
         'streams': 0, 
         'sales': 0,
         'views': 0,
@@ -4639,12 +4809,7 @@ async def comeback(
         'album_type': album_type,
         'album_format': album_format,
         'stock': initial_stock,
-        'charts_info': {
-            "MelOn": {'rank': None, 'peak': None, 'prev_rank': None},
-            "Genie": {'rank': None, 'peak': None, 'prev_rank': None},
-            "Bugs": {'rank': None, 'peak': None, 'prev_rank': None},
-            "FLO": {'rank': None, 'peak': None, 'prev_rank': None}
-        }
+        'charts_info': {}  # Filled in by the chart tick once the album charts
     }
     album_data[album_name] = new_album_data
     save_data()
@@ -4745,24 +4910,87 @@ async def disband(interaction: discord.Interaction, group_name: str):
     )
 
 
+# === Leaderboards ===
+# Top-10 boards the leaderboard commands read instead of sorting everything
+# (see leaderboards.py). company_funds maintains its own board. The group
+# boards are brought up to date by save_data(): every change to popularity or
+# weekly streams is followed by a save, so that is the one place that sees
+# them all, and the save already walks all of the data anyway.
+popularity_board = leaderboards.TopK()
+weekly_score_board = leaderboards.TopK()    # /groupweekly: streams, sales and views
+weekly_streams_board = leaderboards.TopK()  # /groupchart: album streams only
+weekly_group_tallies = {}
+weekly_boards_week = None
+
+
+def _weekly_group_tallies(current_week: str) -> dict:
+    """{group: tally} for the week, by each album's 'group' field, groups in
+    the order their first album appears (the old views' order for ties)."""
+    tallies = {}
+    for album_entry in album_data.values():
+        group_name = album_entry.get('group', 'Unknown')
+        tally = tallies.get(group_name)
+        if tally is None:
+            tally = tallies[group_name] = {'streams': 0, 'album_streams': 0, 'sales': 0,
+                                           'views': 0, 'album_count': 0}
+        album_weekly = album_entry.get('weekly_streams', {}).get(current_week, 0)
+        tally['album_streams'] += album_weekly
+        if album_weekly > 0:
+            tally['album_count'] += 1
+        tally['streams'] += album_weekly
+        songs = album_entry.get('songs', {})
+        if isinstance(songs, dict):
+            for song_data in songs.values():
+                tally['streams'] += song_data.get('weekly_streams', {}).get(current_week, 0)
+        tally['sales'] += album_entry.get('weekly_sales', {}).get(current_week, 0)
+        tally['views'] += album_entry.get('weekly_views', {}).get(current_week, 0)
+    for tally in tallies.values():
+        tally['raw_score'] = (tally['streams'] / 10000) + (tally['sales'] * 2) + (tally['views'] / 5000)
+    return tallies
+
+
+def refresh_group_boards():
+    """Recompute the group boards from group_data and album_data."""
+    global weekly_boards_week
+    popularity_board.clear()
+    for group_name, group_entry in group_data.items():
+        if isinstance(group_entry, dict):
+            popularity_board.update(group_name, group_entry.get('popularity', 0))
+
+    weekly_boards_week = get_current_week_key()
+    tallies = _weekly_group_tallies(weekly_boards_week)
+    weekly_group_tallies.clear()
+    weekly_group_tallies.update(tallies)
+    weekly_streams_board.clear()
+    for group_name, tally in tallies.items():
+        if tally['album_streams'] > 0:
+            weekly_streams_board.update(group_name, tally['album_streams'])
+    weekly_score_board.clear()
+    for group_name, group_entry in group_data.items():
+        if not isinstance(group_entry, dict) or group_entry.get('is_disbanded'):
+            continue
+        tally = tallies.get(group_name)
+        if tally is None:
+            tally = weekly_group_tallies[group_name] = {'streams': 0, 'album_streams': 0, 'sales': 0,
+                                                        'views': 0, 'album_count': 0, 'raw_score': 0}
+        weekly_score_board.update(group_name, tally['raw_score'])
+
+
+def _current_weekly_boards():
+    """The current week key, after rebuilding the boards if the week changed."""
+    current_week = get_current_week_key()
+    if weekly_boards_week != current_week:
+        refresh_group_boards()
+    return current_week
+
+
 @bot.tree.command(description="Show the leaderboard of most popular groups.")
 async def groups(interaction: discord.Interaction):
     if not group_data:
         await interaction.response.send_message("No groups registered yet.")
         return
 
-    # Only include valid dict entries (prevents unexpected crashes)
-    active_groups = {
-        name: data
-        for name, data in group_data.items()
-        if isinstance(data, dict)
-    }
-
-    sorted_groups = sorted(
-        active_groups.items(),
-        key=lambda item: item[1].get('popularity', 0),
-        reverse=True
-    )
+    sorted_groups = [(name, group_data[name]) for name, _ in popularity_board.top()]
 
     embed = discord.Embed(
         title="Most Popular Groups",
@@ -4790,7 +5018,7 @@ async def companies(interaction: discord.Interaction):
         return
 
     # Richest Companies
-    richest_companies = sorted(company_funds.items(), key=lambda item: item[1], reverse=True)
+    richest_companies = company_funds.board.top()
     company_embed = discord.Embed(title="Richest Companies", color=discord.Color.from_rgb(255, 105, 180))
     if richest_companies:
         for i, (company_name, funds) in enumerate(richest_companies[:10]):
@@ -4922,13 +5150,15 @@ def _calculate_base_rank(streams: int, chart_settings: dict):
     return None
 
 
-def _calculate_all_chart_ranks(chart_name: str, chart_settings: dict):
+def _calculate_all_chart_ranks(chart_name: str, chart_settings: dict, active_albums=None):
     """
     Calculates unique chart ranks for all active albums on a specific chart.
     Albums get ranks based on their streams (absolute), then adjusted to ensure uniqueness.
     Returns a dict mapping album_name -> rank (or None if not charting).
+    active_albums: [(album name, entry)], by default _get_all_active_albums().
     """
-    active_albums = _get_all_active_albums()
+    if active_albums is None:
+        active_albums = _get_all_active_albums()
     
     album_base_ranks = []
     for album_name, album_entry in active_albums:
@@ -4966,6 +5196,179 @@ def _get_chart_info(album_entry: dict, chart_type: str):
 
     return album_entry['charts_info'][chart_type]
 
+
+# Rank history per album/song and chart, written by the hourly chart tick
+# (see chart_history.py). CHART_HISTORY_HOURS is how many ticks are kept.
+chart_log = chart_history.ChartHistory(
+    os.getenv("CHART_HISTORY_FILE", "chart_history.json"),
+    int(os.getenv("CHART_HISTORY_HOURS", chart_history.DEFAULT_RETENTION)),
+)
+chart_log.load()
+
+
+def _apply_tick_rank(chart_info: dict, rank):
+    """Move one chart entry forward a tick: rank -> prev_rank, peak kept."""
+    chart_info['prev_rank'] = chart_info.get('rank')
+    chart_info['rank'] = rank
+    if rank is not None and (chart_info.get('peak') is None or rank < chart_info['peak']):
+        chart_info['peak'] = rank
+
+
+def _expire_promotions():
+    now = datetime.now()
+    for album_entry in album_data.values():
+        promo_end = album_entry.get('promotion_end_date')
+        if album_entry.get('is_active_promotion') and promo_end and now > promo_end:
+            album_entry['is_active_promotion'] = False
+            album_entry['promotion_end_date'] = None
+            for chart_key in album_entry.get('charts_info', {}):
+                album_entry['charts_info'][chart_key] = {'rank': None, 'peak': None, 'prev_rank': None}
+
+
+def _chart_tick_inputs():
+    """(albums, songs): what the tick ranks, copied out of the live data.
+
+    Only plain reads and small copies, no scoring or sorting, so it is cheap
+    to do on the event loop; the ranking then runs in a thread on these
+    copies while commands go on changing album_data.
+    albums: [(album name, {'streams', 'release_date', 'daily_streams'})]
+    songs:  [(song key, weekly streams)] for songs streamed this week
+    """
+    today = datetime.now(ARG_TZ).date()
+    recent_days = [(today - timedelta(days=offset)).strftime("%Y-%m-%d") for offset in range(CHART_RECENT_DAYS)]
+    albums = []
+    for album_name, album_entry in _get_all_active_albums():
+        daily = album_entry.get('daily_streams')
+        albums.append((album_name, {
+            'streams': album_entry.get('streams', 0),
+            'release_date': album_entry.get('release_date', ''),
+            'daily_streams': {day: daily[day] for day in recent_days if day in daily} if isinstance(daily, dict) else None,
+        }))
+    songs = []
+    for group_name, group_entry in group_data.items():
+        if group_entry.get('is_disbanded'):
+            continue
+        for song_entry in _get_all_songs_weekly_data(group_name):
+            songs.append((chart_history.song_key(song_entry['album_name'], song_entry['song_name']),
+                          song_entry['weekly_streams']))
+    return albums, songs
+
+
+def _rank_chart_tick(albums, songs) -> dict:
+    """{chart key: {album name or song key: rank}} from _chart_tick_inputs(). Thread-safe."""
+    ranks = {}
+    for platform_name, settings in CHART_CONFIG.items():
+        ranks[platform_name] = _calculate_all_chart_ranks(platform_name, settings, albums)
+    for platform_name, settings in CHART_CONFIG.items():
+        ranks[f"weekly_{platform_name}"] = {key: _calculate_song_rank(streams, settings) for key, streams in songs}
+    return ranks
+
+
+def _tick_album_charts(ranks: dict):
+    """Move every album's charts_info on to this tick's ranks. Awards ALL KILLs."""
+    for platform_name in CHART_CONFIG:
+        platform_ranks = ranks[platform_name]
+        for album_name, album_entry in album_data.items():
+            rank = platform_ranks.get(album_name)
+            # Albums that have never charted on a platform get no entry for it.
+            if rank is not None or platform_name in album_entry.get('charts_info', {}):
+                _apply_tick_rank(_get_chart_info(album_entry, platform_name), rank)
+
+    # An ALL KILL is rewarded once, when an album first reaches #1 everywhere,
+    # rather than every time someone happens to look at it while it's there.
+    for album_name, album_entry in album_data.items():
+        chart_info_data = album_entry.get('charts_info', {})
+        if not all(chart_info_data.get(p, {}).get('rank') == 1 for p in CHART_CONFIG):
+            continue
+        if all(chart_info_data[p]['prev_rank'] == 1 for p in CHART_CONFIG):
+            continue
+        group_entry = group_data.get(album_entry.get('group'))
+        if not group_entry:
+            continue
+        gp_boost = charts_rng.randint(3, 8)
+        fanbase_boost = charts_rng.randint(2, 5)
+        group_entry['all_kills'] = group_entry.get('all_kills', 0) + 1
+        group_entry['gp'] = group_entry.get('gp', 30) + gp_boost
+        group_entry['fanbase'] = group_entry.get('fanbase', 50) + fanbase_boost
+        album_entry['last_all_kill'] = {'date': get_today_str(), 'gp': gp_boost, 'fanbase': fanbase_boost}
+
+
+def _tick_weekly_song_charts(ranks: dict):
+    """Move every song's weekly_chart_info on to this tick's ranks."""
+    charting = {key for platform_name in CHART_CONFIG
+                for key, rank in ranks[f"weekly_{platform_name}"].items() if rank is not None}
+    for album_name, album_entry in album_data.items():
+        songs = album_entry.get('songs', {})
+        if not isinstance(songs, dict):
+            continue
+        for song_name, song_info in songs.items():
+            if not isinstance(song_info, dict):
+                continue
+            key = chart_history.song_key(album_name, song_name)
+            if not song_info.get('weekly_chart_info') and key not in charting:
+                continue
+            for platform_name in CHART_CONFIG:
+                chart_key = f"weekly_{platform_name}"
+                chart_ranks = ranks[chart_key]
+                rank = chart_ranks.get(key)
+                chart_info = (song_info.get('weekly_chart_info') or {}).get(chart_key)
+                if chart_info is None:
+                    if rank is None:
+                        continue  # Never charted here; no entry until it does
+                    chart_info = song_info.setdefault('weekly_chart_info', {}).setdefault(
+                        chart_key, {'rank': None, 'peak': None, 'prev_rank': None})
+                elif key not in chart_ranks and chart_info.get('rank') is None:
+                    continue
+                # Songs with no streams this week (not in chart_ranks) drop
+                # off; without this a song's last rank would stay on display
+                # until it was streamed again.
+                _apply_tick_rank(chart_info, rank)
+
+
+# Set when a tick has changed album_data without saving it; the next save,
+# or flush_usage_limits, writes it.
+charts_unsaved = False
+_chart_tick_lock = asyncio.Lock()
+
+
+@clock.on("hour")
+async def chart_tick(keys):
+    """Compute every chart once and record it. /charts and /weeklychart only read the result.
+
+    The ranking and the chart log's write run in threads, so the hour boundary
+    doesn't stall the bot; data.json goes out with the next save rather than
+    a full save of its own.
+    """
+    global charts_unsaved
+    stamp = int(keys.now.timestamp())
+    async with _chart_tick_lock:
+        if chart_log.last_stamp is not None and chart_log.last_stamp // 3600 == stamp // 3600:
+            return  # Already ticked this hour (a catch-up and the clock raced)
+        started = time.perf_counter()
+        _expire_promotions()
+        albums, songs = _chart_tick_inputs()
+        ranks = await asyncio.to_thread(_rank_chart_tick, albums, songs)
+        _tick_album_charts(ranks)
+        _tick_weekly_song_charts(ranks)
+        chart_log.record(stamp, ranks)
+        charts_unsaved = True
+        await asyncio.to_thread(chart_log.save)
+        print(f"Chart tick for {keys.day} {keys.hour:02d}:00 took {(time.perf_counter() - started) * 1000:.0f}ms")
+
+
+def _chart_tick_due() -> bool:
+    """True if no tick has run during the current hour (e.g. after a restart)."""
+    last = chart_log.last_stamp
+    return last is None or last // 3600 != int(clock.keys().now.timestamp()) // 3600
+
+
+def _chart_updated_text() -> str:
+    last = chart_log.last_stamp
+    if last is None:
+        return "Charts update hourly."
+    return f"Charts update hourly · last update {datetime.fromtimestamp(last, ARG_TZ).strftime('%H:%M')} (ART)"
+
+
 def _update_and_format_chart_line(album_entry: dict, chart_name: str, calculated_rank: int):
     """Updates chart info for an album and returns a formatted string for the report."""
     chart_info = _get_chart_info(album_entry, chart_name)
@@ -5014,11 +5417,11 @@ CHARTS_ENTRIES_SHOWN = 10 # Per platform, on the overall chart view
 )
 @app_commands.autocomplete(group_name=group_autocomplete)
 async def charts(interaction: discord.Interaction, group_name: str = None):
-    # No group given: show the overall charts across every platform.
+    # Both views are READ ONLY: they show the ranks from the last chart tick
+    # (see chart_tick). Recording movement on view made it depend on how
+    # often people looked.
     #
-    # This branch is READ ONLY. The per-group view below records prev_rank and
-    # peak as it goes, so if browsing the overall chart did the same, simply
-    # looking at it would manufacture movement in every group's next report.
+    # No group given: show the overall charts across every platform.
     if group_name is None:
         current_date_formatted = f"{datetime.now(ARG_TZ).strftime('%B')} {ordinal(datetime.now(ARG_TZ).day)}"
         embed = discord.Embed(
@@ -5027,10 +5430,11 @@ async def charts(interaction: discord.Interaction, group_name: str = None):
         )
 
         charting_anywhere = False
-        for platform_name, settings in CHART_CONFIG.items():
-            all_ranks = _calculate_all_chart_ranks(platform_name, settings)
+        for platform_name in CHART_CONFIG:
             ranked = sorted(
-                ((rank, name) for name, rank in all_ranks.items() if rank is not None)
+                (entry['charts_info'][platform_name]['rank'], name)
+                for name, entry in album_data.items()
+                if entry.get('charts_info', {}).get(platform_name, {}).get('rank') is not None
             )
             if not ranked:
                 embed.add_field(name=platform_name, value="*No albums charting.*", inline=False)
@@ -5056,7 +5460,7 @@ async def charts(interaction: discord.Interaction, group_name: str = None):
 
         if not charting_anywhere:
             embed.description = "Nothing is charting right now."
-        embed.set_footer(text="Use /charts <group> for one group's chart run.")
+        embed.set_footer(text=f"Use /charts <group> for one group's chart run. {_chart_updated_text()}")
 
         await interaction.response.send_message(embed=embed)
         return
@@ -5078,22 +5482,10 @@ async def charts(interaction: discord.Interaction, group_name: str = None):
     for album_name in group_albums:
         album_entry = album_data.get(album_name)
         if album_entry and album_entry.get('is_active_promotion'):
-            # Now, album_entry['promotion_end_date'] is either a datetime object or None
+            # An ended promotion is switched off by the next chart tick; until
+            # then it just doesn't count as active.
             promo_end_date_obj = album_entry.get('promotion_end_date')
-
-            # If promo_end_date_obj exists AND the current time is past it
-            if promo_end_date_obj and datetime.now() > promo_end_date_obj:
-                # Promotion has ended, deactivate this album
-                album_entry['is_active_promotion'] = False
-                album_entry['promotion_end_date'] = None # Set to None, will be saved as null by DateTimeEncoder
-                # Reset chart info for deactivated album
-                for chart_key in album_entry['charts_info']:
-                    album_entry['charts_info'][chart_key] = {'rank': None, 'peak': None, 'prev_rank': None}
-                save_data() # Save the change
-                continue # Skip to next album
-
-            # If it's active AND (no end date or current time is within the period)
-            if album_entry.get('is_active_promotion') and (not promo_end_date_obj or datetime.now() <= promo_end_date_obj):
+            if not promo_end_date_obj or datetime.now() <= promo_end_date_obj:
                 active_album_name = album_name
                 break # Found the active album
 
@@ -5119,18 +5511,8 @@ async def charts(interaction: discord.Interaction, group_name: str = None):
 
     final_chart_display = []
 
-    for platform_name, settings in CHART_CONFIG.items():
-        all_ranks = _calculate_all_chart_ranks(platform_name, settings)
-        calculated_rank = all_ranks.get(active_album_name)
-        
-        chart_info = _get_chart_info(album_entry, platform_name)
-        chart_info['prev_rank'] = chart_info.get('rank')
-        chart_info['rank'] = calculated_rank
-        
-        if calculated_rank is not None:
-            if chart_info['peak'] is None or calculated_rank < chart_info['peak']:
-                chart_info['peak'] = calculated_rank
-        
+    for platform_name in CHART_CONFIG:
+        chart_info = album_entry.get('charts_info', {}).get(platform_name, {})
         current_rank = chart_info.get('rank')
 
         if current_rank is not None:
@@ -5162,24 +5544,14 @@ async def charts(interaction: discord.Interaction, group_name: str = None):
     else:
         report_lines.append(f"*{active_album_name} by {group_name_upper} is not currently charting on any major platform.*")
 
-    all_kill = False
+    # The reward itself is handed out by the chart tick that reached it.
     chart_info_data = album_entry.get('charts_info', {})
-    if len(chart_info_data) == 4:
-        ranks = [chart_info_data.get(chart, {}).get('rank') for chart in ["MelOn", "Genie", "Bugs", "FLO"]]
-        if all(r == 1 for r in ranks):
-            all_kill = True
-            report_lines.append("\n👑 **ALL KILL** 👑")
-            report_lines.append("*#1 on all major charts!*")
-            
-            group_entry = group_data.get(group_name_upper, {})
-            group_entry['all_kills'] = group_entry.get('all_kills', 0) + 1
-            
-            gp_boost = random.randint(3, 8)
-            fanbase_boost = random.randint(2, 5)
-            group_entry['gp'] = group_entry.get('gp', 30) + gp_boost
-            group_entry['fanbase'] = group_entry.get('fanbase', 50) + fanbase_boost
-            
-            report_lines.append(f"*GP +{gp_boost} | Fanbase +{fanbase_boost}*")
+    if all(chart_info_data.get(chart, {}).get('rank') == 1 for chart in CHART_CONFIG):
+        report_lines.append("\n👑 **ALL KILL** 👑")
+        report_lines.append("*#1 on all major charts!*")
+        last_all_kill = album_entry.get('last_all_kill')
+        if last_all_kill:
+            report_lines.append(f"*GP +{last_all_kill['gp']} | Fanbase +{last_all_kill['fanbase']}*")
 
     group_hashtag_main = f"#{group_name_upper.replace(' ', '')}"
     group_korean_hashtag = f"#{group_korean_name.replace(' ', '')}" if group_korean_name else ""
@@ -5194,8 +5566,6 @@ async def charts(interaction: discord.Interaction, group_name: str = None):
 
     report_lines.append("\n" + "\n".join(final_hashtags_block))
 
-    save_data()
-
     await interaction.response.send_message("\n".join(report_lines))
 
 # --- New Command: View Group Details ---
@@ -5992,7 +6362,7 @@ class PayolaShopView(ui.View):
 
 
             group_entry = group_data.get(self.group_name)
-            popularity_boost = random.randint(*item_details['popularity_boost_range'])
+            popularity_boost = payola_rng.randint(*item_details['popularity_boost_range'])
             group_entry['popularity'] = group_entry.get('popularity', 0) + popularity_boost
             outcome_message += (
                 f"**{self.group_name}**'s popularity increased by **{popularity_boost}** "
@@ -6026,8 +6396,8 @@ class PayolaShopView(ui.View):
             #      return
 
 
-            streams_added = random.randint(*item_details['streams_to_add_range'])
-            sales_added = random.randint(*item_details['sales_to_add_range'])
+            streams_added = payola_rng.randint(*item_details['streams_to_add_range'])
+            sales_added = payola_rng.randint(*item_details['sales_to_add_range'])
 
             apply_album_streams(target_album_entry, streams_added)
             target_album_entry['sales'] = target_album_entry.get('sales', 0) + sales_added
@@ -6062,8 +6432,8 @@ class PayolaShopView(ui.View):
                 return
 
             # Check for backfire
-            if random.random() < item_details['backfire_chance']:
-                popularity_reduction = random.randint(*item_details['popularity_reduction_range'])
+            if payola_rng.random() < item_details['backfire_chance']:
+                popularity_reduction = payola_rng.randint(*item_details['popularity_reduction_range'])
                 # If backfire, reduce user's own group's popularity (if specified) or a random one from their company
                 user_company_list = get_user_companies(self.user_id)
                 affected_group_for_backfire = None # Initialize to None
@@ -6077,11 +6447,11 @@ class PayolaShopView(ui.View):
                                 user_owned_active_groups.append(g_name)
 
                     if user_owned_active_groups:
-                        affected_group_for_backfire = random.choice(user_owned_active_groups)
+                        affected_group_for_backfire = payola_rng.choice(user_owned_active_groups)
                         group_data[affected_group_for_backfire]['popularity'] = max(0, group_data[affected_group_for_backfire].get('popularity', 0) - popularity_reduction)
                         group_data[affected_group_for_backfire]['has_scandal'] = True
                         # Reputation damage from backfired scandal machine
-                        apply_reputation_change(affected_group_for_backfire, random.randint(-15, -8), "Scandal Machine Backfire")
+                        apply_reputation_change(affected_group_for_backfire, payola_rng.randint(-15, -8), "Scandal Machine Backfire")
                         outcome_message = (
                             f"💔 Oh no! The **Scandal Machine** backfired!\n"
                             f"Your group **{affected_group_for_backfire}**'s popularity decreased by **{popularity_reduction}** "
@@ -6100,12 +6470,12 @@ class PayolaShopView(ui.View):
                 else:
                     outcome_message = "💔 Oh no! The **Scandal Machine** backfired, but you don't own a company to affect!"
             else:
-                popularity_reduction = random.randint(*item_details['popularity_reduction_range'])
+                popularity_reduction = payola_rng.randint(*item_details['popularity_reduction_range'])
                 target_group_entry['popularity'] = max(0, target_group_entry.get('popularity', 0) - popularity_reduction)
                 target_group_entry['has_scandal'] = True
-                target_group_entry['gp'] = max(0, target_group_entry.get('gp', 30) - random.randint(5, 15))
+                target_group_entry['gp'] = max(0, target_group_entry.get('gp', 30) - payola_rng.randint(5, 15))
                 # Reputation damage from scandal machine attack
-                apply_reputation_change(self.target_group_name, random.randint(-12, -5), "Scandal Attack")
+                apply_reputation_change(self.target_group_name, payola_rng.randint(-12, -5), "Scandal Attack")
                 outcome_message += (
                     f"**{self.target_group_name}**'s popularity decreased by **{popularity_reduction}** "
                     f"(New popularity: {target_group_entry['popularity']}).\n"
@@ -6138,7 +6508,7 @@ class PayolaShopView(ui.View):
                 self.stop()
                 return
 
-            views_added = random.randint(*item_details['views_to_add_range'])
+            views_added = payola_rng.randint(*item_details['views_to_add_range'])
             target_album_entry['views'] = target_album_entry.get('views', 0) + views_added
 
             if target_album_entry.get('first_24h_tracking'):
@@ -6148,8 +6518,8 @@ class PayolaShopView(ui.View):
 
             outcome_message += f"Added **{format_number(views_added)}** MV views to **'{self.target_album_name}'**!"
 
-            if random.random() < item_details['gp_reduction_chance']:
-                gp_loss = random.randint(*item_details['gp_reduction_range'])
+            if payola_rng.random() < item_details['gp_reduction_chance']:
+                gp_loss = payola_rng.randint(*item_details['gp_reduction_range'])
                 if target_group_name_for_album:
                     group_data[target_group_name_for_album]['gp'] = max(0, group_data[target_group_name_for_album].get('gp', 30) - gp_loss)
                     outcome_message += f"\n⚠️ The public is getting annoyed by your ads! GP interest decreased by **{gp_loss}**."
@@ -6172,7 +6542,7 @@ class PayolaShopView(ui.View):
                 self.stop()
                 return
 
-            streams_added = random.randint(*item_details['streams_to_add_range'])
+            streams_added = payola_rng.randint(*item_details['streams_to_add_range'])
             apply_album_streams(target_album_entry, streams_added)
 
             if target_album_entry.get('first_24h_tracking'):
@@ -6182,8 +6552,8 @@ class PayolaShopView(ui.View):
 
             outcome_message += f"Added **{format_number(streams_added)}** streams to **'{self.target_album_name}'** through playlist placement!"
 
-            if random.random() < item_details['gp_reduction_chance']:
-                gp_loss = random.randint(*item_details['gp_reduction_range'])
+            if payola_rng.random() < item_details['gp_reduction_chance']:
+                gp_loss = payola_rng.randint(*item_details['gp_reduction_range'])
                 if target_group_name_for_album:
                     group_data[target_group_name_for_album]['gp'] = max(0, group_data[target_group_name_for_album].get('gp', 30) - gp_loss)
                     outcome_message += f"\n⚠️ People are noticing the artificial playlist placements! GP interest decreased by **{gp_loss}**."
@@ -6206,12 +6576,12 @@ class PayolaShopView(ui.View):
                 self.stop()
                 return
 
-            views_added = random.randint(*item_details['views_to_add_range'])
-            streams_added = random.randint(*item_details['streams_to_add_range'])
+            views_added = payola_rng.randint(*item_details['views_to_add_range'])
+            streams_added = payola_rng.randint(*item_details['streams_to_add_range'])
 
-            if random.random() < item_details['exposure_chance']:
-                pop_loss = random.randint(*item_details['popularity_loss_on_exposure'])
-                gp_loss = random.randint(*item_details['gp_loss_on_exposure'])
+            if payola_rng.random() < item_details['exposure_chance']:
+                pop_loss = payola_rng.randint(*item_details['popularity_loss_on_exposure'])
+                gp_loss = payola_rng.randint(*item_details['gp_loss_on_exposure'])
                 
                 if target_group_name_for_album:
                     group_data[target_group_name_for_album]['popularity'] = max(0, group_data[target_group_name_for_album].get('popularity', 0) - pop_loss)
@@ -6220,7 +6590,7 @@ class PayolaShopView(ui.View):
                     group_data[target_group_name_for_album]['has_scandal'] = True
                     group_data[target_group_name_for_album]['active_hate_train'] = True
                     # Major reputation damage for botting scandal
-                    apply_reputation_change(target_group_name_for_album, random.randint(-25, -15), "Botting Scandal Exposed")
+                    apply_reputation_change(target_group_name_for_album, payola_rng.randint(-25, -15), "Botting Scandal Exposed")
                 
                 outcome_message = (
                     f"🚨 **EXPOSED!** Your botting has been detected!\n"
@@ -6952,7 +7322,6 @@ async def publicapology(interaction: discord.Interaction, group_name: str):
         return
     
     current_gp = group_entry.get('gp', 30)
-    current_fanbase = group_entry.get('fanbase', 50)
     
     forgiveness_chance = 0.5
     if current_gp < 20:
@@ -6960,16 +7329,15 @@ async def publicapology(interaction: discord.Interaction, group_name: str):
     elif current_gp < 10:
         forgiveness_chance = 0.15
     
-    if random.random() < forgiveness_chance:
-        gp_recovery = random.randint(8, 20)
-        group_entry['gp'] = current_gp + gp_recovery
-        group_entry['has_scandal'] = False
-        group_entry['active_hate_train'] = False
-        group_entry['hate_train_fanbase_boost'] = 0
-        
-        update_nations_group()
-        update_cooldown(user_id, f"apology_{group_name_upper}")
-        save_data()
+    if events_rng.random() < forgiveness_chance:
+        gp_recovery = events_rng.randint(8, 20)
+        group_effects.run([
+            stat_effects.Stat(group_name_upper, 'gp', gp_recovery, default=30),
+            stat_effects.SetField(group_name_upper, 'has_scandal', False),
+            stat_effects.SetField(group_name_upper, 'active_hate_train', False),
+            stat_effects.SetField(group_name_upper, 'hate_train_fanbase_boost', 0),
+        ])
+        update_cooldown(user_id, f"apology_{group_name_upper}")  # Only once the apology took effect
         
         embed = discord.Embed(
             title=f"🙏 Public Apology - {group_name_upper}",
@@ -6987,18 +7355,17 @@ async def publicapology(interaction: discord.Interaction, group_name: str):
         except discord.errors.Forbidden:
             pass
     else:
-        gp_loss = random.randint(5, 15)
-        fanbase_boost = random.randint(10, 25)
-        group_entry['gp'] = max(0, current_gp - gp_loss)
-        group_entry['active_hate_train'] = True
-        group_entry['hate_train_fanbase_boost'] = min(50, group_entry.get('hate_train_fanbase_boost', 0) + fanbase_boost)
-        group_entry['fanbase'] = current_fanbase + random.randint(3, 8)
-        # Reputation damage from failed apology triggering hate train
-        apply_reputation_change(group_name_upper, random.randint(-10, -5), "Failed Public Apology")
-        
-        update_nations_group()
+        gp_loss = events_rng.randint(5, 15)
+        fanbase_boost = events_rng.randint(10, 25)
+        group_effects.run([
+            stat_effects.Stat(group_name_upper, 'gp', -gp_loss, default=30),
+            stat_effects.SetField(group_name_upper, 'active_hate_train', True),
+            stat_effects.Stat(group_name_upper, 'hate_train_fanbase_boost', fanbase_boost, high=50),
+            stat_effects.Stat(group_name_upper, 'fanbase', events_rng.randint(3, 8), default=50),
+            # Reputation damage from failed apology triggering hate train
+            stat_effects.Reputation(group_name_upper, events_rng.randint(-10, -5), "Failed Public Apology"),
+        ])
         update_cooldown(user_id, f"apology_{group_name_upper}")
-        save_data()
         
         embed = discord.Embed(
             title=f"😡 Public Apology BACKFIRED - {group_name_upper}",
@@ -7078,19 +7445,19 @@ async def variety(interaction: discord.Interaction, group_name: str, activity_ty
     company_funds[company_name] -= cost
     
     activity_info = VARIETY_ACTIVITIES.get(activity_type, VARIETY_ACTIVITIES['variety_show'])
-    show = random.choice(activity_info['shows'])
+    show = activities_rng.choice(activity_info['shows'])
     
     demo_mults = get_demographic_multipliers(group_entry)
     
-    base_gp = random.randint(3, 10)
-    gp_variance = random.uniform(0.6, 1.5)
+    base_gp = activities_rng.randint(3, 10)
+    gp_variance = activities_rng.uniform(0.6, 1.5)
     gp_gain = max(2, int(base_gp * gp_variance * demo_mults['gp']))
     
-    base_pop = random.randint(5, 15)
-    pop_variance = random.uniform(0.5, 1.5)
+    base_pop = activities_rng.randint(5, 15)
+    pop_variance = activities_rng.uniform(0.5, 1.5)
     pop_gain = max(3, int(base_pop * pop_variance))
     
-    went_viral_moment = random.random() < 0.08
+    went_viral_moment = activities_rng.random() < 0.08
     if went_viral_moment:
         gp_gain = int(gp_gain * 2.0)
         pop_gain = int(pop_gain * 1.8)
@@ -7168,21 +7535,21 @@ async def charity(interaction: discord.Interaction, group_name: str):
     company_funds[company_name] -= cost
     
     charities = ["children's hospital", "disaster relief fund", "animal shelter", "education foundation", "environmental organization", "food bank"]
-    charity_type = random.choice(charities)
+    charity_type = activities_rng.choice(charities)
     
     demo_mults = get_demographic_multipliers(group_entry)
     
     # Dynamic GP and fanbase gains with variance
-    base_gp = random.randint(8, 18)
-    gp_variance = random.uniform(0.6, 1.5)
+    base_gp = activities_rng.randint(8, 18)
+    gp_variance = activities_rng.uniform(0.6, 1.5)
     gp_gain = max(5, int(base_gp * gp_variance * demo_mults['gp']))
     
-    base_fanbase = random.randint(2, 5)
-    fanbase_variance = random.uniform(0.5, 1.5)
+    base_fanbase = activities_rng.randint(2, 5)
+    fanbase_variance = activities_rng.uniform(0.5, 1.5)
     fanbase_gain = max(1, int(base_fanbase * fanbase_variance))
     
     # Rare exceptional charity event (5% chance)
-    went_exceptional = random.random() < 0.05
+    went_exceptional = activities_rng.random() < 0.05
     if went_exceptional:
         gp_gain = int(gp_gain * 2.5)
         fanbase_gain = int(fanbase_gain * 2)
@@ -7285,16 +7652,16 @@ class ArticleView(ui.View):
         
         group_entry = group_data[group_name_upper]
         members = group_entry.get('members', [])
-        member = random.choice(members) if members else "a member"
-        outlet = random.choice(MEDIA_OUTLETS)
+        member = media_rng.choice(members) if members else "a member"
+        outlet = media_rng.choice(MEDIA_OUTLETS)
         
         if article_type == "positive":
-            template = random.choice(ARTICLE_TEMPLATES['positive'])
+            template = media_rng.choice(ARTICLE_TEMPLATES['positive'])
             headline = template.format(outlet=outlet, group=group_name_upper, member=member)
             
-            gp_change = random.randint(5, 15)
-            fanbase_change = random.randint(2, 8)
-            pop_change = random.randint(10, 30)
+            gp_change = media_rng.randint(5, 15)
+            fanbase_change = media_rng.randint(2, 8)
+            pop_change = media_rng.randint(10, 30)
             
             group_entry['gp'] = group_entry.get('gp', 30) + gp_change
             group_entry['fanbase'] = group_entry.get('fanbase', 50) + fanbase_change
@@ -7303,12 +7670,12 @@ class ArticleView(ui.View):
             effect_text = f"+{gp_change} GP | +{fanbase_change} Fanbase | +{pop_change} Popularity"
             embed_color = discord.Color.green()
         else:
-            template = random.choice(ARTICLE_TEMPLATES['negative'])
+            template = media_rng.choice(ARTICLE_TEMPLATES['negative'])
             headline = template.format(outlet=outlet, group=group_name_upper, member=member)
             
-            gp_change = random.randint(-15, -5)
-            fanbase_change = random.randint(-5, -1)
-            pop_change = random.randint(-20, -5)
+            gp_change = media_rng.randint(-15, -5)
+            fanbase_change = media_rng.randint(-5, -1)
+            pop_change = media_rng.randint(-20, -5)
             
             group_entry['gp'] = max(0, group_entry.get('gp', 30) + gp_change)
             group_entry['fanbase'] = max(0, group_entry.get('fanbase', 50) + fanbase_change)
@@ -7340,10 +7707,7 @@ async def article(interaction: discord.Interaction, group_name: str):
     group_name_upper = group_name.upper()
     
     # Daily limit check (5 per day per user)
-    today = get_today_str()
-    user_daily_limits.setdefault(user_id, {})
-    article_uses = user_daily_limits[user_id].get('article', {})
-    if article_uses.get('date') == today and article_uses.get('count', 0) >= 5:
+    if usage_limits.uses_today(user_id, 'article') >= 5:
         await interaction.response.send_message("❌ You can only release 5 articles per day!", ephemeral=True)
         return
     
@@ -7354,13 +7718,10 @@ async def article(interaction: discord.Interaction, group_name: str):
     group_entry = group_data[group_name_upper]
     
     # Track daily usage
-    if article_uses.get('date') != today:
-        user_daily_limits[user_id]['article'] = {'date': today, 'count': 1}
-    else:
-        user_daily_limits[user_id]['article']['count'] = article_uses.get('count', 0) + 1
+    articles_today = usage_limits.record_use(user_id, 'article')
     save_data()
 
-    remaining = 5 - user_daily_limits[user_id]['article']['count']
+    remaining = 5 - articles_today
     
     embed = discord.Embed(
         title=f"📰 Release Article - {group_name_upper}",
@@ -7484,7 +7845,7 @@ async def preorder(interaction: discord.Interaction, group_name: str, album_name
     demo_mults = get_demographic_multipliers(group_entry)
     base_preorder = max(50, int(pop * 0.5 + fanbase * 2))
     base_preorder = int(base_preorder * demo_mults['fandom'])  # Female fans boost preorders
-    preorder_amount = min(remaining_stock, int(random.gauss(base_preorder, base_preorder * 0.3)))
+    preorder_amount = min(remaining_stock, int(releases_rng.gauss(base_preorder, base_preorder * 0.3)))
     preorder_amount = max(10, preorder_amount)
     
     preorder_entry['preordered'] += preorder_amount
@@ -7689,27 +8050,20 @@ async def weeklychart(interaction: discord.Interaction, group_name: str):
     for song_entry in songs_data:
         song_name = song_entry['song_name']
         album_name = song_entry['album_name']
-        weekly_streams = song_entry['weekly_streams']
         song_info = song_entry['song_data']
         
         song_chart_lines = []
         best_rank = 999
         
-        song_info.setdefault('weekly_chart_info', {})
+        # Ranks as of the last chart tick; viewing never moves them.
+        weekly_info = song_info.get('weekly_chart_info', {})
         
-        for platform_name, settings in CHART_CONFIG.items():
-            rank = _calculate_song_rank(weekly_streams, settings)
+        for platform_name in CHART_CONFIG:
+            chart_info = weekly_info.get(f"weekly_{platform_name}", {})
+            rank = chart_info.get('rank')
             if rank is None:
                 continue
             
-            chart_key = f"weekly_{platform_name}"
-            chart_info = song_info['weekly_chart_info'].setdefault(chart_key, {'rank': None, 'peak': None, 'prev_rank': None})
-            chart_info['prev_rank'] = chart_info.get('rank')
-            chart_info['rank'] = rank
-            
-            if chart_info['peak'] is None or rank < chart_info['peak']:
-                chart_info['peak'] = rank
-            
             prev_rank = chart_info.get('prev_rank')
             if prev_rank is None:
                 change_text = "(NEW)"
@@ -7752,36 +8106,16 @@ async def weeklychart(interaction: discord.Interaction, group_name: str):
     else:
         report_lines.append(f"**{group_hashtag}**")
     
-    save_data()
     await interaction.response.send_message("\n".join(report_lines))
 
 
 @bot.tree.command(description="View group rankings based on combined weekly album performance.")
 async def groupchart(interaction: discord.Interaction):
-    current_week = get_current_week_key()
-    
-    group_weekly_totals = {}
-    
-    for album_name, album_entry in album_data.items():
-        group_name = album_entry.get('group', 'Unknown')
-        weekly_streams = album_entry.get('weekly_streams', {})
-        this_week_streams = weekly_streams.get(current_week, 0)
-        
-        if group_name not in group_weekly_totals:
-            group_weekly_totals[group_name] = {
-                'weekly_streams': 0,
-                'album_count': 0
-            }
-        
-        group_weekly_totals[group_name]['weekly_streams'] += this_week_streams
-        if this_week_streams > 0:
-            group_weekly_totals[group_name]['album_count'] += 1
+    current_week = _current_weekly_boards()
     
-    sorted_groups = sorted(
-        [(g, data) for g, data in group_weekly_totals.items() if data['weekly_streams'] > 0],
-        key=lambda x: x[1]['weekly_streams'],
-        reverse=True
-    )
+    sorted_groups = [
+        (g, weekly_group_tallies[g]) for g, album_streams in weekly_streams_board.top() if album_streams > 0
+    ]
     
     if not sorted_groups:
         await interaction.response.send_message("No group streaming data for this week yet!", ephemeral=True)
@@ -7795,7 +8129,7 @@ async def groupchart(interaction: discord.Interaction):
         group_entry = group_data.get(group_name, {})
         is_nations = group_entry.get('is_nations_group', False)
         prefix = "🩷 " if is_nations else ""
-        weekly = format_number(data['weekly_streams'])
+        weekly = format_number(data['album_streams'])
         albums = data['album_count']
         report_lines.append(f"{rank_str} {prefix}**{group_name}** - {weekly} ({albums} albums)")
     
@@ -7919,19 +8253,19 @@ async def createsubunit(
         'wins': 0,
         'all_kills': 0,
         'payola_suspicion': 0,
-        'debut_date': datetime.now(ARG_TZ).strftime("%Y-%m-%d"),
+        'debut_date': get_today_str(),
         'profile_picture': None,
         'banner_url': None,
         'description': None
     }
     group_popularity[subunit_name_upper] = inherited_pop
     
-    initial_stock = random.randint(500000, 1500000) if album_format == "physical" else 0
+    initial_stock = releases_rng.randint(500000, 1500000) if album_format == "physical" else 0
     
     album_data[album_name] = {
         'group': subunit_name_upper,
         'wins': 0,
-        'release_date': datetime.now(ARG_TZ).strftime("%Y-%m-%d"),
+        'release_date': get_today_str(),
         'streams': 0,
         'sales': 0,
         'views': 0,
@@ -7942,12 +8276,7 @@ async def createsubunit(
         'album_type': album_type,
         'album_format': album_format,
         'stock': initial_stock,
-        'charts_info': {
-            "MelOn": {'rank': None, 'peak': None, 'prev_rank': None},
-            "Genie": {'rank': None, 'peak': None, 'prev_rank': None},
-            "Bugs": {'rank': None, 'peak': None, 'prev_rank': None},
-            "FLO": {'rank': None, 'peak': None, 'prev_rank': None}
-        }
+        'charts_info': {}  # Filled in by the chart tick once the album charts
     }
     
     parent_entry.setdefault('subunits', [])
@@ -8038,8 +8367,8 @@ async def addsongs(interaction: discord.Interaction, album_name: str, songs: str
         if len(other_songs) > 0:
             title_share = int(existing_streams * 0.6)
             remaining = existing_streams - title_share
-            base_weights = [(0.3 ** i) * random.uniform(0.5, 1.5) for i in range(len(other_songs))]
-            random.shuffle(base_weights)
+            base_weights = [(0.3 ** i) * streams_rng.uniform(0.5, 1.5) for i in range(len(other_songs))]
+            streams_rng.shuffle(base_weights)
             total_weight = sum(base_weights)
             bside_shares = [int(remaining * (w / total_weight)) for w in base_weights]
         else:
@@ -8381,8 +8710,8 @@ async def fixalbumstreams(interaction: discord.Interaction, album_name: str):
     if other_songs:
         title_share = int(total_streams * 0.6)
         remaining = total_streams - title_share
-        base_weights = [(0.3 ** i) * random.uniform(0.5, 1.5) for i in range(len(other_songs))]
-        random.shuffle(base_weights)
+        base_weights = [(0.3 ** i) * streams_rng.uniform(0.5, 1.5) for i in range(len(other_songs))]
+        streams_rng.shuffle(base_weights)
         total_weight = sum(base_weights)
         bside_shares = [int(remaining * (w / total_weight)) for w in base_weights]
     else:
@@ -8624,12 +8953,12 @@ async def viralchallenge(interaction: discord.Interaction, group_name: str, albu
         "lyrics challenge",
         "reaction challenge"
     ]
-    challenge_type = random.choice(challenges)
+    challenge_type = activities_rng.choice(challenges)
     
-    if random.random() < viral_chance:
-        gp_gain = random.randint(5, 15)
-        views_gain = random.randint(100000, 500000)
-        pop_gain = random.randint(10, 30)
+    if activities_rng.random() < viral_chance:
+        gp_gain = activities_rng.randint(5, 15)
+        views_gain = activities_rng.randint(100000, 500000)
+        pop_gain = activities_rng.randint(10, 30)
         
         group_entry['gp'] = group_entry.get('gp', 30) + gp_gain
         group_entry['popularity'] = group_entry.get('popularity', 0) + pop_gain
@@ -8655,8 +8984,8 @@ async def viralchallenge(interaction: discord.Interaction, group_name: str, albu
         except discord.errors.Forbidden:
             pass
     else:
-        gp_gain = random.randint(1, 3)
-        views_gain = random.randint(5000, 30000)
+        gp_gain = activities_rng.randint(1, 3)
+        views_gain = activities_rng.randint(5000, 30000)
         
         group_entry['gp'] = group_entry.get('gp', 30) + gp_gain
         album_entry['views'] = album_entry.get('views', 0) + views_gain
@@ -8712,24 +9041,24 @@ async def fanmeeting(interaction: discord.Interaction, group_name: str):
     popularity = group_entry.get('popularity', 0)
     
     base_attendance = fanbase * 20 + popularity * 5
-    attendance = max(100, int(random.gauss(base_attendance, base_attendance * 0.2)))
+    attendance = max(100, int(activities_rng.gauss(base_attendance, base_attendance * 0.2)))
     ticket_price = 80
     
     ticket_revenue = attendance * ticket_price
-    exclusive_merch = int(attendance * random.uniform(20, 40))
+    exclusive_merch = int(attendance * activities_rng.uniform(20, 40))
     total_revenue = ticket_revenue + exclusive_merch
     net_profit = total_revenue - venue_cost
     
     company_funds[company_name] += total_revenue
     
-    fanbase_variance = random.uniform(0.6, 1.4)
-    fanbase_gain = max(2, int(random.randint(3, 8) * fanbase_variance))
+    fanbase_variance = activities_rng.uniform(0.6, 1.4)
+    fanbase_gain = max(2, int(activities_rng.randint(3, 8) * fanbase_variance))
     group_entry['fanbase'] = group_entry.get('fanbase', 50) + fanbase_gain
     
     shift_demographics(group_entry, 'fanmeeting')
     
     activities = ["fansign event", "hi-touch session", "Q&A session", "mini-concert", "birthday celebration"]
-    activity = random.choice(activities)
+    activity = activities_rng.choice(activities)
     
     update_cooldown(user_id, f"fanmeet_{group_name_upper}")
     save_data()
@@ -8783,8 +9112,8 @@ async def merchandise(interaction: discord.Interaction, group_name: str):
     popularity = group_entry.get('popularity', 0)
     
     base_units = fanbase * 50 + popularity * 10
-    units_sold = max(100, int(random.gauss(base_units, base_units * 0.3)))
-    price_per_unit = random.randint(20, 50)
+    units_sold = max(100, int(activities_rng.gauss(base_units, base_units * 0.3)))
+    price_per_unit = activities_rng.randint(20, 50)
     
     revenue = units_sold * price_per_unit
     net_profit = revenue - production_cost
@@ -8798,7 +9127,7 @@ async def merchandise(interaction: discord.Interaction, group_name: str):
     company_funds[company_name] += revenue
     
     merch_types = ["lightstick", "photocard set", "hoodie collection", "poster set", "keychain bundle", "fan kit", "slogan banner"]
-    merch = random.choice(merch_types)
+    merch = activities_rng.choice(merch_types)
     
     shift_demographics(group_entry, 'merchandise')
     
@@ -8822,96 +9151,6 @@ async def merchandise(interaction: discord.Interaction, group_name: str):
 
 # === PREDICT COMMAND WITH PILLOW SCOREBOARD ===
 
-def create_predict_scoreboard(albums_scores: list[dict], show_name: str = "Music Bank") -> io.BytesIO:
-    """Creates a K-pop award show style scoreboard image using Pillow."""
-    
-    bg_color = (25, 16, 35)
-    header_color = (142, 77, 187)
-    row_color_1 = (46, 31, 60)
-    row_color_2 = (35, 22, 48)
-    text_color = (245, 241, 250)
-    gold_color = (255, 215, 0)
-    pink_accent = (255, 105, 180)
-    
-    width = 900
-    header_height = 60
-    row_height = 45
-    num_rows = min(len(albums_scores), 10)
-    footer_height = 40
-    height = header_height + (row_height * (num_rows + 1)) + footer_height + 20
-    
-    img = Image.new('RGB', (width, height), bg_color)
-    draw = ImageDraw.Draw(img)
-    
-    try:
-        font_bold = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 16)
-        font_regular = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 14)
-        font_small = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 11)
-        font_title = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 22)
-    except:
-        font_bold = ImageFont.load_default()
-        font_regular = ImageFont.load_default()
-        font_small = ImageFont.load_default()
-        font_title = ImageFont.load_default()
-    
-    draw.rectangle([(0, 0), (width, header_height)], fill=header_color)
-    title = f"{show_name.upper()} PREDICTION"
-    title_width = len(title) * 10
-    draw.text((width // 2 - title_width // 2, 18), title, fill=text_color, font=font_title)
-    
-    y = header_height + 5
-    col_positions = [15, 60, 220, 370, 450, 540, 630, 720, 810]
-    headers = ["#", "ARTIST", "SONG", "TOTAL", "DIG", "PHY", "SNS", "BRD", ""]
-    
-    draw.rectangle([(0, y), (width, y + row_height)], fill=header_color)
-    for i, header in enumerate(headers):
-        draw.text((col_positions[i], y + 12), header, fill=text_color, font=font_bold)
-    
-    y += row_height
-    
-    winner_idx = 0
-    max_total = 0
-    for i, album in enumerate(albums_scores[:10]):
-        if album['total'] > max_total:
-            max_total = album['total']
-            winner_idx = i
-    
-    for i, album in enumerate(albums_scores[:10]):
-        row_color = row_color_1 if i % 2 == 0 else row_color_2
-        draw.rectangle([(0, y), (width, y + row_height)], fill=row_color)
-        
-        rank_text = f"#{i + 1}"
-        draw.text((col_positions[0], y + 12), rank_text, fill=gold_color if i == 0 else text_color, font=font_bold)
-        
-        artist = album['group'][:15]
-        draw.text((col_positions[1], y + 12), artist, fill=pink_accent, font=font_bold)
-        
-        song = album['album'][:12]
-        draw.text((col_positions[2], y + 12), song, fill=text_color, font=font_regular)
-        
-        total_color = gold_color if i == winner_idx else text_color
-        draw.text((col_positions[3], y + 12), str(album['total']), fill=total_color, font=font_bold)
-        
-        draw.text((col_positions[4], y + 12), str(album['digital']), fill=text_color, font=font_regular)
-        draw.text((col_positions[5], y + 12), str(album['physical']), fill=text_color, font=font_regular)
-        draw.text((col_positions[6], y + 12), str(album['sns']), fill=text_color, font=font_regular)
-        draw.text((col_positions[7], y + 12), str(album['broadcast']), fill=text_color, font=font_regular)
-        
-        if i == winner_idx:
-            draw.text((col_positions[8], y + 12), "WIN", fill=gold_color, font=font_bold)
-        
-        y += row_height
-    
-    y += 10
-    disclaimer = "Auto Prediction — Not official"
-    draw.text((width // 2 - 80, y), disclaimer, fill=(150, 140, 160), font=font_small)
-    
-    buffer = io.BytesIO()
-    img.save(buffer, format='PNG')
-    buffer.seek(0)
-    return buffer
-
-
 @bot.tree.command(description="Generate a K-pop award show prediction scoreboard image!")
 @app_commands.describe(show="The music show to predict for")
 @app_commands.autocomplete(show=music_show_autocomplete)
@@ -8991,69 +9230,69 @@ async def predict(interaction: discord.Interaction, show: str = "Music Bank"):
     
     active_albums.sort(key=lambda x: x['total'], reverse=True)
     
-    scoreboard_image = create_predict_scoreboard(active_albums, show)
+    with command_metrics.track("render"):
+        scoreboard_image = await render_service.render(graphics.create_predict_scoreboard, active_albums, show)
     
-    file = discord.File(scoreboard_image, filename="prediction.png")
+    filename = f"prediction.{graphics.image_extension(scoreboard_image)}"
+    file = discord.File(scoreboard_image, filename=filename)
     
     embed = discord.Embed(
         title=f"{show} Prediction",
         description="Based on current streams, sales, views, and promotion status",
         color=discord.Color.from_rgb(142, 77, 187)
     )
-    embed.set_image(url="attachment://prediction.png")
+    embed.set_image(url=f"attachment://{filename}")
     embed.set_footer(text="Auto Prediction — Not official results")
     
     await interaction.followup.send(embed=embed, file=file)
 
 
-@bot.tree.command(description="View Global Top Songs chart for a song.")
-@app_commands.describe(song_name="The song to check global charts for")
-@app_commands.autocomplete(song_name=song_autocomplete)
-async def globalchart(interaction: discord.Interaction, song_name: str):
-    found_song = None
-    found_album = None
-    found_group = None
-    
-    for album_name, album_entry in album_data.items():
-        songs = album_entry.get('songs', {})
-        for sname in songs:
-            if sname.lower() == song_name.lower():
-                found_song = sname
-                found_album = album_name
-                found_group = album_entry.get('group', 'Unknown')
-                break
-        if found_song:
-            break
-    
-    if not found_song:
-        await interaction.response.send_message(f"Song `{song_name}` not found.", ephemeral=True)
-        return
-    
-    song_data = album_data[found_album]['songs'][found_song]
-    total_streams = song_data.get('streams', 0)
-    
-    song_data.setdefault('global_chart', {})
-    
-    report_lines = [f'**"{found_song}"** on Global Top Songs:\n']
-    
+# Global Top Songs (see global_chart.py): one pass per game day ranks every
+# song in every market, and /globalchart only reads the result.
+global_top_songs = global_chart.GlobalChart(
+    os.getenv("GLOBAL_CHART_FILE", "global_chart.json"), GLOBAL_CHART_COUNTRIES)
+global_top_songs.load()
+
+# (album, song) -> the /globalchart text for the current pass, or None if the
+# song isn't charting anywhere. Cleared by every pass.
+_global_chart_reports = {}
+
+
+def run_global_chart_pass(day: str):
+    songs = (
+        (chart_history.song_key(album_name, song_name), song_data.get('streams', 0))
+        for album_name, album_entry in album_data.items()
+        if isinstance(album_entry.get('songs'), dict)
+        for song_name, song_data in album_entry['songs'].items()
+        if isinstance(song_data, dict)
+    )
+    global_top_songs.run(day, songs, charts_rng)
+    global_top_songs.save()
+    _global_chart_reports.clear()
+
+
+def ensure_global_chart_current():
+    """Run today's pass if it hasn't happened yet (e.g. after a restart)."""
+    today = get_today_str()
+    if global_top_songs.day != today:
+        run_global_chart_pass(today)
+
+
+@clock.on("day")
+async def global_chart_daily(keys):
+    run_global_chart_pass(keys.day)
+
+
+def _global_chart_report(found_album: str, found_song: str, found_group: str):
+    """The /globalchart text for one song from the last pass, or None if it isn't charting."""
+    positions = global_top_songs.positions(chart_history.song_key(found_album, found_song))
+
     charted_countries = []
     for emoji, country, weight in GLOBAL_CHART_COUNTRIES:
-        threshold = int(500000 / weight)
-        
-        if total_streams < threshold:
+        entry = positions.get(global_chart.country_key(country))
+        if not entry:
             continue
-        
-        chart_key = country.replace(" ", "_").lower()
-        prev_rank = song_data['global_chart'].get(chart_key, {}).get('rank')
-        prev_peak = song_data['global_chart'].get(chart_key, {}).get('peak')
-        
-        base_rank = max(1, int(200 - (total_streams / threshold) * 50))
-        variance = random.randint(-5, 5)
-        rank = max(1, min(200, base_rank + variance))
-        
-        peak = min(rank, prev_peak) if prev_peak else rank
-        
-        song_data['global_chart'][chart_key] = {'rank': rank, 'peak': peak}
+        rank, peak, prev_rank, new_peak = entry
         
         if prev_rank:
             diff = prev_rank - rank
@@ -9066,13 +9305,12 @@ async def globalchart(interaction: discord.Interaction, song_name: str):
         else:
             change = "(NEW)"
         
-        peak_note = " *new peak*" if rank == peak and prev_peak and rank < prev_peak else ""
+        peak_note = " *new peak*" if new_peak else ""
         
         charted_countries.append((rank, f"{emoji} #{rank}. {country} {change}{peak_note}"))
     
     if not charted_countries:
-        await interaction.response.send_message(f"'{found_song}' hasn't charted globally yet. Keep streaming!", ephemeral=True)
-        return
+        return None
     
     charted_countries.sort(key=lambda x: x[0])
     
@@ -9083,67 +9321,67 @@ async def globalchart(interaction: discord.Interaction, song_name: str):
         
         num_mid_to_pick = min(4, len(mid_countries))
         if mid_countries and num_mid_to_pick > 0:
-            selected_mid = random.sample(mid_countries, num_mid_to_pick)
+            selected_mid = charts_rng.sample(mid_countries, num_mid_to_pick)
             selected_mid.sort(key=lambda x: x[0])
         else:
             selected_mid = []
         
         charted_countries = top_2 + selected_mid + bottom_2
     
+    report_lines = [f'**"{found_song}"** on Global Top Songs:\n']
     for _, line in charted_countries:
         report_lines.append(line)
     
     report_lines.append(f"\n#{found_song.replace(' ', '')} #{found_group.replace(' ', '')}")
+    return "\n".join(report_lines)
+
+
+@bot.tree.command(description="View Global Top Songs chart for a song.")
+@app_commands.describe(song_name="The song to check global charts for")
+@app_commands.autocomplete(song_name=song_autocomplete)
+async def globalchart(interaction: discord.Interaction, song_name: str):
+    found_song = None
+    found_album = None
+    found_group = None
     
-    save_data()
-    await interaction.response.send_message("\n".join(report_lines))
+    for album_name, album_entry in album_data.items():
+        songs = album_entry.get('songs', {})
+        for sname in songs:
+            if sname.lower() == song_name.lower():
+                found_song = sname
+                found_album = album_name
+                found_group = album_entry.get('group', 'Unknown')
+                break
+        if found_song:
+            break
+    
+    if not found_song:
+        await interaction.response.send_message(f"Song `{song_name}` not found.", ephemeral=True)
+        return
+    
+    ensure_global_chart_current()
+    
+    # Built once per song per pass; the market sample shown stays the same all day.
+    cache_key = (found_album, found_song)
+    if cache_key not in _global_chart_reports:
+        _global_chart_reports[cache_key] = _global_chart_report(found_album, found_song, found_group)
+    report = _global_chart_reports[cache_key]
+    
+    if report is None:
+        await interaction.response.send_message(f"'{found_song}' hasn't charted globally yet. Keep streaming!", ephemeral=True)
+        return
+    
+    await interaction.response.send_message(report)
 
 
 @bot.tree.command(description="View the top 10 groups leaderboard for this week.")
 async def groupweekly(interaction: discord.Interaction):
-    current_week = get_current_week_key()
-    
-    group_scores = []
-    
-    for group_name, group_entry in group_data.items():
-        if group_entry.get('is_disbanded'):
-            continue
-        
-        group_albums = [a for a, ad in album_data.items() if ad.get('group') == group_name]
-        
-        weekly_streams = 0
-        weekly_sales = 0
-        weekly_views = 0
-        
-        for album_name in group_albums:
-            album_entry = album_data[album_name]
-            
-            album_weekly = album_entry.get('weekly_streams', {}).get(current_week, 0)
-            weekly_streams += album_weekly
-            
-            songs = album_entry.get('songs', {})
-            if isinstance(songs, dict):
-                for song_name, song_data in songs.items():
-                    song_weekly = song_data.get('weekly_streams', {}).get(current_week, 0)
-                    weekly_streams += song_weekly
-            
-            album_sales_weekly = album_entry.get('weekly_sales', {}).get(current_week, 0)
-            weekly_sales += album_sales_weekly
-            
-            album_views_weekly = album_entry.get('weekly_views', {}).get(current_week, 0)
-            weekly_views += album_views_weekly
-        
-        raw_score = (weekly_streams / 10000) + (weekly_sales * 2) + (weekly_views / 5000)
-        
-        group_scores.append({
-            'name': group_name,
-            'raw_score': raw_score,
-            'streams': weekly_streams,
-            'sales': weekly_sales,
-            'views': weekly_views
-        })
+    current_week = _current_weekly_boards()
     
-    group_scores.sort(key=lambda x: x['raw_score'], reverse=True)
+    group_scores = [
+        {'name': group_name, **weekly_group_tallies[group_name]}
+        for group_name, _ in weekly_score_board.top()
+    ]
     
     max_raw = group_scores[0]['raw_score'] if group_scores and group_scores[0]['raw_score'] > 0 else 1
     
@@ -9295,17 +9533,17 @@ async def random_event(interaction: discord.Interaction):
         await interaction.response.send_message("❌ No active groups to trigger events for.", ephemeral=True)
         return
     
-    group_name = random.choice(active_groups)
+    group_name = events_rng.choice(active_groups)
     group_entry = group_data[group_name]
     is_canonical = group_name.upper() in _CANONICAL_GROUPS
     
     if is_canonical:
-        is_good_event = random.random() > 0.15
+        is_good_event = events_rng.random() > 0.15
     else:
-        is_good_event = random.random() > 0.4
+        is_good_event = events_rng.random() > 0.4
     
     events_list = RANDOM_EVENTS_GOOD if is_good_event else RANDOM_EVENTS_BAD
-    event = random.choice(events_list).copy()
+    event = events_rng.choice(events_list).copy()
     
     other_group = None
     other_member = None
@@ -9316,7 +9554,7 @@ async def random_event(interaction: discord.Interaction):
         else:
             # fallback: pick a non-crossover event so formatting won't fail
             non_cross = [e for e in events_list if not e.get('requires_other_group')]
-            event = random.choice(non_cross).copy() if non_cross else event
+            event = events_rng.choice(non_cross).copy() if non_cross else event
 
     if not is_good_event and is_canonical:
         if 'popularity' in event:
@@ -9330,7 +9568,7 @@ async def random_event(interaction: discord.Interaction):
     
     description = event['description']
     if '{embarrassing_action}' in description:
-        action = random.choice(EMBARRASSING_LIVE_ACTIONS)
+        action = events_rng.choice(EMBARRASSING_LIVE_ACTIONS)
         description = description.replace('{embarrassing_action}', action)
     
     song_name = None
@@ -9358,56 +9596,50 @@ async def random_event(interaction: discord.Interaction):
         'is_good': is_good_event
     }
     
+    # Roll the whole outcome first, then apply it in one batch
+    outcome = []
     if 'popularity' in event:
-        change = random.randint(*event['popularity'])
-        group_entry['popularity'] = max(0, group_entry.get('popularity', 0) + change)
+        change = events_rng.randint(*event['popularity'])
+        outcome.append(stat_effects.Stat(group_name, 'popularity', change))
         event_record['popularity_change'] = change
     
     if 'gp' in event:
-        change = random.randint(*event['gp'])
-        group_entry['gp'] = max(0, min(100, group_entry.get('gp', 30) + change))
+        change = events_rng.randint(*event['gp'])
+        outcome.append(stat_effects.Stat(group_name, 'gp', change, high=100, default=30))
         event_record['gp_change'] = change
     
     if 'fanbase' in event:
-        change = random.randint(*event['fanbase'])
-        group_entry['fanbase'] = max(0, min(100, group_entry.get('fanbase', 50) + change))
+        change = events_rng.randint(*event['fanbase'])
+        outcome.append(stat_effects.Stat(group_name, 'fanbase', change, high=100, default=50))
         event_record['fanbase_change'] = change
     
     if 'views' in event:
-        change = random.randint(*event['views'])
-        group_entry['views'] = max(0, group_entry.get('views', 0) + change)
+        change = events_rng.randint(*event['views'])
+        outcome.append(stat_effects.Stat(group_name, 'views', change))
         event_record['views_change'] = change
     if 'streams' in event:
-        change = random.randint(*event['streams'])
-        group_entry['streams'] = max(0, group_entry.get('streams', 0) + change)
+        change = events_rng.randint(*event['streams'])
+        outcome.append(stat_effects.Stat(group_name, 'streams', change))
         event_record['streams_change'] = change
     if event.get('song_boost') and song_name and album_name_for_song:
-        stream_boost = random.randint(100000, 500000)
-        current_week = get_current_week_key()
-        songs = album_data[album_name_for_song].get('songs', {})
-        if song_name in songs:
-            add_song_streams(songs, song_name, stream_boost, current_week)
-        album_data[album_name_for_song]['streams'] = album_data[album_name_for_song].get('streams', 0) + stream_boost
-        album_data[album_name_for_song].setdefault('weekly_streams', {})
-        album_data[album_name_for_song]['weekly_streams'][current_week] = album_data[album_name_for_song]['weekly_streams'].get(current_week, 0) + stream_boost
+        stream_boost = events_rng.randint(100000, 500000)
+        outcome.append(stat_effects.SongStreams(group_name, album_name_for_song, song_name, stream_boost))
         event_record['song_boost'] = stream_boost
         event_record['boosted_song'] = song_name
     
-    if event.get('triggers_hate_train') and random.random() < event['triggers_hate_train']:
-        group_entry['active_hate_train'] = True
-        group_entry['has_scandal'] = True
+    if event.get('triggers_hate_train') and events_rng.random() < event['triggers_hate_train']:
+        outcome.append(stat_effects.SetField(group_name, 'active_hate_train', True))
+        outcome.append(stat_effects.SetField(group_name, 'has_scandal', True))
         event_record['triggered_hate_train'] = True
 
     if event.get('triggers_hate_train') or 'scandal' in event.get('type', '').lower():
-        rep_change = random.randint(-15, -5)
-        apply_reputation_change(group_name, rep_change, event['title'])
+        rep_change = events_rng.randint(-15, -5)
+        outcome.append(stat_effects.Reputation(group_name, rep_change, event['title']))
         event_record['reputation_change'] = rep_change
 
-    recent_events = group_entry.get('recent_events', [])
-    recent_events.append(event_record)
-    group_entry['recent_events'] = recent_events[-10:]
-    
-    random_events_log.setdefault(group_name, []).append(event_record)
+    group_effects.run(outcome, save=False)
+    history.record(group_entry, 'recent_events', event_record)
+    history.record(random_events_log, group_name, event_record, kind='random_events_log')
     
     last_random_timestamp = now.isoformat()
     save_data()
@@ -9496,11 +9728,12 @@ def get_demographic_multipliers(group_entry: dict) -> dict:
     }
 
 
-def distribute_stat_gain_to_members(group_name: str, stat_type: str, amount: int):
+def distribute_stat_gain_to_members(group_name: str, stat_type: str, amount: int, recalc: bool = True):
     """Distribute a stat gain among members randomly (some get more, some less).
     
     With the SUM model: the amount is distributed across members so that
-    group total increases by the full amount.
+    group total increases by the full amount. recalc=False skips re-summing
+    the group total, for callers that do it once for a batch.
     """
     if group_name not in group_data:
         return
@@ -9533,7 +9766,7 @@ def distribute_stat_gain_to_members(group_name: str, stat_type: str, amount: int
     
     shares = []
     for i in range(num_members):
-        variation = random.uniform(0.6, 1.4)
+        variation = members_rng.uniform(0.6, 1.4)
         share = int(base_share * variation)
         if i < remainder:
             share += 1
@@ -9548,7 +9781,7 @@ def distribute_stat_gain_to_members(group_name: str, stat_type: str, amount: int
         if stat_type == 'popularity':
             m['popularity'] = max(0, m.get('popularity', 50) + shares[i])
     
-    if stat_type == 'popularity':
+    if stat_type == 'popularity' and recalc:
         recalc_group_from_members(group_name)
 
 def redistribute_popularity_to_members(group_name: str, group_entry: dict, member_names: list):
@@ -9672,7 +9905,7 @@ class MemberView(ui.View):
         
         company_funds[company_name] -= training_cost
         
-        exp_gain = random.randint(15, 35)
+        exp_gain = members_rng.randint(15, 35)
         member['exp'] = member.get('exp', 0) + exp_gain
         
         old_level = member.get('level', 1)
@@ -9684,10 +9917,10 @@ class MemberView(ui.View):
             member['exp_to_next'] = int(member['exp_to_next'] * 1.5)
             level_up = True
             
-            skill_choice = random.choice(['vocal', 'dance', 'stage'])
+            skill_choice = members_rng.choice(['vocal', 'dance', 'stage'])
             skill = member['skills'][skill_choice]
             if skill['value'] < skill['cap']:
-                boost = random.randint(2, 5)  # Increased from 1-3
+                boost = members_rng.randint(2, 5)  # Increased from 1-3
                 skill['value'] = min(skill['cap'], skill['value'] + boost)
         
         # Apply meaningful level-up bonuses (popularity, GP, fanbase)
@@ -9957,7 +10190,7 @@ async def editmember(interaction: discord.Interaction, member: str, image_url: s
 # === ADMIN COMMANDS ===
 @bot.tree.command(description="Admin commands for game balancing (restricted)")
 @app_commands.describe(
-    category="Category: group, album, member, migrate",
+    category="Category: group, album, member, migrate, perf, lag, profile, audit",
     action="Action: set, add, transfer, redistribute_popularity",
     field="Field to modify (popularity, streams, sales, views, stock, weekly_streams, skill, fanbase)",
     target="Target name (group, album, or member|group format)",
@@ -10167,8 +10400,7 @@ async def admin(interaction: discord.Interaction, category: str, action: str, fi
             
             old_members.pop(member_index)
             
-            member_to_transfer.setdefault('history', [])
-            member_to_transfer['history'].append({
+            history.record(member_to_transfer, 'history', {
                 'group': old_group,
                 'start_date': None,
                 'end_date': datetime.now().isoformat(),
@@ -10399,6 +10631,7 @@ async def admin(interaction: discord.Interaction, category: str, action: str, fi
                     after_member_pops.append(m.get('popularity', 50))
             
             add_audit_log(admin_id, "migrate_redistribute_popularity", group_name, before_member_pops, after_member_pops)
+            save_data()
             
             member_list = []
             for m in group_data[group_name]['members']:
@@ -10413,8 +10646,153 @@ async def admin(interaction: discord.Interaction, category: str, action: str, fi
         else:
             await interaction.response.send_message("❌ Invalid migrate action. Use 'redistribute_popularity'.", ephemeral=True)
     
+    # PERF COMMANDS
+    elif category == "perf":
+        metrics = command_metrics.metrics
+        if action == "slowest":
+            try:
+                limit = max(1, min(int(value or 8), 8)) # keeps the reply under 2000 chars
+            except ValueError:
+                limit = 8
+            rows = metrics.slowest_commands(limit)
+            if not rows:
+                await interaction.response.send_message("No commands timed yet.", ephemeral=True)
+                return
+            lines = []
+            for name, summary in rows:
+                lines.append(
+                    f"`/{name}` ×{summary['count']} — p50 {summary['p50_ms']:,.0f}ms · "
+                    f"p95 {summary['p95_ms']:,.0f}ms · max {summary['max_ms']:,.0f}ms\n"
+                    f"   save {summary['save_ms_total']:,.0f}ms ({summary['saves']} saves, "
+                    f"{summary['bytes_written'] / 1_000_000:,.1f} MB) · render {summary['render_ms_total']:,.0f}ms · "
+                    f"http {summary['http_ms_total']:,.0f}ms"
+                )
+            worst = metrics.slowest_invocations(1)[0]
+            since = datetime.fromtimestamp(metrics.since, ARG_TZ).strftime('%Y-%m-%d %H:%M')
+            await interaction.response.send_message(
+                f"**Slowest commands by p95** (since {since})\n" + "\n".join(lines) +
+                f"\n\nWorst single run: `/{worst['command']}` {worst['wall_ms']:,.0f}ms "
+                f"(save {worst['save_ms']:,.0f} · render {worst['render_ms']:,.0f} · http {worst['http_ms']:,.0f})",
+                ephemeral=True
+            )
+        elif action == "export":
+            payload = json.dumps(metrics.export(), indent=2).encode('utf-8')
+            await interaction.response.send_message(
+                file=discord.File(io.BytesIO(payload), filename="command_metrics.json"),
+                ephemeral=True
+            )
+        elif action == "reset":
+            metrics.reset()
+            add_audit_log(admin_id, "perf_reset", "command_metrics", None, None)
+            await interaction.response.send_message("✅ Command timings reset.", ephemeral=True)
+        else:
+            await interaction.response.send_message("❌ Invalid perf action. Use 'slowest', 'export' or 'reset'.", ephemeral=True)
+
+    # LAG COMMANDS
+    elif category == "lag":
+        monitor = loop_monitor.monitor
+        if action == "status":
+            summary = monitor.summary()
+            state = "running" if summary['running'] else "not running"
+            await interaction.response.send_message(
+                f"**Event loop** ({state}, stall threshold {summary['threshold_ms']}ms)\n"
+                f"Lag over the last {summary['samples']:,} beats: p50 {summary['lag_p50_ms']:,.1f}ms · "
+                f"p99 {summary['lag_p99_ms']:,.1f}ms · worst {summary['lag_max_ms']:,.0f}ms\n"
+                f"Stalls recorded: {summary['stalls']:,}",
+                ephemeral=True
+            )
+        elif action == "stalls":
+            stalls = list(monitor.stalls)[-8:]
+            if not stalls:
+                await interaction.response.send_message("No stalls recorded. 🎉", ephemeral=True)
+                return
+            lines = []
+            for stall in reversed(stalls):
+                when = datetime.fromtimestamp(stall['at'], ARG_TZ).strftime('%m-%d %H:%M:%S')
+                command = f" during `/{stall['command']}`" if stall['command'] else ""
+                lines.append(f"`{when}` **{stall['duration_ms'] or 0:,.0f}ms**{command}\n   at `{stall['where']}`")
+            await interaction.response.send_message(
+                "**Recent loop stalls** (newest first, full stacks via `/admin lag export`)\n" + "\n".join(lines),
+                ephemeral=True
+            )
+        elif action == "export":
+            payload = json.dumps(monitor.export(), indent=2).encode('utf-8')
+            await interaction.response.send_message(
+                file=discord.File(io.BytesIO(payload), filename="loop_stalls.json"),
+                ephemeral=True
+            )
+        elif action == "reset":
+            monitor.reset()
+            add_audit_log(admin_id, "lag_reset", "loop_monitor", None, None)
+            await interaction.response.send_message("✅ Loop lag history cleared.", ephemeral=True)
+        else:
+            await interaction.response.send_message("❌ Invalid lag action. Use 'status', 'stalls', 'export' or 'reset'.", ephemeral=True)
+
+    # PROFILE COMMANDS
+    elif category == "profile":
+        if action not in ("top", "collapsed"):
+            await interaction.response.send_message("❌ Invalid profile action. Use 'top' or 'collapsed'.", ephemeral=True)
+            return
+        if sampling_profiler.running():
+            await interaction.response.send_message("❌ A profile is already running.", ephemeral=True)
+            return
+        try:
+            seconds = max(1, min(int(value or 30), sampling_profiler.MAX_SECONDS))
+        except ValueError:
+            await interaction.response.send_message("❌ Invalid value. Give the duration in seconds.", ephemeral=True)
+            return
+
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        # The sampler sleeps between samples on a worker thread, so the loop
+        # (and everyone's commands) keeps running while it watches.
+        try:
+            profile = await asyncio.to_thread(sampling_profiler.sample, seconds)
+        except RuntimeError as e:
+            await interaction.followup.send(f"❌ {e}", ephemeral=True)
+            return
+        add_audit_log(admin_id, f"profile_{action}", "process", None, seconds)
+
+        stamp = datetime.now(ARG_TZ).strftime('%Y%m%d-%H%M%S')
+        if action == "top":
+            report, filename = profile.top(), f"profile_top_{stamp}.txt"
+        else:
+            report, filename = profile.collapsed(), f"profile_{stamp}.collapsed"
+        await interaction.followup.send(
+            f"✅ Profiled {profile.seconds:.1f}s ({profile.samples:,} samples).",
+            file=discord.File(io.BytesIO(report.encode('utf-8')), filename=filename),
+            ephemeral=True
+        )
+
+    # AUDIT COMMANDS
+    elif category == "audit":
+        if action != "view":
+            await interaction.response.send_message("❌ Invalid audit action. Use 'view'.", ephemeral=True)
+            return
+        try:
+            page = max(1, int(value or 1))
+        except ValueError:
+            await interaction.response.send_message("❌ Invalid page number.", ephemeral=True)
+            return
+
+        entries, has_more = admin_audit.page(page, per_page=10)
+        if not entries:
+            await interaction.response.send_message(f"No audit entries on page {page}.", ephemeral=True)
+            return
+        lines = []
+        for entry in entries:
+            when = str(entry.get('timestamp', ''))[:16].replace('T', ' ')
+            lines.append(
+                f"`{when}` <@{entry.get('admin_id')}> **{entry.get('action')}** `{entry.get('target')}`: "
+                f"{entry.get('before')} → {entry.get('after')}"[:180]
+            )
+        footer = f"Page {page}" + (f" · next: `/admin audit view - - {page + 1}`" if has_more else " · end of log")
+        await interaction.response.send_message(
+            "**Admin audit log** (newest first)\n" + "\n".join(lines) + f"\n\n{footer}",
+            ephemeral=True
+        )
+
     else:
-        await interaction.response.send_message("❌ Invalid category. Use: group, album, member, migrate.", ephemeral=True)
+        await interaction.response.send_message("❌ Invalid category. Use: group, album, member, migrate, perf, lag, profile, audit.", ephemeral=True)
 
 
 @bot.tree.command(description="Admin command usage examples and documentation")
@@ -10487,6 +10865,55 @@ async def helpadmin(interaction: discord.Interaction):
         inline=False
     )
     
+    embed.add_field(
+        name="PERF Commands",
+        value=(
+            "**Slowest commands (p95, with save/render/http split):**\n"
+            "`/admin perf slowest - - 8`\n\n"
+            "**Download every command's timings as JSON:**\n"
+            "`/admin perf export`\n\n"
+            "**Start counting again:**\n"
+            "`/admin perf reset`"
+        ),
+        inline=False
+    )
+    
+    embed.add_field(
+        name="LAG Commands",
+        value=(
+            "**Event loop lag and stall count:**\n"
+            "`/admin lag status`\n\n"
+            "**Recent stalls, with the blocking line and command:**\n"
+            "`/admin lag stalls`\n\n"
+            "**Full stacks as JSON:**\n"
+            "`/admin lag export`"
+        ),
+        inline=False
+    )
+    
+    embed.add_field(
+        name="PROFILE Commands",
+        value=(
+            "**Top functions over the next 30 seconds:**\n"
+            "`/admin profile top - - 30`\n\n"
+            "**Collapsed stacks (flamegraph.pl / speedscope):**\n"
+            "`/admin profile collapsed - - 30`\n"
+            f"(Up to {sampling_profiler.MAX_SECONDS}s, one profile at a time)"
+        ),
+        inline=False
+    )
+    
+    embed.add_field(
+        name="AUDIT Commands",
+        value=(
+            "**Recent admin actions, newest first:**\n"
+            "`/admin audit view`\n\n"
+            "**Older pages:**\n"
+            "`/admin audit view - - 2`"
+        ),
+        inline=False
+    )
+    
     embed.set_footer(text="All admin actions are logged for auditing.")
     
     await interaction.response.send_message(embed=embed, ephemeral=True)
@@ -10656,53 +11083,174 @@ def calculate_show_board(show_key: str, album_names: list, live_votes: dict = No
     return results
 
 
-async def _refresh_discord_url(url: str) -> str:
-    """Discord CDN links expire after ~24h; ask Discord for a fresh one.
+# One pooled HTTP session for every outbound request the bot makes itself, so
+# art downloads reuse connections instead of paying DNS, TCP and TLS per URL.
+# Created on first use (it must be made inside the running loop) and closed
+# with the bot.
+HTTP_CONNECTIONS = int(os.getenv("HTTP_CONNECTIONS", "20"))
+_http_session = None
+
+
+def get_http_session() -> aiohttp.ClientSession:
+    global _http_session
+    if _http_session is None or _http_session.closed:
+        _http_session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=HTTP_CONNECTIONS, ttl_dns_cache=300),
+            timeout=aiohttp.ClientTimeout(total=15),
+        )
+    return _http_session
+
+
+async def close_http_session():
+    global _http_session
+    if _http_session is not None and not _http_session.closed:
+        await _http_session.close()
+    _http_session = None
+
+
+art_images = image_cache.ImageCache.from_env()
+
+# Show boards, profiles and scoreboards render in worker processes (see
+# render_pool.py). RENDER_WORKERS=0 keeps them in a thread in this process.
+render_service = render_pool.RenderService(
+    workers=int(os.getenv("RENDER_WORKERS", "2")),
+    warm=graphics.warm_worker,
+)
+
+
+async def _post_refresh_urls(cdn_urls: list) -> dict:
+    """One attachments/refresh-urls call: {cdn url: freshly signed url}."""
+    with command_metrics.track("http"):
+        async with get_http_session().post(
+            "https://discord.com/api/v10/attachments/refresh-urls",
+            headers={"Authorization": f"Bot {TOKEN}", "Content-Type": "application/json"},
+            json={"attachment_urls": cdn_urls},
+        ) as resp:
+            if resp.status != 200:
+                print(f"GRAPHICS: refresh-urls HTTP {resp.status}")
+                return {}
+            items = (await resp.json()).get("refreshed_urls", [])
+    return {
+        image_cache.canonical_url(item["original"]): item["refreshed"]
+        for item in items if item.get("original") and item.get("refreshed")
+    }
+
+
+discord_link_refresher = discord_links.LinkRefresher(_post_refresh_urls)
+
+
+async def _refresh_discord_urls(urls) -> dict:
+    """Discord CDN links expire after ~24h; get fresh ones for those that have.
 
     Stored image_url/banner values are Discord attachment links that go 404 once
     their signature expires, which is why generated images showed blank. This
-    swaps in a fresh signed URL using the bot token. Returns the original URL
-    unchanged if it isn't a Discord link or the refresh fails.
+    swaps in fresh signed URLs using the bot token, all in one request (see
+    discord_links.py). Returns {url: url to download}; anything that isn't a
+    Discord link, or can't be refreshed, maps to itself.
     """
-    if not url or ("discordapp.com" not in url and "discordapp.net" not in url):
+    return await discord_link_refresher.refresh(urls)
+
+
+async def _refresh_discord_url(url: str) -> str:
+    if not url:
         return url
-    # refresh-urls matches by the attachment path; normalise to cdn, drop query.
-    cdn_url = url.replace("media.discordapp.net", "cdn.discordapp.com").split("?")[0]
-    try:
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                "https://discord.com/api/v10/attachments/refresh-urls",
-                headers={"Authorization": f"Bot {TOKEN}", "Content-Type": "application/json"},
-                json={"attachment_urls": [cdn_url]},
-                timeout=aiohttp.ClientTimeout(total=15),
-            ) as resp:
-                if resp.status == 200:
-                    items = (await resp.json()).get("refreshed_urls", [])
-                    if items and items[0].get("refreshed"):
-                        return items[0]["refreshed"]
-                else:
-                    print(f"GRAPHICS: refresh-urls HTTP {resp.status}")
-    except Exception as e:
-        print(f"GRAPHICS: refresh-urls failed: {e}")
-    return url
+    return (await _refresh_discord_urls([url]))[url]
 
 
 async def _fetch_show_art(url: str):
-    """Best-effort download of era art. Returns None on any failure."""
+    """Best-effort download of era art. Returns None on any failure.
+
+    Served from art_images when it can be, which also skips the Discord link
+    refresh; a cached 404 returns None without asking again.
+    """
     if not url:
         return None
+    key = image_cache.canonical_url(url)
+    found, data = await asyncio.to_thread(art_images.get, key)
+    if found:
+        return data
+
     url = await _refresh_discord_url(url)  # revive expired Discord CDN links
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, timeout=aiohttp.ClientTimeout(total=15)) as response:
+        with command_metrics.track("http"):
+            async with get_http_session().get(url) as response:
                 if response.status == 200:
-                    return await response.read()
+                    data = await response.read()
+                    await asyncio.to_thread(art_images.put, key, data)
+                    return data
                 print(f"GRAPHICS: fetch {url[:80]} -> HTTP {response.status}")
+                if response.status in (404, 410):
+                    art_images.put_missing(key)
     except Exception as e:
         print(f"GRAPHICS: failed to fetch {url}: {e}")
     return None
 
 
+# Art for one command is fetched side by side rather than one URL at a time.
+# ART_FETCH_CONCURRENCY caps downloads in flight across all commands, and a
+# batch gives up waiting after ART_FETCH_SECONDS, rendering with whatever
+# arrived (missing art falls back like any failed download). Identical URLs,
+# within a batch or across commands running at once, share one download.
+ART_FETCH_CONCURRENCY = int(os.getenv("ART_FETCH_CONCURRENCY", "6"))
+ART_FETCH_SECONDS = float(os.getenv("ART_FETCH_SECONDS", "10"))
+_art_fetch_slots = asyncio.Semaphore(ART_FETCH_CONCURRENCY)
+_art_in_flight = {}  # canonical URL -> Task
+
+
+async def _fetch_art_slot(url: str):
+    async with _art_fetch_slots:
+        return await _fetch_show_art(url)
+
+
+def _art_task(url: str) -> asyncio.Task:
+    key = image_cache.canonical_url(url)
+    task = _art_in_flight.get(key)
+    if task is None:
+        task = asyncio.create_task(_fetch_art_slot(url))
+        _art_in_flight[key] = task
+        task.add_done_callback(lambda _: _art_in_flight.pop(key, None))
+    return task
+
+
+async def fetch_art_batch(urls, deadline: float = None) -> dict:
+    """{url: bytes or None} for every non-empty url, fetched concurrently.
+
+    deadline is a loop.time() to stop waiting at (default: ART_FETCH_SECONDS
+    from now). URLs still downloading then come back as None; their downloads
+    carry on in the background and land in art_images for next time.
+    """
+    loop = asyncio.get_running_loop()
+    if deadline is None:
+        deadline = loop.time() + ART_FETCH_SECONDS
+    urls = list(dict.fromkeys(u for u in urls if u))
+    if not urls:
+        return {}
+
+    # Refresh every expired Discord link the downloads will need in one
+    # request up front; each download then finds its link already fresh.
+    uncached = await asyncio.to_thread(
+        lambda: [u for u in urls if not art_images.get(image_cache.canonical_url(u))[0]]
+    )
+    if uncached:
+        try:
+            await asyncio.wait_for(_refresh_discord_urls(uncached), max(0.0, deadline - loop.time()))
+        except asyncio.TimeoutError:
+            pass
+
+    tasks = {url: _art_task(url) for url in urls}
+    _, pending = await asyncio.wait(set(tasks.values()), timeout=max(0.0, deadline - loop.time()))
+    if pending:
+        print(f"GRAPHICS: {len(pending)} of {len(tasks)} art downloads missed the deadline")
+
+    results = {}
+    for url, task in tasks.items():
+        if task.done() and not task.cancelled() and task.exception() is None:
+            results[url] = task.result()
+        else:
+            results[url] = None
+    return results
+
+
 def _local_era_file(group_name: str, album_name: str = None):
     """An era image file named after the album, or failing that the group."""
     normalise = lambda n: ''.join(c for c in n.lower() if c.isalnum())
@@ -10720,7 +11268,7 @@ def _local_era_file(group_name: str, album_name: str = None):
     return None
 
 
-async def get_era_art(group_name: str, album_name: str):
+async def get_era_art(group_name: str, album_name: str, deadline: float = None):
     """Era art for a nominee, falling back until something works.
 
     Older albums predate era images entirely, so this walks a chain rather than
@@ -10731,28 +11279,36 @@ async def get_era_art(group_name: str, album_name: str):
       4. the group's profile picture, then its banner
     If all of them are missing the slot is simply left empty and the template's
     own artwork shows through.
+
+    The remote links are all fetched at once (see fetch_art_batch) and the
+    first one in chain order that worked wins, so a dead era link costs one
+    round-trip instead of one per step.
     """
     album_entry = album_data.get(album_name, {})
     group_entry = group_data.get(group_name, {})
 
-    art = await _fetch_show_art(album_entry.get('era_image_url'))
-    if art:
-        return art
-
+    era_url = album_entry.get('era_image_url')
+    fallbacks = [album_entry.get('image_url'),
+                 group_entry.get('profile_picture'),
+                 group_entry.get('banner_url')]
     local = _local_era_file(group_name, album_name)
+    # A local file beats every fallback, so only the era link is worth asking for.
+    fetched = await fetch_art_batch([era_url] if local else [era_url] + fallbacks, deadline)
+
+    if fetched.get(era_url):
+        return fetched[era_url]
+
     if local:
         try:
             with open(local, 'rb') as f:
                 return f.read()
         except OSError as e:
             print(f"GRAPHICS: could not read {local}: {e}")
+        fetched = await fetch_art_batch(fallbacks, deadline)
 
-    for fallback in (album_entry.get('image_url'),
-                     group_entry.get('profile_picture'),
-                     group_entry.get('banner_url')):
-        art = await _fetch_show_art(fallback)
-        if art:
-            return art
+    for fallback in fallbacks:
+        if fetched.get(fallback):
+            return fetched[fallback]
 
     print(f"GRAPHICS: no era art available for {group_name} - {album_name}")
     return None
@@ -10923,18 +11479,21 @@ async def musicshow(
     # --- Board image ---
     file = None
     try:
+        # Every nominee's art at once, under one deadline.
+        deadline = asyncio.get_running_loop().time() + ART_FETCH_SECONDS
+        arts = await asyncio.gather(*(get_era_art(r['group'], r['album'], deadline) for r in results))
         if show_key == 'mcountdown':
             left, right = results[0], results[1]
-            left_art = await get_era_art(left['group'], left['album'])
-            right_art = await get_era_art(right['group'], right['album'])
-            buffer = await asyncio.to_thread(
-                graphics.render_mcountdown,
-                {'group': left['group'], 'song': left['album'],
-                 'scores': left['breakdown'], 'total': left['total']},
-                {'group': right['group'], 'song': right['album'],
-                 'scores': right['breakdown'], 'total': right['total']},
-                left_art, right_art,
-            )
+            left_art, right_art = arts[0], arts[1]
+            with command_metrics.track("render"):
+                buffer = await render_service.render(
+                    graphics.render_mcountdown,
+                    {'group': left['group'], 'song': left['album'],
+                     'scores': left['breakdown'], 'total': left['total']},
+                    {'group': right['group'], 'song': right['album'],
+                     'scores': right['breakdown'], 'total': right['total']},
+                    left_art, right_art,
+                )
         else:
             panel_data, images = [], {}
             for index, result in enumerate(results):
@@ -10949,18 +11508,18 @@ async def musicshow(
                     panel[row_name] = f"{sum(result['breakdown'].get(c, 0) for c in categories):,}"
                 panel_data.append(panel)
 
-                art = await get_era_art(result['group'], result['album'])
-                if art:
-                    images[(index, 'era_image')] = art
+                if arts[index]:
+                    images[(index, 'era_image')] = arts[index]
 
-            buffer = await asyncio.to_thread(
-                graphics.render_template,
-                show_config['template'],
-                panel_data,
-                images,
-                {(winner_index, 'score_total'): graphics.WINNER_GOLD},
-            )
-        file = discord.File(buffer, filename=f"{show_key}_results.png")
+            with command_metrics.track("render"):
+                buffer = await render_service.render(
+                    graphics.render_template,
+                    show_config['template'],
+                    panel_data,
+                    images,
+                    {(winner_index, 'score_total'): graphics.WINNER_GOLD},
+                )
+        file = discord.File(buffer, filename=f"{show_key}_results.{graphics.image_extension(buffer)}")
     except Exception as e:
         print(f"GRAPHICS: {show_key} render failed:")
         traceback.print_exception(type(e), e, e.__traceback__)
@@ -11102,183 +11661,14 @@ async def showlayout(interaction: discord.Interaction, show: app_commands.Choice
     await interaction.followup.send(
         "Red boxes are image slots, magenta crosshairs are text anchors.\n"
         "Tell me which are off and by how much and I'll adjust `graphics.py`.",
-        file=discord.File(buffer, filename=f"{template}_layout.png"),
+        file=discord.File(buffer, filename=f"{template}_layout.{graphics.image_extension(buffer)}"),
         ephemeral=True,
     )
 
 
 # === SPOTIFY PROFILE ===
-# A shareable, Spotify-style artist profile image, drawn from scratch so it
-# adapts to any number of tracks/releases. Reuses the bot's PIL setup.
-
-def _spotify_font(size, bold=False):
-    latin = "DejaVuSans-Bold.ttf" if bold else "DejaVuSans.ttf"
-    for path in (f"/usr/share/fonts/truetype/dejavu/{latin}",
-                 f"C:/Windows/Fonts/{'arialbd.ttf' if bold else 'arial.ttf'}"):
-        try:
-            return ImageFont.truetype(path, size)
-        except OSError:
-            continue
-    return ImageFont.load_default()
-
-
-def _spotify_cjk_font(size):
-    """A font that can render Hangul. Ships one in the repo so it works on any
-    host; falls back to system CJK fonts if present."""
-    here = os.path.dirname(os.path.abspath(__file__))
-    for path in (os.path.join(here, "assets", "fonts", "NanumGothic-Regular.ttf"),
-                 "/usr/share/fonts/truetype/nanum/NanumGothic.ttf",
-                 "/usr/share/fonts/opentype/noto/NotoSansCJK-Regular.ttc",
-                 "/usr/share/fonts/truetype/noto/NotoSansCJK-Regular.ttc",
-                 "C:/Windows/Fonts/malgun.ttf"):
-        try:
-            return ImageFont.truetype(path, size)
-        except OSError:
-            continue
-    return None
-
-
-def _spotify_square(img_bytes, size):
-    """Center-cropped square cover of `size`px, or a neutral placeholder."""
-    try:
-        im = Image.open(io.BytesIO(img_bytes)).convert("RGB")
-        w, h = im.size
-        s = min(w, h)
-        im = im.crop(((w - s) // 2, (h - s) // 2, (w - s) // 2 + s, (h - s) // 2 + s))
-        return im.resize((size, size), Image.LANCZOS)
-    except Exception:
-        return Image.new("RGB", (size, size), (40, 40, 48))
-
-
-def _spotify_truncate(draw, text, font, max_w):
-    if draw.textlength(text, font=font) <= max_w:
-        return text
-    while text and draw.textlength(text + "…", font=font) > max_w:
-        text = text[:-1]
-    return text.rstrip() + "…"
-
-
-def create_spotify_profile(profile: dict) -> io.BytesIO:
-    """Render a Spotify-style profile PNG. See /spotify for the data shape."""
-    W = 900
-    BG = (18, 18, 20)
-    GREEN = (30, 215, 96)
-    WHITE = (255, 255, 255)
-    GREY = (179, 179, 179)
-
-    header_h = 360
-    content_top = header_h + 34
-    tracks = profile["tracks"]
-    releases = profile["releases"]
-
-    f_name = _spotify_font(60, bold=True)
-    f_section = _spotify_font(24, bold=True)
-    f_track = _spotify_font(18)
-    f_small = _spotify_font(15)
-    f_tiny = _spotify_font(13)
-    f_rank = _spotify_font(16)
-    # CJK-capable fonts, used per-string only when a name actually has Hangul,
-    # so Latin text keeps the nicer DejaVu look.
-    cjk_track = _spotify_cjk_font(18)
-    cjk_small = _spotify_cjk_font(15)
-
-    def _pick(text, latin_font, cjk_font):
-        has_hangul = any('가' <= c <= '힣' or '㄰' <= c <= '㆏' for c in text)
-        return cjk_font if (has_hangul and cjk_font) else latin_font
-
-    import textwrap
-    # --- measure so the canvas is exactly tall enough ---
-    left_h = 40 + len(tracks) * 58
-    rel_rows = (len(releases) + 1) // 2
-    right_h = 40 + rel_rows * (150 + 48)
-    about = (profile.get("description") or "").strip()
-    # Bios sometimes use markdown (**bold**, *italic*, etc.) which can't render as
-    # styling in an image — strip the markers so they don't show literally.
-    about = _re.sub(r'(\*\*|\*|__|~~|`)', '', about)
-    about_wrapped = textwrap.wrap(about, width=95)[:6] if about else []
-    about_h = (30 + len(about_wrapped) * 24 + 20) if about_wrapped else 0
-    height = content_top + max(left_h, right_h) + about_h + 30
-
-    img = Image.new("RGB", (W, height), BG)
-    draw = ImageDraw.Draw(img)
-
-    # --- header image + fade into the page ---
-    if profile.get("header"):
-        try:
-            hdr = Image.open(io.BytesIO(profile["header"])).convert("RGB")
-            w, h = hdr.size
-            scale = max(W / w, header_h / h)
-            hdr = hdr.resize((int(w * scale), int(h * scale)), Image.LANCZOS)
-            left = (hdr.width - W) // 2
-            img.paste(hdr.crop((left, 0, left + W, header_h)), (0, 0))
-        except Exception:
-            draw.rectangle([0, 0, W, header_h], fill=(60, 40, 75))
-    else:
-        draw.rectangle([0, 0, W, header_h], fill=(60, 40, 75))
-
-    fade = Image.new("RGBA", (W, header_h), (0, 0, 0, 0))
-    fd = ImageDraw.Draw(fade)
-    for y in range(header_h):
-        alpha = int(255 * (y / header_h) ** 1.4)
-        fd.line([(0, y), (W, y)], fill=(BG[0], BG[1], BG[2], alpha))
-    img.paste(fade, (0, 0), fade)
-
-    # --- header text ---
-    x = 50
-    name = _spotify_truncate(draw, profile["name"], f_name, W - 100)
-    draw.text((x, header_h - 172), name, font=f_name, fill=WHITE)
-    # Verified badge sits under the name (where the korean name used to be).
-    draw.text((x, header_h - 92), "✓ Verified Artist", font=f_small, fill=GREEN)
-    listeners = f"{profile['monthly_listeners']:,} monthly listeners"
-    draw.text((x, header_h - 56), listeners, font=f_small, fill=WHITE)
-
-    # --- Top tracks (left column) ---
-    lx = 50
-    draw.text((lx, content_top), "Top tracks", font=f_section, fill=WHITE)
-    ty = content_top + 46
-    for i, t in enumerate(tracks, 1):
-        draw.text((lx, ty + 14), str(i), font=f_rank, fill=GREY)
-        cover = _spotify_square(t.get("cover"), 46)
-        img.paste(cover, (lx + 28, ty))
-        track_font = _pick(t["name"], f_track, cjk_track)
-        name = _spotify_truncate(draw, t["name"], track_font, 250)
-        draw.text((lx + 86, ty + 12), name, font=track_font, fill=WHITE)
-        plays = f"{t['plays']:,}"
-        draw.text((lx + 430, ty + 14), plays, font=f_small, fill=GREY, anchor="ra")
-        ty += 58
-
-    # --- Popular releases (right column, 2-wide grid) ---
-    rx = 520
-    draw.text((rx, content_top), "Popular releases", font=f_section, fill=WHITE)
-    gy = content_top + 46
-    for idx, r in enumerate(releases):
-        col = idx % 2
-        row = idx // 2
-        cx = rx + col * 168
-        cy = gy + row * (150 + 48)
-        img.paste(_spotify_square(r.get("cover"), 150), (cx, cy))
-        title_font = _pick(r["title"], f_small, cjk_small)
-        title = _spotify_truncate(draw, r["title"], title_font, 150)
-        draw.text((cx, cy + 156), title, font=title_font, fill=WHITE)
-        draw.text((cx, cy + 176), r.get("subtitle", ""), font=f_tiny, fill=GREY)
-
-    # --- About ---
-    # The description can contain Hangul (e.g. the korean name), so render it
-    # with the CJK font when available; DejaVu would show boxes.
-    f_about = _spotify_cjk_font(15) or f_small
-    if about_wrapped:
-        ay = content_top + max(left_h, right_h) + 10
-        draw.text((50, ay), "About", font=f_section, fill=WHITE)
-        ay += 34
-        for line in about_wrapped:
-            draw.text((50, ay), line, font=f_about, fill=GREY)
-            ay += 24
-
-    out = io.BytesIO()
-    img.save(out, format="PNG")
-    out.seek(0)
-    return out
-
+# A shareable, Spotify-style artist profile image; drawn by
+# graphics.create_spotify_profile.
 
 def _spotify_release_subtitle(album: dict) -> str:
     album_type = album.get("album_type") or album.get("type") or "Album"
@@ -11342,11 +11732,15 @@ async def spotify(interaction: discord.Interaction, group_name: str):
     )
 
     # Fetch all the images (best-effort; missing ones become placeholders).
-    header_bytes = await _fetch_show_art(header_url)
+    # Covers repeat across tracks, so this is usually a handful of downloads.
+    art = await fetch_art_batch(
+        [header_url] + [t["cover_url"] for t in top_tracks] + [r["cover_url"] for r in top_releases]
+    )
+    header_bytes = art.get(header_url)
     for t in top_tracks:
-        t["cover"] = await _fetch_show_art(t["cover_url"])
+        t["cover"] = art.get(t["cover_url"])
     for r in top_releases:
-        r["cover"] = await _fetch_show_art(r["cover_url"])
+        r["cover"] = art.get(r["cover_url"])
 
     profile = {
         "name": group_name_upper,
@@ -11359,15 +11753,19 @@ async def spotify(interaction: discord.Interaction, group_name: str):
     }
 
     try:
-        buffer = await asyncio.to_thread(create_spotify_profile, profile)
+        with command_metrics.track("render"):
+            buffer = await render_service.render(graphics.create_spotify_profile, profile)
     except Exception as e:
         print(f"GRAPHICS: spotify profile render failed: {e}")
         traceback.print_exception(type(e), e, e.__traceback__)
         await interaction.followup.send(f"❌ Could not render the profile: {e}", ephemeral=True)
         return
 
-    await interaction.followup.send(file=discord.File(buffer, filename=f"{group_name_upper}_spotify.png"))
+    filename = f"{group_name_upper}_spotify.{graphics.image_extension(buffer)}"
+    await interaction.followup.send(file=discord.File(buffer, filename=filename))
 
 
 # === RUN ===
-bot.run(TOKEN)
+# Guarded so tools like replay.py can import the handlers without logging in.
+if __name__ == "__main__":
+    bot.run(TOKEN)
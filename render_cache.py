@@ -0,0 +1,262 @@
+"""Content-addressed cache of rendered images.
+
+Show boards, /spotify profiles and /predict scoreboards were drawn from
+scratch on every request, even when nothing they show had changed since the
+last one. Each renderer is now wrapped so that its output is looked up by a
+hash of everything it is given first:
+
+    @OUTPUT_CACHE.memoize("predict")
+    def create_predict_scoreboard(albums_scores, show_name="Music Bank"): ...
+
+The key hashes the arguments by value. Image arguments (raw bytes or PIL
+images) go in as digests of their content. The renderer's own source file
+is hashed in too, so an edited layout never serves an old picture. Renderers
+return a fresh BytesIO either way, so callers can't tell a hit from a miss.
+
+Two tiers:
+  - memory: an LRU capped by total bytes (RENDER_CACHE_MB, default 64)
+  - disk:   optional, one file per image in RENDER_CACHE_DIR, capped at
+            RENDER_CACHE_DISK_MB (default 512); oldest files go first. It
+            survives restarts, which is most of its point.
+
+Anything that can't be hashed (an argument type the key doesn't know) is
+simply rendered uncached.
+"""
+
+import functools
+import hashlib
+import inspect
+import io
+import os
+import threading
+from collections import OrderedDict
+from datetime import date, datetime
+
+try:
+    from PIL import Image
+except ImportError:  # pragma: no cover
+    Image = None
+
+_MB = 1024 * 1024
+_SUFFIX = ".img"
+
+
+# --- Keys -------------------------------------------------------------------
+
+def _feed(h, value):
+    """Hash `value` into h, tagged by type so "1" and 1 differ."""
+    if value is None or isinstance(value, bool):
+        h.update(b"c" + repr(value).encode())
+    elif isinstance(value, (int, float)):
+        h.update(b"n" + repr(value).encode())
+    elif isinstance(value, str):
+        data = value.encode("utf-8")
+        h.update(b"s%d:" % len(data) + data)
+    elif isinstance(value, (bytes, bytearray, memoryview)):
+        h.update(b"b" + hashlib.sha256(value).digest())
+    elif isinstance(value, io.BytesIO):
+        h.update(b"b" + hashlib.sha256(value.getbuffer()).digest())
+    elif Image is not None and isinstance(value, Image.Image):
+        h.update(b"i" + f"{value.mode}{value.size}".encode() + hashlib.sha256(value.tobytes()).digest())
+    elif isinstance(value, (datetime, date)):
+        h.update(b"d" + value.isoformat().encode())
+    elif isinstance(value, (list, tuple)):
+        h.update(b"l%d[" % len(value))
+        for item in value:
+            _feed(h, item)
+        h.update(b"]")
+    elif isinstance(value, dict):
+        # Order-independent: hash each pair on its own, then the sorted digests.
+        pairs = []
+        for key, item in value.items():
+            pair = hashlib.sha256()
+            _feed(pair, key)
+            _feed(pair, item)
+            pairs.append(pair.digest())
+        h.update(b"m%d{" % len(pairs) + b"".join(sorted(pairs)) + b"}")
+    else:
+        raise TypeError(f"can't key a render on {type(value).__name__}")
+
+
+def make_key(*parts) -> str:
+    h = hashlib.sha256()
+    for part in parts:
+        _feed(h, part)
+    return h.hexdigest()
+
+
+def _source_digest(fn) -> str:
+    try:
+        with open(inspect.getsourcefile(fn), "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except (OSError, TypeError):
+        return ""
+
+
+# --- Cache ------------------------------------------------------------------
+
+class RenderCache:
+    def __init__(self, memory_bytes: int, disk_dir: str = None, disk_bytes: int = 0):
+        self.memory_bytes = memory_bytes
+        self.disk_dir = disk_dir or None
+        self.disk_bytes = disk_bytes
+        self._memory = OrderedDict()  # key -> PNG bytes, least recently used first
+        self._memory_total = 0
+        self._disk = OrderedDict()    # key -> file size, oldest first
+        self._disk_total = 0
+        self._lock = threading.Lock()  # Renders run in worker threads
+        self.enabled = True  # Render pool workers turn it off; the parent caches
+        self.hits = 0
+        self.misses = 0
+        if self.disk_dir:
+            self._scan_disk()
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            memory_bytes=int(float(os.getenv("RENDER_CACHE_MB", "64")) * _MB),
+            disk_dir=os.getenv("RENDER_CACHE_DIR"),
+            disk_bytes=int(float(os.getenv("RENDER_CACHE_DISK_MB", "512")) * _MB),
+        )
+
+    # --- Lookup -------------------------------------------------------------
+
+    def get(self, key: str):
+        with self._lock:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return data
+            data = self._read_disk(key)
+            if data is not None:
+                self._remember(key, data)
+                self.hits += 1
+                return data
+            self.misses += 1
+            return None
+
+    def put(self, key: str, data: bytes):
+        with self._lock:
+            self._remember(key, data)
+            self._write_disk(key, data)
+
+    def clear(self):
+        """Forget everything in memory (the disk tier is left alone)."""
+        with self._lock:
+            self._memory.clear()
+            self._memory_total = 0
+
+    def memoize(self, kind: str, salt=None):
+        """Decorator for a renderer returning a BytesIO.
+
+        salt: optional callable(*args, **kwargs) for inputs that aren't
+        arguments, such as the template file's version.
+
+        The wrapper also has .cache_key(*args, **kwargs) (None when the
+        arguments can't be keyed) and .render_cache, for callers such as
+        render_pool that look up and store outside the wrapper.
+        """
+        def wrap(render):
+            version = _source_digest(render)
+
+            def cache_key(*args, **kwargs):
+                if not self.enabled:
+                    return None
+                try:
+                    extra = salt(*args, **kwargs) if salt else None
+                    return make_key(kind, version, extra, args, kwargs)
+                except TypeError:
+                    return None
+
+            def cached_render(*args, **kwargs):
+                key = cache_key(*args, **kwargs)
+                if key is None:
+                    return render(*args, **kwargs)
+                data = self.get(key)
+                if data is None:
+                    data = render(*args, **kwargs).getvalue()
+                    self.put(key, data)
+                return io.BytesIO(data)
+
+            functools.update_wrapper(cached_render, render)
+            cached_render.cache_key = cache_key
+            cached_render.render_cache = self
+            return cached_render
+        return wrap
+
+    # --- Memory tier --------------------------------------------------------
+
+    def _remember(self, key, data):
+        if len(data) > self.memory_bytes:
+            return
+        old = self._memory.pop(key, None)
+        if old is not None:
+            self._memory_total -= len(old)
+        self._memory[key] = data
+        self._memory_total += len(data)
+        while self._memory_total > self.memory_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_total -= len(evicted)
+
+    # --- Disk tier ----------------------------------------------------------
+
+    def _path(self, key):
+        return os.path.join(self.disk_dir, key + _SUFFIX)
+
+    def _scan_disk(self):
+        try:
+            os.makedirs(self.disk_dir, exist_ok=True)
+            entries = []
+            for entry in os.scandir(self.disk_dir):
+                if entry.name.endswith(_SUFFIX) and entry.is_file():
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, entry.name[:-len(_SUFFIX)], stat.st_size))
+        except OSError as e:
+            print(f"Render cache: disk tier off, can't use {self.disk_dir}: {e}")
+            self.disk_dir = None
+            return
+        for _, key, size in sorted(entries):
+            self._disk[key] = size
+            self._disk_total += size
+        self._trim_disk()
+
+    def _read_disk(self, key):
+        if not self.disk_dir or key not in self._disk:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            os.utime(path)
+        except OSError:
+            self._disk_total -= self._disk.pop(key)
+            return None
+        self._disk.move_to_end(key)
+        return data
+
+    def _write_disk(self, key, data):
+        if not self.disk_dir or key in self._disk or len(data) > self.disk_bytes:
+            return
+        path = self._path(key)
+        temp_file = f"{path}.{os.getpid()}.tmp"  # Render workers share the directory
+        try:
+            with open(temp_file, "wb") as f:
+                f.write(data)
+            os.replace(temp_file, path)
+        except OSError as e:
+            # A cache write failing only costs a future render.
+            print(f"Render cache: could not write {path}: {e}")
+            return
+        self._disk[key] = len(data)
+        self._disk_total += len(data)
+        self._trim_disk()
+
+    def _trim_disk(self):
+        while self._disk_total > self.disk_bytes and self._disk:
+            key, size = self._disk.popitem(last=False)
+            self._disk_total -= size
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
@@ -0,0 +1,163 @@
+"""Renders in worker processes, so Pillow work doesn't queue on the GIL.
+
+Graphics used to go through asyncio.to_thread. Text layout and compositing
+hold the GIL for most of a render, so two /musicshow boards and a /spotify
+profile started together ran one after another, and the event loop got
+squeezed while they did. RenderService hands each render to a process pool
+instead:
+
+    render_service = RenderService(workers=2, warm=graphics.warm_worker)
+    render_service.start()                  # from inside the running loop
+    buffer = await render_service.render(graphics.render_template, name, panels, images)
+
+A job is the renderer's module and name plus its arguments (panel data,
+image bytes, plain dicts), and a worker sends back PNG bytes. Workers look
+the renderer up by name and run it directly, after `warm` has decoded the
+templates and loaded the fonts once per worker. Renderers wrapped by
+render_cache are checked against the output cache here, in the bot's process
+(keyed and looked up in a thread), before a job is sent, and the result is
+stored there afterwards.
+
+With workers=0 (RENDER_WORKERS=0), before start(), or if the pool breaks,
+renders run in a thread in this process as before, so a render is never
+lost to the pool.
+"""
+
+import asyncio
+import concurrent.futures
+import contextlib
+import importlib
+import io
+import multiprocessing
+import pickle
+import sys
+import time
+import traceback
+
+_warmed = False
+
+
+def _init_worker(warm):
+    global _warmed
+    if warm is not None:
+        try:
+            warm()
+        except Exception:
+            traceback.print_exc()
+    _warmed = True
+
+
+def _run_job(module_name, name, args, kwargs):
+    """Runs in a worker: look the renderer up by name, return PNG bytes."""
+    module = sys.modules.get(module_name) or importlib.import_module(module_name)
+    render = getattr(module, name)
+    render = getattr(render, "__wrapped__", render)  # The parent does the caching
+    return render(*args, **kwargs).getvalue()
+
+
+def _ready():
+    return _warmed
+
+
+def _importable(render):
+    """Whether a worker can find `render` by module and name, as _run_job does.
+
+    Renderers defined in the bot's own script (__main__) can't be: workers
+    never load it. Those run in-process.
+    """
+    module = sys.modules.get(render.__module__)
+    if module is None or render.__module__ in ("__main__", "__mp_main__"):
+        return False
+    return getattr(module, render.__name__, None) is render
+
+
+@contextlib.contextmanager
+def _main_hidden():
+    """Keep spawned children from re-running the parent's __main__.
+
+    spawn starts every child by re-running the parent's main script (for the
+    bot, all of main.py: its data loads, stores and client) so that pickled
+    references into it resolve. Workers only need graphics, so while they are
+    launched __main__ looks like an interactive session, which spawn skips.
+    """
+    main = sys.modules.get("__main__")
+    saved = {name: main.__dict__[name] for name in ("__file__", "__spec__") if name in vars(main)}
+    main.__spec__ = None
+    main.__dict__.pop("__file__", None)
+    try:
+        yield
+    finally:
+        main.__dict__.pop("__spec__", None)
+        main.__dict__.update(saved)
+
+
+def _cached(render, cache, args, kwargs):
+    """(cache key or None, cached bytes or None) for a memoized renderer."""
+    key = render.cache_key(*args, **kwargs)
+    return key, (cache.get(key) if key is not None else None)
+
+
+class RenderService:
+    def __init__(self, workers: int, warm=None):
+        """warm: top-level callable each worker runs once at startup."""
+        self.workers = max(0, workers)
+        self.warm = warm
+        self._pool = None
+
+    @property
+    def running(self):
+        return self._pool is not None
+
+    def start(self):
+        """Start the workers and have each warm up. Idempotent."""
+        if self._pool is not None or self.workers == 0:
+            return
+        # spawn, not fork: the bot has threads running (loop monitor, event
+        # loop helpers) and forking under them can leave locks held forever.
+        self._pool = concurrent.futures.ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self.warm,),
+        )
+        with _main_hidden():  # The workers are launched by the first submit
+            for _ in range(self.workers):
+                self._pool.submit(_ready)
+        print(f"Render pool: {self.workers} worker process(es) starting")
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    async def render(self, render, *args, **kwargs) -> io.BytesIO:
+        """Run a renderer returning a BytesIO; in a worker when the pool is up."""
+        cache = getattr(render, "render_cache", None)
+        key = None
+        if cache is not None:
+            # Keying hashes every image argument; keep that off the event loop.
+            key, data = await asyncio.to_thread(_cached, render, cache, args, kwargs)
+            if data is not None:
+                return io.BytesIO(data)
+
+        data = None
+        if self._pool is not None and _importable(render):
+            started = time.perf_counter()
+            try:
+                data = await asyncio.wrap_future(self._pool.submit(
+                    _run_job, render.__module__, render.__name__, args, kwargs))
+            except (concurrent.futures.BrokenExecutor, pickle.PicklingError) as e:
+                # A dead pool or a job it can't carry: render here instead,
+                # and stop sending jobs to a pool that has died. Errors from
+                # the renderer itself propagate, as with asyncio.to_thread.
+                print(f"Render pool: {render.__name__} fell back to in-process "
+                      f"after {time.perf_counter() - started:.2f}s: {e!r}")
+                if isinstance(e, concurrent.futures.BrokenExecutor):
+                    self.shutdown()
+        if data is None:
+            target = getattr(render, "__wrapped__", render)
+            data = (await asyncio.to_thread(target, *args, **kwargs)).getvalue()
+
+        if key is not None:
+            await asyncio.to_thread(cache.put, key, data)
+        return io.BytesIO(data)
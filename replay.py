@@ -0,0 +1,340 @@
+"""Headless replay of a recorded command trace (see command_trace.py).
+
+    python replay.py trace.jsonl --data data.json --seed 1 [--out result.json] [--json]
+
+Imports main.py without logging in, points it at a scratch copy of the data
+file, and calls each recorded command's handler directly with a stand-in
+Interaction. The source data file is never written. At the end it reports
+commands/sec, handler latency percentiles, and how many saves happened and how
+many bytes they wrote - the numbers persistence and indexing changes move.
+
+Replays are reproducible: --seed seeds every gameplay RNG stream (rng.py), and
+datetime.now() inside main.py and the game clock's day/week keys are pinned to
+each command's recorded timestamp.
+Run with PYTHONHASHSEED=0 as well and two replays of the same trace produce
+byte-identical data files.
+
+Differences from the live bot, all deliberate:
+  - Permission checks (is_admin) are skipped; the trace only contains commands
+    that were allowed when they were recorded.
+  - Buttons and selects are never pressed. Any view a handler sends is stopped
+    at once, so handlers waiting on one take their timeout path immediately.
+  - Art downloads are skipped unless --network is given, so render timings are
+    not dominated by someone else's CDN.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import inspect
+import io
+import json
+import math
+import os
+import shutil
+import sys
+import tempfile
+import time
+import typing
+from datetime import datetime as _real_datetime
+from types import SimpleNamespace
+
+import command_trace
+import rng
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list (0 when empty)."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+# --- Pinned clock ---------------------------------------------------------
+
+class _PinnedClockMeta(type):
+    # Real datetimes created elsewhere (timedelta arithmetic, json loads) must
+    # still pass main.py's isinstance(obj, datetime) checks.
+    def __instancecheck__(cls, obj):
+        return isinstance(obj, _real_datetime)
+
+
+class PinnedDatetime(_real_datetime, metaclass=_PinnedClockMeta):
+    """Stands in for main.datetime; now() returns the replayed command's time."""
+
+    timestamp_now = None
+
+    @classmethod
+    def now(cls, tz=None):
+        if cls.timestamp_now is None:
+            return _real_datetime.now(tz)
+        return _real_datetime.fromtimestamp(cls.timestamp_now, tz)
+
+
+# --- Stand-in Interaction -------------------------------------------------
+
+class FakeMessage:
+    def __init__(self, content=None, **kwargs):
+        self.id = 0
+        self.content = content
+        self.kwargs = kwargs
+
+    async def edit(self, **kwargs):
+        _release_view(kwargs.get("view"))
+        return self
+
+    async def delete(self, **kwargs):
+        return None
+
+
+def _release_view(view):
+    """Nobody will press anything during a replay, so time the view out now."""
+    if view is not None and hasattr(view, "stop"):
+        view.stop()
+
+
+class FakeResponse:
+    def __init__(self, interaction):
+        self._interaction = interaction
+        self._done = False
+
+    def is_done(self):
+        return self._done
+
+    async def send_message(self, content=None, **kwargs):
+        self._done = True
+        self._interaction.sent.append(content)
+        _release_view(kwargs.get("view"))
+
+    async def edit_message(self, **kwargs):
+        self._done = True
+        _release_view(kwargs.get("view"))
+
+    async def defer(self, **kwargs):
+        self._done = True
+
+    async def send_modal(self, modal):
+        self._done = True
+        _release_view(modal)
+
+
+class FakeFollowup:
+    def __init__(self, interaction):
+        self._interaction = interaction
+
+    async def send(self, content=None, **kwargs):
+        self._interaction.sent.append(content)
+        _release_view(kwargs.get("view"))
+        return FakeMessage(content, **kwargs)
+
+
+class FakeChannel:
+    id = 0
+
+    async def send(self, content=None, **kwargs):
+        _release_view(kwargs.get("view"))
+        return FakeMessage(content, **kwargs)
+
+
+class FakeInteraction:
+    """The parts of discord.Interaction the command handlers actually touch."""
+
+    def __init__(self, user_id, command, args):
+        self.user = SimpleNamespace(id=int(user_id), name=f"user{user_id}",
+                                    display_name=f"user{user_id}", mention=f"<@{user_id}>")
+        self.command = command
+        self.namespace = SimpleNamespace(**args)
+        self.data = {}
+        self.channel = FakeChannel()
+        self.channel_id = 0
+        self.guild = None
+        self.sent = []
+        self.response = FakeResponse(self)
+        self.followup = FakeFollowup(self)
+
+    async def edit_original_response(self, **kwargs):
+        _release_view(kwargs.get("view"))
+        return FakeMessage(**kwargs)
+
+    async def original_response(self):
+        return FakeMessage()
+
+
+# --- Replay ---------------------------------------------------------------
+
+def _find_command(tree, qualified_name):
+    parts = qualified_name.split()
+    command = tree.get_command(parts[0])
+    for part in parts[1:]:
+        command = command.get_command(part) if command and hasattr(command, "get_command") else None
+    return command
+
+
+def _build_kwargs(callback, args, choice_type):
+    """Map recorded option values onto the handler's parameters.
+
+    Choice-annotated parameters receive a Choice again, everything else the
+    raw value. Options the handler no longer takes are dropped.
+    """
+    parameters = inspect.signature(callback).parameters
+    kwargs = {}
+    for name, value in args.items():
+        parameter = parameters.get(name)
+        if parameter is None:
+            continue
+        if typing.get_origin(parameter.annotation) is choice_type and value is not None:
+            value = choice_type(name=str(value), value=value)
+        kwargs[name] = value
+    return kwargs
+
+
+class ReplayStats:
+    def __init__(self):
+        self.latencies = []
+        self.per_command = {}
+        self.errors = []
+        self.skipped = 0
+        self.saves = 0
+        self.bytes_written = 0
+        self.elapsed = 0.0
+
+    def report(self):
+        ordered = sorted(self.latencies)
+        replayed = len(ordered)
+        return {
+            "commands": replayed,
+            "errors": len(self.errors),
+            "skipped": self.skipped,
+            "elapsed_s": round(self.elapsed, 4),
+            "commands_per_s": round(replayed / self.elapsed, 2) if self.elapsed else 0.0,
+            "latency_ms": {
+                "p50": round(percentile(ordered, 50) * 1000, 3),
+                "p95": round(percentile(ordered, 95) * 1000, 3),
+                "p99": round(percentile(ordered, 99) * 1000, 3),
+                "max": round((ordered[-1] if ordered else 0) * 1000, 3),
+            },
+            "saves": self.saves,
+            "bytes_written": self.bytes_written,
+            "per_command": {
+                name: {"count": len(times), "p50_ms": round(percentile(sorted(times), 50) * 1000, 3)}
+                for name, times in sorted(self.per_command.items())
+            },
+        }
+
+
+async def replay(game, entries, stats, verbose=False):
+    from discord import app_commands
+
+    for entry in entries:
+        command = _find_command(game.bot.tree, entry["cmd"])
+        if command is None or not hasattr(command, "callback"):
+            stats.skipped += 1
+            continue
+
+        interaction = FakeInteraction(entry.get("user", 0), command, entry["args"])
+        try:
+            kwargs = _build_kwargs(command.callback, entry["args"], app_commands.Choice)
+        except Exception as e:
+            stats.errors.append((entry["cmd"], f"bad arguments: {e}"))
+            continue
+
+        PinnedDatetime.timestamp_now = entry.get("ts")
+        output = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO())
+        started = time.perf_counter()
+        try:
+            with output:
+                await command.callback(interaction, **kwargs)
+        except Exception as e:
+            stats.errors.append((entry["cmd"], f"{type(e).__name__}: {e}"))
+        finally:
+            took = time.perf_counter() - started
+            stats.latencies.append(took)
+            stats.per_command.setdefault(entry["cmd"], []).append(took)
+            stats.elapsed += took
+    PinnedDatetime.timestamp_now = None
+
+
+def load_game(data_path, scratch_dir, seed=None, network=False):
+    """Import main.py against a scratch copy of data_path, ready to replay."""
+    scratch = os.path.join(scratch_dir, "data.json")
+    if data_path and os.path.exists(data_path):
+        shutil.copyfile(data_path, scratch)
+
+    import main as game
+
+    game.DATA_FILE = scratch
+    game.admin_audit.reopen(os.path.join(scratch_dir, "admin_audit.jsonl"))
+    game.chart_log.reopen(os.path.join(scratch_dir, "chart_history.json"))
+    game.global_top_songs.reopen(os.path.join(scratch_dir, "global_chart.json"))
+    game.datetime = PinnedDatetime
+    game.clock.time_source = lambda: PinnedDatetime.timestamp_now or time.time()
+    rng.seed(seed)
+    if not network:
+        async def no_art(url):
+            return None
+
+        async def no_refresh(urls):
+            return {url: url for url in urls}
+        game._fetch_show_art = no_art
+        game._refresh_discord_urls = no_refresh
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        game.load_data()
+    return game
+
+
+def count_saves(game, stats):
+    """Wrap save_data so every save and the size it wrote are counted."""
+    original = game.save_data
+
+    def counted_save_data():
+        original()
+        stats.saves += 1
+        try:
+            stats.bytes_written += os.path.getsize(game.DATA_FILE)
+        except OSError:
+            pass
+
+    game.save_data = counted_save_data
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay a command trace against a copy of data.json.")
+    parser.add_argument("trace", help="trace file written with TRACE_FILE")
+    parser.add_argument("--data", default="data.json", help="state to replay against (never modified)")
+    parser.add_argument("--seed", default="0", help="RNG_SEED for the replay (default 0)")
+    parser.add_argument("--out", help="keep the resulting data file here")
+    parser.add_argument("--network", action="store_true", help="download era art instead of skipping it")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    parser.add_argument("--verbose", action="store_true", help="show the bot's own output")
+    options = parser.parse_args(argv)
+
+    entries = list(command_trace.read_trace(options.trace))
+    stats = ReplayStats()
+
+    with tempfile.TemporaryDirectory(prefix="mpop-replay-") as scratch_dir:
+        game = load_game(options.data, scratch_dir, seed=options.seed, network=options.network)
+        count_saves(game, stats)
+        asyncio.run(replay(game, entries, stats, verbose=options.verbose))
+        if options.out and os.path.exists(game.DATA_FILE):
+            shutil.copyfile(game.DATA_FILE, options.out)
+
+    report = stats.report()
+    if options.json:
+        print(json.dumps(report, indent=2))
+    else:
+        latency = report["latency_ms"]
+        print(f"Replayed {report['commands']} commands in {report['elapsed_s']:.2f}s "
+              f"({report['commands_per_s']:.1f} commands/s), "
+              f"{report['errors']} errors, {report['skipped']} skipped")
+        print(f"Handler latency: p50 {latency['p50']:.2f}ms  p95 {latency['p95']:.2f}ms  "
+              f"p99 {latency['p99']:.2f}ms  max {latency['max']:.2f}ms")
+        print(f"Saves: {report['saves']}, {report['bytes_written']:,} bytes written")
+    for command, error in stats.errors[:10]:
+        print(f"  /{command}: {error}", file=sys.stderr)
+    return 1 if stats.errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,133 @@
+"""Low-overhead sampling profiler for the live bot.
+
+    /admin profile top - - 30         # top functions over the next 30s
+    /admin profile collapsed - - 30   # collapsed stacks, for a flame graph
+
+Our hot paths depend on our data and our players' habits, so they are hard to
+reproduce locally. This profiles the real process instead: a background thread
+wakes every INTERVAL, reads every thread's current stack with
+sys._current_frames() and counts them. Nothing is installed into the
+interpreter (unlike cProfile's per-call hooks), so the bot runs at full speed
+while it is being watched and stops paying anything the moment it is done.
+
+Output formats:
+  - collapsed: one "thread;outer;...;inner count" line per distinct stack, the
+    input flamegraph.pl and speedscope.app both accept.
+  - top: functions ranked by self samples (where the time was spent) with
+    their total samples (time spent in them or anything they called), as a
+    share of all busy thread samples.
+
+Threads parked in a wait (the event loop in select() with nothing to do,
+idle to_thread workers, the loop monitor's watchdog between checks) are not
+counted: their stacks would otherwise top every report. The header says how
+many thread samples were skipped that way.
+
+Sampling sees Python frames only. Time inside C code (json.dump, Pillow) is
+charged to the Python line that called it, which is usually what you want.
+"""
+
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+INTERVAL = 0.005      # 200 samples/second
+MAX_SECONDS = 120
+MAX_DEPTH = 64
+
+_lock = threading.Lock()
+
+# Innermost frames that mean a thread is waiting, not working.
+_IDLE_FILES = ("threading.py", "selectors.py", "queue.py")
+_IDLE_WORKER = os.path.join("concurrent", "futures", "thread.py")  # Executor worker between jobs
+
+
+def _label(frame):
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def _idle(frame):
+    filename = frame.f_code.co_filename
+    if os.path.basename(filename) in _IDLE_FILES:
+        return True
+    return frame.f_code.co_name == "_worker" and filename.endswith(_IDLE_WORKER)
+
+
+class Profile:
+    """The result of one sampling run."""
+
+    def __init__(self, stacks: Counter, samples: int, seconds: float, idle: int = 0):
+        self.stacks = stacks      # (thread name, outer..inner labels) -> samples
+        self.samples = samples
+        self.seconds = seconds
+        self.idle = idle          # thread samples skipped as waiting
+
+    def collapsed(self):
+        lines = [f"{';'.join((thread,) + frames)} {count}"
+                 for (thread, frames), count in self.stacks.most_common()]
+        return "\n".join(lines) + "\n"
+
+    def top(self, limit=40):
+        own, total = Counter(), Counter()
+        for (_, frames), count in self.stacks.items():
+            if frames:
+                own[frames[-1]] += count
+            for label in set(frames):  # Recursion counts once per sample
+                total[label] += count
+
+        # Each tick samples every busy thread, so percentages are of the busy
+        # thread samples, not of ticks; they add up to 100% across threads.
+        busy = max(1, sum(self.stacks.values()))
+        lines = [
+            f"{self.samples:,} samples over {self.seconds:.1f}s "
+            f"(every {INTERVAL * 1000:.0f}ms, all threads; "
+            f"{busy:,} busy thread samples, {self.idle:,} idle skipped)",
+            "",
+            f"{'self%':>7} {'total%':>7}  function",
+        ]
+        for label, count in own.most_common(limit):
+            lines.append(f"{count / busy:>7.1%} {total[label] / busy:>7.1%}  {label}")
+        return "\n".join(lines) + "\n"
+
+
+def sample(seconds: float, interval: float = INTERVAL):
+    """Sample every other thread for `seconds` and return a Profile.
+
+    Blocking: run it in a worker thread (asyncio.to_thread), never on the loop,
+    or the loop thread will only ever be seen waiting on this function.
+    Only one profile runs at a time; a second call raises RuntimeError.
+    """
+    seconds = max(0.1, min(float(seconds), MAX_SECONDS))
+    if not _lock.acquire(blocking=False):
+        raise RuntimeError("A profile is already running.")
+    try:
+        me = threading.get_ident()
+        stacks = Counter()
+        samples = idle = 0
+        started = time.perf_counter()
+        deadline = started + seconds
+        while time.perf_counter() < deadline:
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == me:
+                    continue
+                if _idle(frame):
+                    idle += 1
+                    continue
+                frames = []
+                while frame is not None and len(frames) < MAX_DEPTH:
+                    frames.append(_label(frame))
+                    frame = frame.f_back
+                frames.reverse()
+                stacks[(names.get(thread_id, str(thread_id)), tuple(frames))] += 1
+            samples += 1
+            time.sleep(interval)
+        return Profile(stacks, samples, time.perf_counter() - started, idle)
+    finally:
+        _lock.release()
+
+
+def running():
+    return _lock.locked()
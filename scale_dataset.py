@@ -0,0 +1,308 @@
+"""Synthetic game states at configurable scale, for load and benchmark runs.
+
+    python scale_dataset.py --scale large --out scale_large.json
+    python scale_dataset.py --groups 5000 --albums 50000 --songs 500000 --users 20000
+
+The output is a normal data.json: load_data() reads it as-is, replay.py can run
+a trace against it, and bench.py uses it to find where save_data, the charts
+and autocomplete stop keeping up long before real players get there.
+
+The numbers are shaped like the live game rather than uniform noise:
+popularity is heavy-tailed (a few huge groups, a long nugu tail), streams
+follow popularity and album age, title tracks take the biggest share, and each
+song carries the same seven days of daily_streams and a few weekly buckets the
+bot itself keeps. A small share of groups have boycotts and a small share of
+albums are open for preorder, so those code paths see realistic data too.
+
+Generation is seeded, so the same arguments (including --today) always produce
+the same file.
+"""
+
+import argparse
+import json
+import random
+import sys
+from datetime import datetime, timedelta
+
+import history
+import main as game
+
+# (groups, albums, songs, users) for the named scales.
+SCALES = {
+    "current": (70, 180, 1_800, 30),
+    "medium": (500, 5_000, 50_000, 2_000),
+    "large": (5_000, 50_000, 500_000, 20_000),
+}
+
+CHART_PLATFORMS = ["MelOn", "Genie", "Bugs", "FLO"]
+DAILY_HISTORY_DAYS = 7   # add_song_streams keeps a week of daily buckets
+WEEKLY_HISTORY = 4
+
+_SYLLABLES = ["ka", "ri", "so", "mi", "na", "lu", "vi", "ze", "ro", "ha", "yu", "jin",
+              "sol", "bi", "da", "eun", "min", "seo", "ae", "on", "ix", "ly", "ra", "ne"]
+_WORDS = ["Love", "Night", "Dream", "Fire", "Star", "Blue", "Summer", "Heart", "Moon",
+          "Run", "Wild", "Sweet", "Shadow", "Bloom", "Echo", "Rush", "Glow", "Candy",
+          "Storm", "Angel", "Crush", "Magic", "Silver", "Ocean", "Neon", "Drive"]
+_KOREAN = ["하", "루", "별", "달", "빛", "꿈", "소", "리", "나", "라", "온", "새"]
+
+
+class _Names:
+    """Unique, readable names. Collisions get a numeric suffix."""
+
+    def __init__(self, rng):
+        self.rng = rng
+        self.used = set()
+
+    def _unique(self, base):
+        name, n = base, 2
+        while name in self.used:
+            name = f"{base} {n}"
+            n += 1
+        self.used.add(name)
+        return name
+
+    def group(self):
+        parts = self.rng.randint(2, 3)
+        return self._unique("".join(self.rng.choice(_SYLLABLES) for _ in range(parts)).upper())
+
+    def company(self):
+        return self._unique(f"{self.group()} ENT")
+
+    def title(self, words=(1, 3)):
+        count = self.rng.randint(*words)
+        return " ".join(self.rng.choice(_WORDS) for _ in range(count))
+
+    def album(self):
+        return self._unique(self.title((1, 4)))
+
+    def member(self):
+        return "".join(self.rng.choice(_SYLLABLES) for _ in range(2)).title()
+
+    def korean(self):
+        return "".join(self.rng.choice(_KOREAN) for _ in range(self.rng.randint(2, 3)))
+
+
+def _week_key(day):
+    return f"{day.year}-{day.isocalendar()[1]:02d}"
+
+
+def _split(total, weights):
+    weight_sum = sum(weights) or 1
+    return [int(total * w / weight_sum) for w in weights]
+
+
+def _daily_and_weekly(total_recent, today, rng):
+    """Seven days of daily buckets plus a few weekly ones, summing sensibly."""
+    daily = {}
+    for offset in range(DAILY_HISTORY_DAYS):
+        day = today - timedelta(days=offset)
+        daily[day.strftime("%Y-%m-%d")] = int(total_recent / DAILY_HISTORY_DAYS * rng.uniform(0.5, 1.5))
+    weekly = {}
+    for offset in range(WEEKLY_HISTORY):
+        day = today - timedelta(weeks=offset)
+        weekly[_week_key(day)] = int(total_recent * rng.uniform(0.6, 1.4) * (0.8 ** offset))
+    return daily, weekly
+
+
+def generate(groups, albums, songs, users, companies=None, seed=0, today=None):
+    """Build a complete state dict in the shape save_data() writes."""
+    rng = random.Random(seed)
+    names = _Names(rng)
+    today = (today or datetime.now(game.ARG_TZ)).replace(
+        tzinfo=None, hour=12, minute=0, second=0, microsecond=0)
+    companies = companies or max(1, groups // 8)
+
+    state = {
+        "group_popularity": {}, "company_funds": {}, "group_data": {}, "company_data": {},
+        "album_data": {}, "user_balances": {}, "user_cooldowns": {},
+        "user_daily_limits": {"day": today.strftime("%Y-%m-%d"), "counts": {}, "extras": {}},
+        "user_companies": {}, "user_stream_counts": {},
+        "records_24h": {"global": {"streams": 0, "sales": 0, "views": 0}, "personal": {}},
+        "weekly_streams": {}, "preorder_data": {}, "article_history": {}, "random_events_log": {},
+        "events_channel_id": None, "last_random_timestamp": None,
+    }
+
+    # --- Companies and owners ---
+    user_ids = [str(100000000000000000 + rng.randrange(10 ** 17)) for _ in range(users)]
+    owners = user_ids[:max(1, users // 4)]
+    company_names = [names.company() for _ in range(companies)]
+    building_ids = list(game.COMPANY_BUILDINGS)
+    for company in company_names:
+        state["company_funds"][company] = int(rng.paretovariate(1.2) * 5_000_000)
+        state["company_data"][company] = {"buildings": {
+            b: rng.randint(1, 5) for b in rng.sample(building_ids, rng.randint(0, len(building_ids)))
+        }}
+        state["user_companies"].setdefault(rng.choice(owners), []).append(company)
+
+    # --- Groups and members ---
+    group_names = []
+    for _ in range(groups):
+        name = names.group()
+        group_names.append(name)
+        popularity = min(60_000, int(rng.paretovariate(1.1) * 150))
+        debut = today - timedelta(days=rng.randint(30, 1500))
+        members = []
+        member_count = rng.randint(3, 9)
+        for _ in range(member_count):
+            member = game.ensure_member_schema({"name": names.member()},
+                                               base_pop=max(10, popularity // member_count))
+            member["group"] = name
+            if rng.random() < 0.5:
+                member["birthday"] = f"{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+            members.append(member)
+
+        entry = {
+            "company": rng.choice(company_names), "albums": [], "korean_name": names.korean(),
+            "wins": 0, "base_wins": rng.randint(0, 5) if rng.random() < 0.2 else 0,
+            "popularity": sum(m["popularity"] for m in members),
+            "debut_date": debut.strftime("%Y-%m-%d"), "is_disbanded": rng.random() < 0.03,
+            "fanbase": rng.randint(20, 400), "gp": rng.randint(0, 1200),
+            "payola_suspicion": rng.randint(0, 40), "has_scandal": rng.random() < 0.05,
+            "active_hate_train": rng.random() < 0.03, "hate_train_fanbase_boost": 0,
+            "is_nations_group": False, "members": members, "recent_events": [],
+            "is_subunit": False, "parent_group": None, "subunits": [],
+            "last_tax_month": today.strftime("%Y-%m"), "reputation": rng.randint(10, 90),
+            "reputation_history": [], "tier": "NUGU",
+        }
+        if rng.random() < 0.02:
+            boycott_type = rng.choice(list(game.BOYCOTT_TYPES))
+            info = game.BOYCOTT_TYPES[boycott_type]
+            started = today - timedelta(days=rng.randint(0, 20))
+            entry["active_boycotts"] = [{
+                "type": boycott_type, "name": info["name"],
+                "started_at": started.isoformat(),
+                "ends_at": (started + timedelta(days=info["duration_days"])).isoformat(),
+                "duration_days": info["duration_days"], "is_fan_action": info["is_fan_action"],
+                "effects": {k: list(v) if isinstance(v, tuple) else v for k, v in info["effects"].items()},
+                "initiator_id": rng.choice(user_ids),
+                "ended": started + timedelta(days=info["duration_days"]) < today,
+            }]
+        state["group_data"][name] = entry
+        state["group_popularity"][name] = entry["popularity"]
+
+    # --- Albums and songs ---
+    # Bigger groups release more, like the live data.
+    group_weights = [state["group_data"][g]["popularity"] ** 0.5 for g in group_names]
+    album_owners = rng.choices(group_names, weights=group_weights, k=albums)
+    songs_left = songs
+    for index, group_name in enumerate(album_owners):
+        group_entry = state["group_data"][group_name]
+        album_name = names.album()
+        albums_left = albums - index
+        track_count = max(1, min(20, int(rng.gauss(songs_left / albums_left, 2))))
+        songs_left = max(0, songs_left - track_count)
+
+        released = datetime.strptime(group_entry["debut_date"], "%Y-%m-%d") + timedelta(
+            days=rng.randint(0, max(1, (today - datetime.strptime(group_entry["debut_date"], "%Y-%m-%d")).days)))
+        age_weeks = max(0, (today - released).days) / 7
+        age_curve = 1.5 if age_weeks <= 1 else 1.0 if age_weeks <= 7 else 0.4 if age_weeks <= 51 else 0.2
+        recent = int(group_entry["popularity"] * rng.uniform(40, 120) * age_curve)
+        lifetime = recent * rng.randint(2, 40)
+
+        song_names = []
+        while len(song_names) < track_count:
+            candidate = names.title()
+            if candidate not in song_names:
+                song_names.append(candidate)
+        shares = _split(lifetime, [1.0] + [(0.3 ** i) * rng.uniform(0.5, 1.5) for i in range(1, track_count)])
+        song_entries = {}
+        for position, (song_name, share) in enumerate(zip(song_names, shares)):
+            daily, weekly = _daily_and_weekly(recent * share / max(1, lifetime), today, rng)
+            song_entries[song_name] = {"streams": share, "is_title": position == 0,
+                                       "daily_streams": daily, "weekly_streams": weekly}
+
+        album_daily, album_weekly = _daily_and_weekly(recent, today, rng)
+        sales = int(lifetime * rng.uniform(0.02, 0.12))
+        album_format = "physical" if rng.random() < 0.8 else "digital"
+        state["album_data"][album_name] = {
+            "group": group_name, "wins": rng.randint(0, 3) if rng.random() < 0.15 else 0,
+            "release_date": released.strftime("%Y-%m-%d"),
+            "streams": lifetime, "sales": sales, "views": int(lifetime * rng.uniform(0.2, 0.8)),
+            "image_url": game.DEFAULT_ALBUM_IMAGE,
+            "is_active_promotion": age_weeks <= 3,
+            "promotion_end_date": (released + timedelta(days=21)).isoformat() if age_weeks <= 3 else None,
+            "charts_info": {p: {"rank": None, "peak": None, "prev_rank": None} for p in CHART_PLATFORMS},
+            "first_24h_tracking": None,
+            "album_type": rng.choice(["single", "mini", "mini", "full"]),
+            "album_format": album_format,
+            "stock": rng.randint(0, 1_500_000) if album_format == "physical" else 0,
+            "songs": song_entries, "title_track": song_names[0], "preorders": 0,
+            "weekly_streams": album_weekly, "daily_streams": album_daily,
+            "daily_sales": {d: int(v * 0.05) for d, v in album_daily.items()},
+            "cumulative_streams": lifetime, "cumulative_sales": sales,
+        }
+        group_entry["albums"].append(album_name)
+
+        if rng.random() < 0.01:
+            key = f"{group_name}_{album_name}"
+            stock = rng.choice([10_000, 100_000, 500_000])
+            state["preorder_data"][key] = {
+                "album_name": album_name, "group": group_name, "stock": stock,
+                "preordered": rng.randint(0, stock),
+                "opened_at": (today - timedelta(days=rng.randint(0, 10))).isoformat(),
+                "status": "open",
+            }
+            group_entry.setdefault("prereleases", []).append(key)
+
+    for group_name in group_names:
+        entry = state["group_data"][group_name]
+        entry["wins"] = entry["base_wins"] + sum(state["album_data"][a]["wins"] for a in entry["albums"])
+
+    # --- Players ---
+    now_epoch = int(today.replace(tzinfo=game.ARG_TZ).timestamp())
+    for user_id in user_ids:
+        state["user_balances"][user_id] = int(rng.paretovariate(1.5) * 200_000)
+        used = rng.sample(list(game.DAILY_LIMITS), rng.randint(0, len(game.DAILY_LIMITS)))
+        if used:
+            state["user_daily_limits"]["counts"][user_id] = {
+                command: rng.randint(1, game.DAILY_LIMITS[command]) for command in used
+            }
+            state["user_cooldowns"][user_id] = {
+                command: now_epoch - rng.randint(0, 10_000) * 60 for command in used
+            }
+        if rng.random() < 0.1:
+            state["user_daily_limits"]["extras"][user_id] = {rng.choice(list(game.DAILY_LIMITS)): rng.randint(1, 5)}
+        favourites = rng.sample(group_names, min(len(group_names), rng.randint(1, 8)))
+        state["user_stream_counts"][user_id] = {g: rng.randint(1, 200) for g in favourites}
+
+    return state
+
+
+def write(state, path):
+    """Write the state the way save_data() does, so file sizes are comparable."""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=4, default=history.json_default)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic data.json at scale.")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="current")
+    parser.add_argument("--groups", type=int)
+    parser.add_argument("--albums", type=int)
+    parser.add_argument("--songs", type=int)
+    parser.add_argument("--users", type=int)
+    parser.add_argument("--companies", type=int)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--today", help="YYYY-MM-DD to date the history from (default: today)")
+    parser.add_argument("--out", default="scale_data.json")
+    options = parser.parse_args(argv)
+
+    groups, albums, songs, users = SCALES[options.scale]
+    state = generate(
+        groups=options.groups or groups,
+        albums=options.albums or albums,
+        songs=options.songs or songs,
+        users=options.users or users,
+        companies=options.companies,
+        seed=options.seed,
+        today=datetime.strptime(options.today, "%Y-%m-%d") if options.today else None,
+    )
+    write(state, options.out)
+    song_total = sum(len(a["songs"]) for a in state["album_data"].values())
+    print(f"Wrote {options.out}: {len(state['group_data'])} groups, {len(state['album_data'])} albums, "
+          f"{song_total} songs, {len(state['user_balances'])} users.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,170 @@
+"""Stat effects applied as one batch: validated, applied together, saved once.
+
+A random event, the end of a boycott or a public apology changes several
+things at once: GP, fanbase, reputation, member popularity, company funds,
+a song's streams. Each change used to be applied on its own through a
+helper, and some helpers saved data.json and recomputed group totals
+themselves. One event could save three times and sum member popularity
+twice, and a failure halfway left the event half applied.
+
+Now the whole outcome is built first, as a list of typed effects with the
+rolls already made:
+
+    outcome = [
+        stat_effects.Stat(group, 'gp', +12),
+        stat_effects.Reputation(group, -8, "Failed Public Apology"),
+        stat_effects.MemberPopularity(group, +40),
+    ]
+    applied = group_effects.run(outcome)
+
+Pipeline.run checks every effect before touching anything. It snapshots
+what the effects will change, applies them all, and restores the snapshot
+if any of them fails. After that it runs the finishers once for all the
+groups touched; main.py uses them to recompute derived totals and save.
+
+The appliers live in main.py next to the state they change. The
+pipeline only knows effect types:
+
+    @group_effects.applies(stat_effects.Stat)
+    def _apply_stat(effect): ...
+"""
+
+
+class EffectError(Exception):
+    """An effect that can't be applied; nothing in its batch was."""
+
+
+class Effect:
+    """Base for effect types. `group` is the group whose totals it changes."""
+
+    __slots__ = ("group",)
+
+    def __init__(self, group: str):
+        self.group = group
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self._fields())
+        return f"{type(self).__name__}({fields})"
+
+    @classmethod
+    def _fields(cls):
+        for klass in reversed(cls.__mro__):
+            yield from getattr(klass, "__slots__", ())
+
+
+class Stat(Effect):
+    """Add `delta` to a numeric field of the group, clamped to [low, high]."""
+
+    __slots__ = ("field", "delta", "low", "high", "default")
+
+    def __init__(self, group, field, delta, low=0, high=None, default=0):
+        super().__init__(group)
+        self.field = field
+        self.delta = delta
+        self.low = low
+        self.high = high
+        self.default = default
+
+
+class SetField(Effect):
+    """Set a field of the group to a value (flags like has_scandal)."""
+
+    __slots__ = ("field", "value")
+
+    def __init__(self, group, field, value):
+        super().__init__(group)
+        self.field = field
+        self.value = value
+
+
+class Reputation(Effect):
+    """Change reputation (0-100) and record why in reputation_history."""
+
+    __slots__ = ("delta", "reason")
+
+    def __init__(self, group, delta, reason):
+        super().__init__(group)
+        self.delta = delta
+        self.reason = reason
+
+
+class MemberPopularity(Effect):
+    """Spread a popularity change over the group's members."""
+
+    __slots__ = ("delta",)
+
+    def __init__(self, group, delta):
+        super().__init__(group)
+        self.delta = delta
+
+
+class CompanyFunds(Effect):
+    """Add `delta` to the funds of the group's company, never below zero."""
+
+    __slots__ = ("delta",)
+
+    def __init__(self, group, delta):
+        super().__init__(group)
+        self.delta = delta
+
+
+class SongStreams(Effect):
+    """Stream one of the group's songs `amount` times (song, album and week)."""
+
+    __slots__ = ("album", "song", "amount")
+
+    def __init__(self, group, album, song, amount):
+        super().__init__(group)
+        self.album = album
+        self.song = song
+        self.amount = amount
+
+
+class Pipeline:
+    def __init__(self):
+        self._appliers = {}
+        self._validators = []
+        self._finishers = []
+        self.snapshot = None  # callable(effects) -> token for restore
+        self.restore = None   # callable(token)
+
+    def applies(self, effect_type):
+        """Decorator: apply(effect) for one effect type; returns what it changed."""
+        def register(apply):
+            self._appliers[effect_type] = apply
+            return apply
+        return register
+
+    def validator(self, check):
+        """Decorator: check(effect) raises EffectError if it can't be applied."""
+        self._validators.append(check)
+        return check
+
+    def finisher(self, finish):
+        """Decorator: finish(effects, save) runs once after a batch is applied."""
+        self._finishers.append(finish)
+        return finish
+
+    def validate(self, effects):
+        for effect in effects:
+            if type(effect) not in self._appliers:
+                raise EffectError(f"No applier for {type(effect).__name__}")
+            for check in self._validators:
+                check(effect)
+
+    def run(self, effects, save: bool = True):
+        """Apply a batch all-or-nothing. Returns each applier's result, in order."""
+        effects = list(effects)
+        self.validate(effects)
+
+        token = self.snapshot(effects) if self.snapshot else None
+        try:
+            results = [self._appliers[type(effect)](effect) for effect in effects]
+        except Exception:
+            if self.restore:
+                self.restore(token)
+            raise
+
+        for finish in self._finishers:
+            finish(effects, save)
+        return results